@@ -1,5 +1,6 @@
 import sys
 import logging
+import argparse
 import json
 from datetime import datetime
 from PyQt6.QtWidgets import (
@@ -8,11 +9,11 @@ from PyQt6.QtWidgets import (
     QListWidget, QTabWidget, QSpinBox, QCheckBox, QMessageBox,
     QFileDialog, QScrollArea, QFrame, QDialog, QListWidgetItem,
     QProgressDialog, QGroupBox, QTextEdit, QStyle, QStyleFactory,
-    QGridLayout
+    QGridLayout, QDoubleSpinBox
 
 
 )
-from PyQt6.QtCore import Qt, QPoint, QSize, pyqtSignal, QThread
+from PyQt6.QtCore import Qt, QPoint, QSize, pyqtSignal, QThread, QTimer
 from PyQt6.QtGui import QIcon, QDragEnterEvent, QDropEvent, QPalette, QColor, QFont
 import os
 import time
@@ -20,9 +21,16 @@ import keyboard
 
 from automation_steps import StepType, STEP_DIALOGS
 from recorder import ActionRecorder
+from step_list import StepListView
+from log_view import LogView
+from profile_view import ProfileView
+from perf_panel import PerfPanel
 
 
-from executor import WorkflowExecutor
+from executor import WorkflowExecutor, MIN_ANCHOR_SCORE, DEBUG_DIR, validate_workflow
+from logging_setup import setup_logging
+from input_backend import available_input_backends
+from motion import MOTION_MODES
 
 # Directory constants
 WORKSPACE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -33,16 +41,6 @@ AUTOMATIONS_DIR = os.path.join(WORKSPACE_DIR, "Saved Automations")
 os.makedirs(IMAGES_DIR, exist_ok=True)
 os.makedirs(AUTOMATIONS_DIR, exist_ok=True)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('automation.log'),
-        logging.StreamHandler()
-    ]
-)
-
 # Modern UI Style Sheet
 STYLE_SHEET = """
 QMainWindow, QWidget {
@@ -101,7 +99,7 @@ QLineEdit:focus, QSpinBox:focus, QComboBox:focus, QTextEdit:focus {
     border: 1px solid #0078D4;
 }
 
-QListWidget {
+QListWidget, QListView {
     background-color: #2d2d2d;
     color: #e0e0e0;
     border: 1px solid #3d3d3d;
@@ -278,204 +276,6 @@ QVBoxLayout, QHBoxLayout {
 }
 """
 
-# Step Colors
-STEP_COLORS = {
-    StepType.MOUSE_CLICK: "#4da6ff",     # Blue
-    StepType.KEYBOARD_TYPE: "#66ff66",   # Green
-    StepType.KEYBOARD_SPECIAL: "#00cc99", # Teal
-    StepType.WAIT: "#ffcc00",            # Orange
-    StepType.LOOP_START: "#cc66ff",      # Purple
-    StepType.LOOP_END: "#cc66ff"         # Purple
-}
-
-class AutomationStep(QFrame):
-    """Represents a single automation step in the workflow"""
-    stepMoved = pyqtSignal(int, int)  # Signal for drag and drop reordering
-    paramsChanged = pyqtSignal(dict)  # Signal for parameter updates
-
-    def __init__(self, step_type, params=None, parent=None):
-        super().__init__(parent)
-        self.step_type = step_type
-        self.params = params or {}
-        self.setup_ui()
-        self.paramsChanged.connect(self._update_ui)
-
-    def setup_ui(self):
-        # Clear any existing layout
-        if self.layout():
-            QWidget().setLayout(self.layout())
-        
-        self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
-        
-        # Set minimum height for the step - reduced for smaller text
-        self.setMinimumHeight(40)
-        
-        # Get color for this step type
-        step_color = STEP_COLORS.get(self.step_type, "#e0e0e0")
-        
-        # Set styling for the step frame with colored border and left accent
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: #2d2d2d;
-                border: 1px solid #3d3d3d;
-                border-left: 5px solid {step_color};
-                border-radius: 4px;
-                padding: 4px;
-            }}
-            QLabel {{
-                color: #e0e0e0;
-                font-size: 9pt;
-            }}
-            QPushButton {{
-                background-color: #424242;
-                color: #e0e0e0;
-                border: 1px solid #555555;
-                font-size: 9pt;
-                padding: 3px 6px;
-                border-radius: 3px;
-                min-width: 0px;
-            }}
-            QPushButton:hover {{
-                background-color: #4d4d4d;
-            }}
-        """)
-        
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(4, 4, 4, 4)
-        layout.setSpacing(6)
-        
-        # Reorder handle
-        handle_label = QLabel("⋮⋮")
-        handle_label.setStyleSheet("color: #666666; font-size: 10pt; font-weight: bold;")
-        handle_label.setCursor(Qt.CursorShape.SizeVerCursor)
-        layout.addWidget(handle_label)
-        
-        # Step type icon/emoji
-        icon_map = {
-            StepType.MOUSE_CLICK: "🖱️",
-            StepType.KEYBOARD_TYPE: "⌨️",
-            StepType.KEYBOARD_SPECIAL: "🔣",
-            StepType.WAIT: "⏱️",
-            StepType.LOOP_START: "🔄",
-            StepType.LOOP_END: "↩️"
-        }
-        icon = icon_map.get(self.step_type, "❓")
-        icon_label = QLabel(icon)
-        layout.addWidget(icon_label)
-        
-        # Step name/description with colored type
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(1)
-        
-        self.name_label = QLabel(self.params.get("name", ""))
-        self.name_label.setStyleSheet("font-weight: bold;")
-        
-        # Colored type label
-        self.type_label = QLabel(self.step_type)
-        self.type_label.setStyleSheet(f"color: {step_color}; font-size: 8pt;")
-        
-        info_layout.addWidget(self.name_label)
-        info_layout.addWidget(self.type_label)
-        layout.addLayout(info_layout, stretch=1)
-        
-        # Detail labels based on type
-        if self.step_type == StepType.MOUSE_CLICK:
-            coords = f"({self.params.get('x', '?')}, {self.params.get('y', '?')})"
-            self.coord_label = QLabel(coords)
-            self.coord_label.setStyleSheet("color: #aaaaaa; font-size: 8pt;")
-            layout.addWidget(self.coord_label)
-
-        elif self.step_type == StepType.WAIT:
-            duration = f"{self.params.get('duration', 1)}s"
-            duration_label = QLabel(duration)
-            duration_label.setStyleSheet(f"color: {step_color}; font-weight: bold;")
-            layout.addWidget(duration_label)
-            
-        elif self.step_type == StepType.LOOP_START:
-            iters = f"x{self.params.get('iterations', 1)}"
-            iter_label = QLabel(iters)
-            iter_label.setStyleSheet(f"color: {step_color}; font-weight: bold;")
-            layout.addWidget(iter_label)
-            
-        # Add spacer to push buttons to the right
-        layout.addStretch(1)
-
-        # Edit button with enhanced emoji
-        edit_btn = QPushButton("✏️ Edit")
-        edit_btn.clicked.connect(self.edit_step)
-        edit_btn.setStyleSheet("""
-            QPushButton {
-                color: #e0e0e0;
-                background-color: #3a3a3a;
-                border: 1px solid #4d4d4d;
-                font-size: 9pt;
-            }
-            QPushButton:hover {
-                background-color: #4d4d4d;
-            }
-        """)
-        layout.addWidget(edit_btn)
-
-        # Delete button with enhanced emoji
-        delete_btn = QPushButton("🗑️ Delete")
-        delete_btn.clicked.connect(self.delete_step)
-        delete_btn.setStyleSheet("""
-            QPushButton {
-                color: #e0e0e0;
-                background-color: #3a3a3a;
-                border: 1px solid #4d4d4d;
-                font-size: 9pt;
-            }
-            QPushButton:hover {
-                background-color: #4d4d4d;
-                color: #ff8888;
-            }
-        """)
-        layout.addWidget(delete_btn)
-
-    def _update_ui(self):
-        """Update UI elements with current parameters"""
-        # Ensure we're on the main thread
-        if not self.thread() == QApplication.instance().thread():
-            return
-            
-        self.name_label.setText(self.params.get("name", ""))
-        if self.step_type == StepType.MOUSE_CLICK and hasattr(self, 'coord_label'):
-            coords = f"({self.params.get('x', '?')}, {self.params.get('y', '?')})"
-            self.coord_label.setText(coords)
-
-    def update_params(self, new_params):
-        """Thread-safe method to update parameters"""
-        self.params.update(new_params)
-        # Emit signal to trigger UI update in main thread
-        self.paramsChanged.emit(self.params.copy())
-
-    def edit_step(self):
-        if self.step_type in STEP_DIALOGS:
-            # Pass the current parameters to the dialog
-            dialog = STEP_DIALOGS[self.step_type](params=self.params.copy())
-            if dialog.exec() == QDialog.DialogCode.Accepted:
-                self.update_params(dialog.get_params())
-
-    def delete_step(self):
-        """Delete this step from the list"""
-        # Find the QListWidgetItem that contains this widget
-        list_widget = self.parent().parent()  # Get the QListWidget
-        for i in range(list_widget.count()):
-            item = list_widget.item(i)
-            if list_widget.itemWidget(item) == self:
-                # Remove both the widget and the item
-                list_widget.takeItem(i)
-                self.deleteLater()
-                break
-
-    def get_data(self):
-        """Get step data for saving"""
-        return {
-            "type": self.step_type,
-            "params": self.params
-        }
-
 class AddStepDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -557,7 +357,11 @@ class AddStepDialog(QDialog):
             StepType.KEYBOARD_SPECIAL,
             StepType.WAIT,
             StepType.LOOP_START,
-            StepType.LOOP_END
+            StepType.LOOP_END,
+            StepType.CLICK_TEXT,
+            StepType.WAIT_TEXT,
+            StepType.WAIT_COLOR,
+            StepType.MOUSE_DRAG
         ])
         
         # Create label with enhanced emoji
@@ -635,6 +439,12 @@ class AutomationToolGUI(QMainWindow):
         self.current_workflow_path = None
         self.coordinate_recording = False
         self.progress_dialog = None  # Initialize as None
+        self.metrics_port = None  # Localhost port for the live metrics endpoint (--metrics-port)
+
+        # Samples the executor's progress snapshot while a workflow runs
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(100)
+        self.progress_timer.timeout.connect(self.update_progress)
         
         self.setup_ui()
         
@@ -663,13 +473,12 @@ class AutomationToolGUI(QMainWindow):
         self.recorder.recording_stopped.connect(self.on_recording_stopped)
         self.recorder.coordinate_recorded.connect(self.on_coordinate_recorded)
         self.recorder.recording_armed.connect(self.on_recording_armed_changed)
+        self.recorder.anchor_scored.connect(self.on_anchor_scored)
         
         # Executor signals
-        self.executor.step_started.connect(self.on_step_started)
-        self.executor.step_completed.connect(self.on_step_completed)
         self.executor.step_error.connect(self.on_step_error)
         self.executor.workflow_completed.connect(self.on_workflow_completed)
-        self.executor.debug_info.connect(self.on_debug_info)  # Connect debug signal
+        self.executor.debug_sink = self.log_view.append  # Debug messages are batched by the log view
 
         
 
@@ -707,6 +516,33 @@ class AutomationToolGUI(QMainWindow):
         self.debug_mode.toggled.connect(self.toggle_debug_mode)
         settings_layout.addWidget(self.debug_mode)
 
+        # Input backend selection
+        backend_layout = QHBoxLayout()
+        backend_layout.addWidget(QLabel("⌨️ Input Backend:"))
+        self.input_backend = QComboBox()
+        self.input_backend.addItems(available_input_backends() + ["auto"])
+        self.input_backend.setToolTip(
+            "pyautogui: default, works everywhere\n"
+            "xtest: batched X11 input, much lower overhead (Linux)\n"
+            "uinput: virtual input device, needs access to /dev/uinput (Linux)"
+        )
+        backend_layout.addWidget(self.input_backend)
+        settings_layout.addLayout(backend_layout)
+
+        # Default mouse motion mode
+        motion_layout = QHBoxLayout()
+        motion_layout.addWidget(QLabel("🖱️ Mouse Motion:"))
+        self.motion_mode = QComboBox()
+        self.motion_mode.addItems(MOTION_MODES)
+        self.motion_mode.setToolTip(
+            "tween: animate over each step's movement duration\n"
+            "instant: jump straight to the target (fastest)\n"
+            "path: short precomputed path, for apps that need hover events\n"
+            "Steps can override this in their settings."
+        )
+        motion_layout.addWidget(self.motion_mode)
+        settings_layout.addLayout(motion_layout)
+
         # Add settings to group
         settings_group.setLayout(settings_layout)
         layout.addWidget(settings_group)
@@ -715,9 +551,7 @@ class AutomationToolGUI(QMainWindow):
         steps_group = QGroupBox("📋 Workflow Steps")
         steps_layout = QVBoxLayout()
         
-        self.steps_list = QListWidget()
-        self.steps_list.setDragDropMode(QListWidget.DragDropMode.InternalMove)
-        self.steps_list.model().rowsMoved.connect(self._on_steps_reordered)
+        self.steps_list = StepListView()
         steps_layout.addWidget(self.steps_list)
         
         steps_group.setLayout(steps_layout)
@@ -752,20 +586,19 @@ class AutomationToolGUI(QMainWindow):
         
         debug_layout.addLayout(debug_controls)
         
-        # Debug output
-        self.debug_text = QTextEdit()
-        self.debug_text.setReadOnly(True)
-        self.debug_text.setStyleSheet("""
-            QTextEdit {
-                background-color: #1e1e1e;
-                color: #e0e0e0;
-                font-family: 'Consolas', 'Courier New', monospace;
-                font-size: 10pt;
-            }
-        """)
-        debug_layout.addWidget(self.debug_text)
+        # Debug output (bounded, refreshed in batches)
+        self.log_view = LogView()
+        debug_layout.addWidget(self.log_view)
         
         tabs.addTab(debug_tab, "🔍 Debug")
+
+        # Performance tab: live throughput and latency of the running workflow
+        self.perf_panel = PerfPanel()
+        tabs.addTab(self.perf_panel, "⚡ Performance")
+
+        # Profile tab: per-step timings of the last run
+        self.profile_view = ProfileView()
+        tabs.addTab(self.profile_view, "📊 Profile")
         
 
         
@@ -801,6 +634,36 @@ class AutomationToolGUI(QMainWindow):
         self.loop_count.setToolTip("Number of times to repeat the workflow")
         loop_layout.addWidget(self.loop_count)
         controls_layout.addLayout(loop_layout)
+
+        # Playback of recorded delays
+        playback_layout = QHBoxLayout()
+        self.replay_delays = QCheckBox("Replay recorded delays")
+        self.replay_delays.setChecked(True)
+        playback_layout.addWidget(self.replay_delays)
+        playback_layout.addWidget(QLabel("Speed:"))
+        self.playback_speed = QDoubleSpinBox()
+        self.playback_speed.setRange(0.1, 100.0)
+        self.playback_speed.setValue(1.0)
+        self.playback_speed.setSuffix("x")
+        self.playback_speed.setToolTip("Recorded gaps are divided by this factor")
+        playback_layout.addWidget(self.playback_speed)
+        controls_layout.addLayout(playback_layout)
+
+        gap_layout = QHBoxLayout()
+        gap_layout.addWidget(QLabel("Gap min:"))
+        self.min_gap = QDoubleSpinBox()
+        self.min_gap.setRange(0.0, 60.0)
+        self.min_gap.setValue(0.0)
+        self.min_gap.setSuffix(" s")
+        gap_layout.addWidget(self.min_gap)
+        gap_layout.addWidget(QLabel("max:"))
+        self.max_gap = QDoubleSpinBox()
+        self.max_gap.setRange(0.0, 600.0)
+        self.max_gap.setValue(5.0)
+        self.max_gap.setSuffix(" s")
+        self.max_gap.setToolTip("Longest wait per recorded gap; also the timeout for adaptive waits")
+        gap_layout.addWidget(self.max_gap)
+        controls_layout.addLayout(gap_layout)
         
         # Run controls
         run_layout = QHBoxLayout()
@@ -847,6 +710,28 @@ class AutomationToolGUI(QMainWindow):
         
         self.record_action = tools_menu.addAction("⏺️ Start Recording")
         self.record_action.triggered.connect(self.toggle_recording)
+
+        self.anchor_action = tools_menu.addAction("🎯 Capture Image Anchors While Recording")
+        self.anchor_action.setCheckable(True)
+        self.anchor_action.setToolTip("Save a small image around each recorded click so it can be found again if the layout moves")
+        self.anchor_action.toggled.connect(lambda checked: setattr(self.recorder, "capture_anchors", checked))
+
+        self.trace_action = tools_menu.addAction("🧭 Record Run Trace")
+        self.trace_action.setCheckable(True)
+        self.trace_action.setToolTip("Save a timeline of each run to the debug folder for chrome://tracing or ui.perfetto.dev")
+
+        self.metrics_action = tools_menu.addAction("📈 Export Live Metrics")
+        self.metrics_action.setCheckable(True)
+        self.metrics_action.setToolTip("Keep debug/automation.prom updated with OpenMetrics counters while a workflow runs")
+
+        self.memory_action = tools_menu.addAction("🧠 Watch Memory Growth")
+        self.memory_action.setCheckable(True)
+        self.memory_action.setToolTip("Snapshot memory after every global loop iteration and warn about steady growth (slows runs down)")
+
+        self.sampling_action = tools_menu.addAction("🔥 Sampling Profiler")
+        self.sampling_action.setCheckable(True)
+        self.sampling_action.setToolTip("Sample the running workflow's call stacks; the profile is saved to the debug folder when stopped")
+        self.sampling_action.toggled.connect(self.toggle_sampling)
         
 
 
@@ -879,11 +764,7 @@ class AutomationToolGUI(QMainWindow):
                 config_dialog = STEP_DIALOGS[step_type]()
                 if config_dialog.exec() == QDialog.DialogCode.Accepted:
                     params = config_dialog.get_params()
-                    step = AutomationStep(step_type, params)
-                    item = QListWidgetItem()
-                    item.setSizeHint(step.sizeHint())
-                    self.steps_list.addItem(item)
-                    self.steps_list.setItemWidget(item, step)
+                    self.steps_list.add_step(step_type, params)
 
     def new_automation(self):
         self.steps_list.clear()
@@ -891,7 +772,7 @@ class AutomationToolGUI(QMainWindow):
 
     def save_automation(self):
         """Save the current automation workflow"""
-        if len(self.steps_list) == 0:
+        if self.steps_list.count() == 0:
             QMessageBox.warning(self, "No Steps", "No steps to save. Add some automation steps first.")
             return
         
@@ -916,19 +797,9 @@ class AutomationToolGUI(QMainWindow):
                     "version": "1.0",
                     "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     "debug_mode": self.debug_mode.isChecked(),
-                    "steps": []
+                    "steps": self.steps_list.steps()
                 }
                 
-                for i in range(self.steps_list.count()):
-                    item = self.steps_list.item(i)
-                    step_widget = self.steps_list.itemWidget(item)
-                    
-                    if step_widget:
-                        workflow["steps"].append({
-                            "type": step_widget.step_type,
-                            "params": step_widget.params
-                        })
-                
                 with open(file_name, 'w') as f:
                     json.dump(workflow, f, indent=4)
                 
@@ -949,30 +820,7 @@ class AutomationToolGUI(QMainWindow):
         
         if file_name:
             try:
-                with open(file_name, 'r') as f:
-                    workflow = json.load(f)
-                
-                # Clear current steps
-                self.steps_list.clear()
-                
-                # Load debug mode
-                self.debug_mode.setChecked(workflow.get("debug_mode", True))
-                
-                # Load steps
-                for step_data in workflow.get("steps", []):
-                    step_type = step_data["type"]
-                    params = step_data["params"]
-                    
-                    # Create step widget
-                    step = AutomationStep(step_type, params)
-                    
-                    # Add to list
-                    item = QListWidgetItem()
-                    item.setSizeHint(step.sizeHint())
-                    self.steps_list.addItem(item)
-                    self.steps_list.setItemWidget(item, step)
-                
-                self.current_workflow_path = file_name
+                self.load_workflow_file(file_name)
                 
                 # Get just the filename without path for the message
                 file_basename = os.path.basename(file_name)
@@ -981,6 +829,19 @@ class AutomationToolGUI(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to load automation: {str(e)}")
 
+    def load_workflow_file(self, file_name):
+        """Replace the current workflow with the one saved in `file_name`"""
+        with open(file_name, 'r') as f:
+            workflow = json.load(f)
+        
+        # Load debug mode
+        self.debug_mode.setChecked(workflow.get("debug_mode", True))
+        
+        # Load steps (replaces the current ones in a single model reset)
+        self.steps_list.set_steps(workflow.get("steps", []))
+        
+        self.current_workflow_path = file_name
+
     def toggle_recording(self):
         """Handle recording button in menu"""
         if not self.recorder.is_recording:
@@ -1042,11 +903,22 @@ class AutomationToolGUI(QMainWindow):
                 winsound.Beep(500, 500)  # 500Hz for 500ms
 
     def on_action_recorded(self, step_type, params):
-        step = AutomationStep(step_type, params)
-        item = QListWidgetItem()
-        item.setSizeHint(step.sizeHint())
-        self.steps_list.addItem(item)
-        self.steps_list.setItemWidget(item, step)
+        anchor = params.get("anchor")
+        if anchor and anchor.get("score") is None:
+            # The encoder may have scored the anchor before this step reached the list
+            score = self.recorder.anchors.scores.get(anchor["image_path"])
+            if score is not None:
+                params["anchor"] = dict(anchor, score=score)
+        self.steps_list.add_step(step_type, params)
+
+    def on_anchor_scored(self, image_path, score):
+        """Store a recorded anchor's uniqueness score on every step that uses it"""
+        for row, step in enumerate(self.steps_list.steps()):
+            anchor = step["params"].get("anchor")
+            if anchor and anchor.get("image_path") == image_path:
+                self.steps_list.update_params(row, {"anchor": dict(anchor, score=score)})
+        if score < MIN_ANCHOR_SCORE:
+            self.on_debug_info(f"Recorded anchor {os.path.basename(image_path)} is not unique on screen (score {score:.2f}); its step will use coordinates")
 
     def on_recording_stopped(self):
         self.record_action.setText("⏺️ Start Recording")
@@ -1060,6 +932,21 @@ class AutomationToolGUI(QMainWindow):
             QMessageBox.warning(self, "No Steps", "Please add some steps to the workflow first.")
             return
 
+        # Catch broken loops, missing images and the like before anything runs
+        problems = validate_workflow(self.steps_list.steps())
+        if problems:
+            details = "\n".join(f"Step {index + 1}: {problem}" for index, problem in problems[:10])
+            if len(problems) > 10:
+                details += f"\n... and {len(problems) - 10} more"
+            reply = QMessageBox.question(
+                self, "Workflow Problems",
+                f"The workflow has {len(problems)} problem(s):\n\n{details}\n\nRun it anyway?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+
         # Create progress dialog
         self.progress_dialog = QProgressDialog("Preparing to run workflow...", "Cancel", 0, self.steps_list.count(), self)
         self.progress_dialog.setWindowTitle("Running Workflow")
@@ -1068,55 +955,88 @@ class AutomationToolGUI(QMainWindow):
         self.progress_dialog.setAutoReset(False)
         
         # Get all steps
-        steps = []
-        for i in range(self.steps_list.count()):
-            item = self.steps_list.item(i)
-            widget = self.steps_list.itemWidget(item)
-            if widget:
-                step_data = widget.get_data()
-                steps.append(step_data)
+        steps = self.steps_list.steps()
 
         if not steps:
             self.progress_dialog.close()
             self.progress_dialog = None
             return
 
-        # Create and start executor thread
+        # Create and start executor thread, releasing the previous run's executor first
+        if self.executor_thread is None or not self.executor_thread.isRunning():
+            self.executor.close()
         self.executor = WorkflowExecutor()
         self.executor_thread = ExecutorThread(self.executor, steps)
         
         # Connect signals
-        self.executor.step_started.connect(self.on_step_started)
-        self.executor.step_completed.connect(self.on_step_completed)
         self.executor.step_error.connect(self.on_step_error)
         self.executor.workflow_completed.connect(self.on_workflow_completed)
-        self.executor.debug_info.connect(self.on_debug_info)
+        self.executor.debug_sink = self.log_view.append
+        self.perf_panel.set_source(self.executor.perf_counters)
         self.executor_thread.finished.connect(self.on_executor_thread_finished)
         
         # Set debug mode
         self.executor.debug_mode = self.debug_mode.isChecked()
+
+        # Set playback timing
+        self.executor.replay_delays = self.replay_delays.isChecked()
+        self.executor.playback_speed = self.playback_speed.value()
+        self.executor.min_gap = self.min_gap.value()
+        self.executor.max_gap = max(self.max_gap.value(), self.min_gap.value())
+
+        # Record a trace of the run if requested
+        self.executor.tracer.enabled = self.trace_action.isChecked()
+
+        # Export live metrics if requested
+        self.executor.export_metrics = self.metrics_action.isChecked()
+        self.executor.metrics_port = self.metrics_port
+
+        # Watch memory growth if requested
+        self.executor.memory_watch = self.memory_action.isChecked()
+
+        # Sample the run's stacks if the profiler is switched on
+        self.executor.sample_runs = self.sampling_action.isChecked()
+
+        # Set default mouse motion
+        self.executor.motion.mode = self.motion_mode.currentText()
+
+        # Set input backend
+        if self.input_backend.currentText() != "pyautogui":
+            try:
+                self.executor.set_input_backend(self.input_backend.currentText())
+            except Exception as e:
+                QMessageBox.warning(self, "Input Backend", f"Could not start input backend, using pyautogui: {str(e)}")
         
         # Get loop count
         loop_count = self.loop_count.value()
         
         # Start execution
         self.executor_thread.start(loop_count)
+        self.progress_timer.start()
         
         # Update UI state
         # self.pause_btn.setEnabled(True)
         # self.pause_btn.setChecked(False)
         # self.pause_btn.setText("⏸️ Pause")
 
-    def on_step_started(self, step_index, step_type):
-        """Handle step started signal"""
-        if self.progress_dialog:
-            self.progress_dialog.setLabelText(f"Executing step {step_index + 1}: {step_type}")
-            self.progress_dialog.setValue(step_index)
+    def update_progress(self):
+        """Refresh the progress dialog from the executor's latest snapshot"""
+        if not self.progress_dialog:
+            return
+        state = self.executor.progress.snapshot()
+        if state["current_step"] < 0:
+            return
 
-    def on_step_completed(self, step_index):
-        """Handle step completed signal"""
-        if self.progress_dialog:
-            self.progress_dialog.setValue(step_index + 1)
+        label = f"Executing step {state['current_step'] + 1}/{state['total_steps']}: {state['step_name']} ({state['step_type']})"
+        if state["loop_count"] > 1:
+            label += f"\nGlobal loop {state['global_loop']}/{state['loop_count']}"
+        for depth, (start, iteration, iterations) in enumerate(state["loop_stack"], 1):
+            label += f"\n{'  ' * depth}Loop at step {start + 1}: {iteration}/{iterations}"
+        label += f"\n{state['recent_steps_per_sec']:.1f} steps/s"
+        if state["errors"]:
+            label += f", {state['errors']} error(s)"
+        self.progress_dialog.setLabelText(label)
+        self.progress_dialog.setValue(state["current_step"] + 1)
 
     def on_step_error(self, step_index, error):
         """Handle step error signal"""
@@ -1136,6 +1056,8 @@ class AutomationToolGUI(QMainWindow):
 
     def on_workflow_completed(self):
         """Handle workflow completed signal"""
+        self.progress_timer.stop()
+        self.profile_view.set_report(self.executor.profile_report)
         if self.progress_dialog:
             self.progress_dialog.close()
             self.progress_dialog = None
@@ -1145,6 +1067,7 @@ class AutomationToolGUI(QMainWindow):
 
     def on_executor_thread_finished(self):
         """Handle executor thread finished signal"""
+        self.progress_timer.stop()
         if self.progress_dialog:
             self.progress_dialog.close()
             self.progress_dialog = None
@@ -1157,11 +1080,19 @@ class AutomationToolGUI(QMainWindow):
     def toggle_debug_mode(self, state):
         """Toggle debug mode"""
         self.executor.debug_mode = bool(state)
-        self.debug_text.append(f"Debug mode {'enabled' if state else 'disabled'}")
+        self.log_view.append(f"Debug mode {'enabled' if state else 'disabled'}")
+
+    def toggle_sampling(self, checked):
+        """Start or stop the sampling profiler on a running workflow; later runs follow the menu state"""
+        if self.executor_thread and self.executor_thread.isRunning():
+            if checked:
+                self.executor.start_sampling()
+            else:
+                self.executor.stop_sampling()
 
     def clear_debug_log(self):
         """Clear the debug log"""
-        self.debug_text.clear()
+        self.log_view.clear()
 
     def open_debug_directory(self):
         """Open the debug directory in file explorer"""
@@ -1199,11 +1130,12 @@ class AutomationToolGUI(QMainWindow):
                 QApplication.processEvents()
             
             if self.executor_thread.isRunning():
-                self.debug_text.append("Force stopping workflow...")
+                self.log_view.append("Force stopping workflow...")
                 self.executor_thread.terminate()
                 self.executor_thread.wait()
             
-            self.debug_text.append("Workflow stopped")
+            self.log_view.append("Workflow stopped")
+            self.progress_timer.stop()
             
             # Clean up progress dialog if it exists
             if self.progress_dialog:
@@ -1217,31 +1149,7 @@ class AutomationToolGUI(QMainWindow):
 
     def on_debug_info(self, info):
         """Handle debug information from executor"""
-        # Format the message with timestamp and appropriate color coding
-        timestamp = time.strftime("%H:%M:%S")
-        
-        # Color coding based on message content
-        if "✓" in info:  # Success messages
-            formatted_msg = f'<span style="color: #00FF00;">[{timestamp}] {info}</span>'
-        elif "❌" in info:  # Error messages
-            formatted_msg = f'<span style="color: #FF0000;">[{timestamp}] {info}</span>'
-        elif "===" in info:  # Step headers
-            formatted_msg = f'<span style="color: #00FFFF;">[{timestamp}] {info}</span>'
-        elif "Warning" in info:  # Warnings
-            formatted_msg = f'<span style="color: #FFA500;">[{timestamp}] {info}</span>'
-        else:  # Regular debug messages
-            formatted_msg = f'<span style="color: #FFFFFF;">[{timestamp}] {info}</span>'
-        
-        # Add the message to the debug text area
-        self.debug_text.append(formatted_msg)
-        
-        # Scroll to the bottom to show the latest message
-        self.debug_text.verticalScrollBar().setValue(
-            self.debug_text.verticalScrollBar().maximum()
-        )
-        
-        # Update the application to ensure the UI remains responsive
-        QApplication.processEvents()
+        self.log_view.append(info)
 
     def closeEvent(self, event):
         """Handle application close event"""
@@ -1251,6 +1159,8 @@ class AutomationToolGUI(QMainWindow):
         except Exception:
             pass
         self.stop_workflow()
+        if self.executor_thread is None or not self.executor_thread.isRunning():
+            self.executor.close()
         event.accept()
 
     def toggle_coordinate_recording(self):
@@ -1295,26 +1205,45 @@ class AutomationToolGUI(QMainWindow):
         """Handle recorded coordinates"""
         if self.coordinate_recording:
             # Update the currently selected step with new coordinates
-            current_item = self.steps_list.currentItem()
-            if current_item:
-                step_widget = self.steps_list.itemWidget(current_item)
-                if step_widget:
-                    if step_widget.step_type == StepType.MOUSE_CLICK:
-                        # Handle mouse click coordinates
-                        old_coords = (step_widget.params.get("x"), step_widget.params.get("y"))
-                        step_widget.update_params({
-                            "click_type": "coordinates",
-                            "x": x,
-                            "y": y
-                        })
-                        message = (
-                            f"Coordinates recorded for step: {step_widget.params.get('name', 'Unnamed Step')}\n"
-                            f"New coordinates: ({x}, {y})\n"
-                        )
-                        if old_coords[0] is not None:
-                            message += f"Previous coordinates: ({old_coords[0]}, {old_coords[1]})"
+            row = self.steps_list.current_row()
+            if row >= 0:
+                step = self.steps_list.step(row)
+                step_type, params = step["type"], step["params"]
+                message = None
+                if step_type == StepType.MOUSE_CLICK:
+                    # Handle mouse click coordinates
+                    old_coords = (params.get("x"), params.get("y"))
+                    self.steps_list.update_params(row, {
+                        "click_type": "coordinates",
+                        "x": x,
+                        "y": y
+                    })
+                    message = (
+                        f"Coordinates recorded for step: {params.get('name', 'Unnamed Step')}\n"
+                        f"New coordinates: ({x}, {y})\n"
+                    )
+                    if old_coords[0] is not None:
+                        message += f"Previous coordinates: ({old_coords[0]}, {old_coords[1]})"
+                elif step_type in [StepType.CLICK_TEXT, StepType.WAIT_TEXT]:
+                    # Seed the OCR search region around the recorded point
+                    margin = params.get("region_margin", 40)
+                    region = [max(0, x - 200 - margin), max(0, y - 30 - margin), 400 + 2 * margin, 60 + 2 * margin]
+                    self.steps_list.update_params(row, {"region": region})
+                    message = (
+                        f"Search region recorded for step: {params.get('name', 'Unnamed Step')}\n"
+                        f"New region: {region}"
+                    )
+                elif step_type == StepType.WAIT_COLOR:
+                    # Add a probe point with the pixel's current colour
+                    color = self.recorder.sample_color(x, y) or "#000000"
+                    points = list(params.get("points", [])) + [[x, y, color]]
+                    self.steps_list.update_params(row, {"points": points})
+                    message = (
+                        f"Pixel recorded for step: {params.get('name', 'Unnamed Step')}\n"
+                        f"Point: ({x}, {y}) colour {color}"
+                    )
 
-                    
+                if message:
                     QMessageBox.information(
                         self,
                         "Coordinates Recorded",
@@ -1328,30 +1257,6 @@ class AutomationToolGUI(QMainWindow):
             # Reset recording state
             self.coordinate_recording = False
 
-    def _cleanup_invalid_items(self):
-        """Clean up any invalid or empty items in the list"""
-        items_to_remove = []
-        for i in range(self.steps_list.count()):
-            item = self.steps_list.item(i)
-            if not item or not self.steps_list.itemWidget(item):
-                items_to_remove.append(i)
-        
-        # Remove items in reverse order to maintain correct indices
-        for i in reversed(items_to_remove):
-            self.steps_list.takeItem(i)
-
-    def _on_steps_reordered(self, parent, start, end, destination, row):
-        """Handle steps reordering after drag and drop"""
-        # Clean up any invalid items that might have been created during drag and drop
-        self._cleanup_invalid_items()
-        
-        # Ensure all remaining items have valid widgets
-        for i in range(self.steps_list.count()):
-            item = self.steps_list.item(i)
-            if item and not self.steps_list.itemWidget(item):
-                # If we find an item without a widget, remove it
-                self.steps_list.takeItem(i)
-
     def show_general_help(self):
         """Show general help dialog"""
         dialog = GeneralHelpDialog(self)
@@ -1392,13 +1297,6 @@ class AutomationToolGUI(QMainWindow):
             # self.pause_btn.setEnabled(False)
             # self.stop_btn.setEnabled(False)
             
-            # Clear any highlighted steps
-            for i in range(self.steps_list.count()):
-                item = self.steps_list.item(i)
-                widget = self.steps_list.itemWidget(item)
-                if widget:
-                    widget.setStyleSheet("")
-            
             QMessageBox.information(self, "Automation Stopped", 
                 "The automation has been stopped.")
             
@@ -1522,8 +1420,11 @@ class StepsHelpDialog(HelpDialog):
             <li><b>Mouse Button:</b> Select left or right mouse button</li>
             <li><b>Coordinates:</b> Specify X and Y screen coordinates (for coordinate-based clicks)</li>
             <li><b>Image Path:</b> Path to the reference image (for image-based clicks)</li>
+            <li><b>Auto-crop:</b> Shrinks the reference image to the smallest patch that is still unique on the current screen; small images are found faster and match in fewer wrong places</li>
             <li><b>Confidence:</b> Matching threshold for image recognition (0.1-1.0)</li>
+            <li><b>Matching Method:</b> Template matching (fastest), keypoint features (ORB/AKAZE, tolerates scaling and theme changes) or template with a feature fallback</li>
             <li><b>Duration:</b> How long the mouse movement takes (in seconds)</li>
+            <li><b>Mouse Motion:</b> Use the workflow default, animate over the duration, jump instantly, or follow a short path (for apps that need hover events)</li>
             <li><b>Text Input After Click:</b> Optional text to type after clicking</li>
             <li><b>Delay Before Typing:</b> Wait time before typing (in seconds)</li>
             <li><b>Special Key:</b> Optional special key to press after typing (Enter, Tab, etc.)</li>
@@ -1549,6 +1450,7 @@ class StepsHelpDialog(HelpDialog):
             <li><b>Text Input:</b> The text to type (single input) or list of texts (multiple inputs)</li>
             <li><b>Special Key:</b> Optional special key to press after typing</li>
             <li><b>Delay:</b> Delay between keystrokes (in seconds)</li>
+            <li><b>Typing Mode:</b> Automatic (by text length), per character, chunked bursts, or paste through the clipboard (the previous clipboard text is restored)</li>
         </ul>
         <p><b>Example 1:</b> Type a single search query and press Enter</p>
         <pre>
@@ -1592,6 +1494,46 @@ class StepsHelpDialog(HelpDialog):
         Key: Tab
         Modifiers: Alt
         </pre>
+
+        <h2>Click Text / Wait For Text Steps</h2>
+        <p><b>Purpose:</b> Click on, or wait for, text found on screen with OCR. Text anchors keep working when windows move.</p>
+        <p><b>Parameters:</b></p>
+        <ul>
+            <li><b>Text to find:</b> The word or phrase to look for</li>
+            <li><b>Language:</b> Tesseract language code (e.g. eng)</li>
+            <li><b>Text Similarity:</b> How closely the recognised text must match (100% = exact)</li>
+            <li><b>OCR Confidence:</b> Minimum Tesseract confidence for a word to count</li>
+            <li><b>Timeout:</b> How long to keep searching before the step fails (in seconds)</li>
+            <li><b>Search Region:</b> Optional screen area to search; smaller regions are much faster</li>
+            <li><b>Wait until text:</b> (Wait For Text only) wait for the text to appear or to disappear</li>
+        </ul>
+        <p><b>Example:</b> Click the Submit button by its label</p>
+        <pre>
+        Step Name: "Submit Form"
+        Text to find: "Submit"
+        Text Similarity: 80%
+        Timeout: 10 seconds
+        </pre>
+
+        <h2>Wait For Color Step</h2>
+        <p><b>Purpose:</b> Wait until a few pixels reach (or leave) an expected colour, e.g. a status light turning green. Much cheaper than an image search.</p>
+        <p><b>Parameters:</b></p>
+        <ul>
+            <li><b>Pixels to Check:</b> Screen points and their expected colours (select the step and use ⏺️ Record to add the pixel under the mouse)</li>
+            <li><b>Colour Tolerance:</b> Maximum difference allowed in each colour channel (0-255)</li>
+            <li><b>Wait until:</b> All or any points match, or stop matching</li>
+            <li><b>Timeout / Check every:</b> How long to wait and how often to check</li>
+        </ul>
+
+        <h2>Mouse Drag Step</h2>
+        <p><b>Purpose:</b> Press a mouse button, move along a path and release, e.g. for drag-and-drop or sliders. Drags are created automatically when you move the mouse with a button held during action recording.</p>
+        <p><b>Parameters:</b></p>
+        <ul>
+            <li><b>Drag Path:</b> Points the pointer passes through, as "x,y x,y ..."; recorded paths are simplified to the few points needed to follow the original movement within 2 pixels</li>
+            <li><b>Mouse Button:</b> Button held during the drag</li>
+            <li><b>Drag Duration:</b> How long the drag takes (divided by the playback speed)</li>
+            <li><b>Move Rate:</b> How many pointer positions are sent per second along the path</li>
+        </ul>
         
 
         """
@@ -1633,6 +1575,10 @@ class RecordingHelpDialog(HelpDialog):
             <li>Special key presses</li>
             <li>Mouse drag operations</li>
         </ul>
+
+        <p><b>Image Anchors:</b> Enable <i>Tools → Capture Image Anchors While Recording</i> to save a small image around each recorded click.
+        On playback the click goes wherever that image is found near its recorded position, so workflows keep working when windows move.
+        Anchors that look the same as other parts of the screen are marked as unreliable, and their steps use the recorded coordinates instead.</p>
         
         <p><b>Example:</b> Recording a login sequence</p>
         <ol>
@@ -1680,6 +1626,7 @@ class RecordingHelpDialog(HelpDialog):
             <li>Special keys (Enter, Tab, etc.) are recorded as separate steps</li>
             <li>Key combinations (Ctrl+C, Alt+Tab, etc.) are recorded as Keyboard Special steps</li>
             <li>If you need to type slowly or with specific timing, edit the delay parameter after recording</li>
+            <li>The real pause before each recorded step is stored with it. Use the Speed, Gap min and Gap max controls to replay recordings faster, or replace a pause with a wait for text or an image in the step's settings</li>
         </ul>
         """
         
@@ -1787,6 +1734,18 @@ class AboutDialog(QDialog):
         self.setFixedSize(500, 600)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Automation Tool")
+    parser.add_argument("--json-log", action="store_true", help="Also write the log as JSON lines (debug/automation.jsonl)")
+    parser.add_argument("--trace", action="store_true", help="Record a trace of each run (debug/trace_*.json)")
+    parser.add_argument("--metrics", action="store_true", help="Write live OpenMetrics counters during runs (debug/automation.prom)")
+    parser.add_argument("--metrics-port", type=int, help="Also serve the metrics on http://127.0.0.1:<port>/metrics (implies --metrics)")
+    parser.add_argument("--profile", action="store_true", help="Run the sampling profiler during runs (debug/sample_profile_*)")
+    parser.add_argument("--memwatch", action="store_true", help="Report memory growth per global loop iteration (debug/memory.json)")
+    args, qt_args = parser.parse_known_args()
+
+    # Configure logging: a background thread writes rotating files in the debug folder
+    setup_logging(DEBUG_DIR, json_lines=args.json_log)
+
     # Suppress Qt DPI warnings
     os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
     os.environ["QT_LOGGING_RULES"] = "qt.qpa.window=false"  # Suppress DPI warning messages
@@ -1795,7 +1754,12 @@ if __name__ == '__main__':
         Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
     )
     
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
     window = AutomationToolGUI()
+    window.trace_action.setChecked(args.trace)
+    window.metrics_action.setChecked(args.metrics or args.metrics_port is not None)
+    window.metrics_port = args.metrics_port
+    window.memory_action.setChecked(args.memwatch)
+    window.sampling_action.setChecked(args.profile)
     window.show()
     sys.exit(app.exec())
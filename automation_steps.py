@@ -2,10 +2,13 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QComboBox, QSpinBox, QCheckBox, QFileDialog,
     QRadioButton, QButtonGroup, QGroupBox, QTabWidget, QWidget,
-    QListWidget
+    QListWidget, QDoubleSpinBox, QMessageBox, QApplication
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QThread
 import json
+import os
+import re
+import time
 
 class StepType:
     MOUSE_CLICK = "Mouse Click"
@@ -14,6 +17,109 @@ class StepType:
     WAIT = "Wait"
     LOOP_START = "Loop Start"
     LOOP_END = "Loop End"
+    CLICK_TEXT = "Click Text"
+    WAIT_TEXT = "Wait For Text"
+    WAIT_COLOR = "Wait For Color"
+    MOUSE_DRAG = "Mouse Drag"
+
+# Image matching methods: label -> (match_method, feature_detector)
+MATCH_METHODS = {
+    "Template": ("template", "orb"),
+    "Features (ORB)": ("feature", "orb"),
+    "Features (AKAZE)": ("feature", "akaze"),
+    "Template, then features": ("auto", "orb"),
+}
+
+# Typing strategies: label -> typing_mode
+TYPING_MODES = {
+    "Automatic": "auto",
+    "Per character": "per_char",
+    "Chunked": "chunked",
+    "Paste": "paste",
+}
+
+# Mouse motion overrides: label -> motion_mode
+MOTION_LABELS = {
+    "Workflow default": "default",
+    "Animated": "tween",
+    "Instant": "instant",
+    "Short path": "path",
+}
+
+# Adaptive replacements for a recorded delay: label -> condition type
+DELAY_CONDITIONS = {
+    "(use recorded delay)": "none",
+    "text appears": "text",
+    "image appears": "image",
+}
+
+class AutoCropWorker(QThread):
+    """Finds and saves the smallest unique crop of a screenshot, off the GUI thread.
+
+    Emits result_ready(crop_path, message); crop_path is empty when no crop was saved.
+    """
+    result_ready = pyqtSignal(str, str)
+
+    def __init__(self, screen, image_path, point, confidence):
+        super().__init__()
+        self.screen = screen
+        self.image_path = image_path
+        self.point = point
+        self.confidence = confidence
+
+    def run(self):
+        try:
+            self.result_ready.emit(*self.crop())
+        except Exception as e:
+            self.result_ready.emit("", f"Auto-crop failed: {e}")
+
+    def crop(self):
+        import cv2
+        from executor import IMAGES_DIR
+        from vision import minimal_unique_crop, match_time
+
+        screen = self.screen
+        gray = cv2.cvtColor(screen, cv2.COLOR_RGB2GRAY)
+
+        # Crop inside the current template where it is on screen, otherwise around the X/Y coordinates
+        image_path = self.image_path
+        template = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE) if image_path and os.path.exists(image_path) else None
+        if template is not None:
+            result = cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(result)
+            if max_val < self.confidence:
+                return "", "The current image is not visible on screen, so it can't be cropped."
+            h, w = template.shape
+            bounds = (max_loc[0], max_loc[1], w, h)
+            x, y = max_loc[0] + w // 2, max_loc[1] + h // 2
+        else:
+            bounds = None
+            x, y = self.point
+
+        crop = minimal_unique_crop(gray, x, y, bounds=bounds)
+        if crop is None:
+            return "", "No crop around this point is unique on screen."
+        left, top, width, height, score = crop
+
+        # Save next to the original image (or in the images folder) and report the lookup speedup
+        if template is not None:
+            base, _ = os.path.splitext(image_path)
+            crop_path = f"{base}_crop.png"
+        else:
+            crop_path = os.path.join(IMAGES_DIR, f"crop_{x}_{y}.png")
+        patch = screen[top:top + height, left:left + width]
+        cv2.imwrite(crop_path, cv2.cvtColor(patch, cv2.COLOR_RGB2BGR))
+
+        message = f"Saved a {width}x{height} patch (uniqueness {score:.2f}) to:\n{crop_path}"
+        if template is not None:
+            before = match_time(gray, template)
+            after = match_time(gray, gray[top:top + height, left:left + width])
+            message += (
+                f"\n\nOriginal image: {template.shape[1]}x{template.shape[0]}"
+                f"\nLookup time: {before * 1000:.1f} ms → {after * 1000:.1f} ms ({before / max(after, 1e-6):.1f}x faster)"
+            )
+        return crop_path, message
+
 
 class BaseStepDialog(QDialog):
     def __init__(self, parent=None, params=None):
@@ -106,6 +212,11 @@ class BaseStepDialog(QDialog):
         # Add specific fields
         self.add_specific_fields(layout)
 
+        # Recorded timing (only for steps created by the recorder)
+        self.delay_group = None
+        if "recorded_delay" in self.params:
+            self.add_recorded_delay_fields(layout)
+
         # Buttons
         button_layout = QHBoxLayout()
         save_btn = QPushButton("Save")
@@ -119,11 +230,85 @@ class BaseStepDialog(QDialog):
     def add_specific_fields(self, layout):
         pass
 
+    def accept(self):
+        """Only close the dialog once the entered values can be saved"""
+        try:
+            self.get_params()
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Step", str(e))
+            return
+        super().accept()
+
+    def add_recorded_delay_fields(self, layout):
+        """Add controls for the recorded gap before this step"""
+        self.delay_group = QGroupBox("Recorded Delay Before Step")
+        delay_layout = QVBoxLayout()
+
+        gap_layout = QHBoxLayout()
+        self.recorded_delay = QDoubleSpinBox()
+        self.recorded_delay.setRange(0, 3600)
+        self.recorded_delay.setDecimals(3)
+        self.recorded_delay.setValue(self.params.get("recorded_delay", 0))
+        gap_layout.addWidget(QLabel("Delay (seconds):"))
+        gap_layout.addWidget(self.recorded_delay)
+        delay_layout.addLayout(gap_layout)
+
+        condition = self.params.get("delay_condition") or {}
+        condition_layout = QHBoxLayout()
+        condition_layout.addWidget(QLabel("Instead, wait until:"))
+        self.delay_condition = QComboBox()
+        for label in DELAY_CONDITIONS:
+            self.delay_condition.addItem(label)
+        for i, condition_type in enumerate(DELAY_CONDITIONS.values()):
+            if condition_type == condition.get("type", "none"):
+                self.delay_condition.setCurrentIndex(i)
+                break
+        condition_layout.addWidget(self.delay_condition)
+        self.delay_condition_value = QLineEdit(condition.get("text", condition.get("image_path", "")))
+        self.delay_condition_value.setPlaceholderText("Text or image path")
+        condition_layout.addWidget(self.delay_condition_value)
+        delay_layout.addLayout(condition_layout)
+
+        self.delay_group.setLayout(delay_layout)
+        layout.addWidget(self.delay_group)
+
+    def add_motion_field(self, layout):
+        """Add the per-step mouse motion override selector"""
+        motion_layout = QHBoxLayout()
+        motion_layout.addWidget(QLabel("Mouse Motion:"))
+        self.motion_mode = QComboBox()
+        for label in MOTION_LABELS:
+            self.motion_mode.addItem(label)
+        for i, mode in enumerate(MOTION_LABELS.values()):
+            if mode == self.params.get("motion_mode", "default"):
+                self.motion_mode.setCurrentIndex(i)
+                break
+        self.motion_mode.setToolTip(
+            "Workflow default: use the setting from the main window\n"
+            "Animated: move over the movement duration\n"
+            "Instant: jump straight to the target\n"
+            "Short path: a quick eased path, for apps that need hover events"
+        )
+        motion_layout.addWidget(self.motion_mode)
+        layout.addLayout(motion_layout)
+
     def get_params(self):
-        return {
+        params = {
             "name": self.name_edit.text(),
             "enable_loop": self.enable_loop.isChecked()
         }
+        if self.delay_group is not None:
+            condition_type = DELAY_CONDITIONS[self.delay_condition.currentText()]
+            condition = None
+            if condition_type == "text":
+                condition = {"type": "text", "text": self.delay_condition_value.text()}
+            elif condition_type == "image":
+                condition = {"type": "image", "image_path": self.delay_condition_value.text()}
+            params.update({
+                "recorded_delay": self.recorded_delay.value(),
+                "delay_condition": condition
+            })
+        return params
 
 class MouseClickDialog(BaseStepDialog):
     def add_specific_fields(self, layout):
@@ -220,6 +405,14 @@ class MouseClickDialog(BaseStepDialog):
         browse_btn.clicked.connect(self.browse_single_image)
         single_image_layout.addWidget(self.image_path)
         single_image_layout.addWidget(browse_btn)
+        self.crop_btn = QPushButton("✂️ Auto-crop")
+        self.crop_btn.setToolTip(
+            "Shrink the image to the smallest patch that is still unique on the current screen.\n"
+            "Without an image, a patch around the X/Y coordinates is captured instead."
+        )
+        self.crop_btn.clicked.connect(self.auto_crop_image)
+        self.auto_crop_worker = None
+        single_image_layout.addWidget(self.crop_btn)
         self.single_image_widget.setLayout(single_image_layout)
         image_layout.addWidget(self.single_image_widget)
 
@@ -249,6 +442,25 @@ class MouseClickDialog(BaseStepDialog):
         self.multiple_images_widget.setLayout(multiple_images_layout)
         image_layout.addWidget(self.multiple_images_widget)
 
+        # Matching method
+        method_layout = QHBoxLayout()
+        method_layout.addWidget(QLabel("Matching Method:"))
+        self.match_method = QComboBox()
+        for label in MATCH_METHODS:
+            self.match_method.addItem(label)
+        current = (self.params.get("match_method", "template"), self.params.get("feature_detector", "orb"))
+        for i, label in enumerate(MATCH_METHODS):
+            if MATCH_METHODS[label] == current:
+                self.match_method.setCurrentIndex(i)
+                break
+        self.match_method.setToolTip(
+            "Template: fastest, exact pixel match\n"
+            "Features: tolerates UI scaling and theme changes\n"
+            "Template, then features: falls back to features when the template is not found"
+        )
+        method_layout.addWidget(self.match_method)
+        image_layout.addLayout(method_layout)
+
         self.image_group.setLayout(image_layout)
 
         # Now add all elements to the main layout in the correct order
@@ -274,6 +486,7 @@ class MouseClickDialog(BaseStepDialog):
         duration_layout.addWidget(QLabel("Mouse Movement Duration (seconds):"))
         duration_layout.addWidget(self.duration)
         layout.addLayout(duration_layout)
+        self.add_motion_field(layout)
 
         # Confidence threshold
         conf_layout = QHBoxLayout()
@@ -285,6 +498,23 @@ class MouseClickDialog(BaseStepDialog):
         conf_layout.addWidget(self.confidence)
         layout.addLayout(conf_layout)
 
+        # Image anchor captured while recording
+        self.use_anchor = None
+        anchor = self.params.get("anchor")
+        if anchor:
+            anchor_layout = QHBoxLayout()
+            self.use_anchor = QCheckBox("Find recorded image anchor before clicking")
+            self.use_anchor.setChecked(self.params.get("use_anchor", True))
+            self.use_anchor.setToolTip(
+                "Clicks where the patch recorded around this point is found now,\n"
+                "so the step survives windows and layouts moving"
+            )
+            anchor_layout.addWidget(self.use_anchor)
+            score = anchor.get("score")
+            score_text = "not scored yet" if score is None else f"uniqueness {score:.2f}"
+            anchor_layout.addWidget(QLabel(f"({score_text})"))
+            layout.addLayout(anchor_layout)
+
         # Text input after click option
         text_group = QGroupBox("Text Input After Click")
         text_layout = QVBoxLayout()
@@ -372,6 +602,60 @@ class MouseClickDialog(BaseStepDialog):
         if file_name:
             self.image_path.setText(file_name)
 
+    def auto_crop_image(self):
+        """Replace the image with the smallest crop around the click point that matches only once"""
+        # Imported here: the recorder and executor import this module
+        import numpy as np
+        import pyautogui
+        from recorder import ActionRecorder
+
+        if self.auto_crop_worker is not None and self.auto_crop_worker.isRunning():
+            return
+
+        # Capture the reference screen with this dialog out of the way. Hiding it would end its exec() loop,
+        # so it is only made transparent.
+        self.setWindowOpacity(0)
+        QApplication.processEvents()
+        time.sleep(0.3)
+        screen_width, screen_height = pyautogui.size()
+        screenshot = ActionRecorder.take_screenshot(0, 0, screen_width, screen_height)
+        self.setWindowOpacity(1)
+        if screenshot is None:
+            QMessageBox.warning(self, "Auto-crop", "Could not capture the screen.")
+            return
+
+        # The searches run several full-screen matches, so they happen off the GUI thread
+        self.auto_crop_worker = AutoCropWorker(
+            np.asarray(screenshot.convert("RGB")),
+            self.image_path.text().strip(),
+            (self.x_coord.value(), self.y_coord.value()),
+            self.confidence.value() / 100,
+        )
+        self.auto_crop_worker.result_ready.connect(self.on_auto_crop_finished)
+        self.crop_btn.setEnabled(False)
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        self.auto_crop_worker.start()
+
+    def done(self, result):
+        """Wait for a running auto-crop, so its thread isn't destroyed along with the dialog"""
+        if self.auto_crop_worker is not None and self.auto_crop_worker.isRunning():
+            self.auto_crop_worker.result_ready.disconnect()
+            self.auto_crop_worker.wait()
+            QApplication.restoreOverrideCursor()
+        super().done(result)
+
+    def on_auto_crop_finished(self, crop_path, message):
+        """Apply the auto-crop worker's result; `crop_path` is empty if no crop was made"""
+        QApplication.restoreOverrideCursor()
+        self.crop_btn.setEnabled(True)
+        if not crop_path:
+            QMessageBox.warning(self, "Auto-crop", message)
+            return
+        self.image_path.setText(crop_path)
+        self.click_type.button(1).setChecked(True)
+        self.on_click_type_changed()
+        QMessageBox.information(self, "Auto-crop", message)
+
     def add_image(self):
         """Add a new image to the list"""
         file_name, _ = QFileDialog.getOpenFileName(
@@ -406,6 +690,7 @@ class MouseClickDialog(BaseStepDialog):
             "x": self.x_coord.value(),
             "y": self.y_coord.value(),
             "duration": self.duration.value(),
+            "motion_mode": MOTION_LABELS[self.motion_mode.currentText()],
             "confidence": self.confidence.value() / 100,
             "type_after_click": self.enable_text.isChecked(),
             "text_input_type": "fixed",
@@ -414,9 +699,14 @@ class MouseClickDialog(BaseStepDialog):
             "type_delay": self.type_delay.value(),
             "special_key": self.special_key.currentText() if self.special_key.currentText() != "None" else None,
         })
+        if self.use_anchor is not None:
+            params["use_anchor"] = self.use_anchor.isChecked()
 
         if is_image:
+            match_method, feature_detector = MATCH_METHODS[self.match_method.currentText()]
             params.update({
+                "match_method": match_method,
+                "feature_detector": feature_detector,
                 "input_type": "multiple" if is_multiple else "single",
                 "image_path": self.image_path.text() if not is_multiple else "",
                 "image_list": [self.image_list.item(i).text() 
@@ -497,6 +787,28 @@ class KeyboardTypeDialog(BaseStepDialog):
         special_group.setLayout(special_layout)
         layout.addWidget(special_group)
 
+        # Typing mode
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("Typing Mode:"))
+        self.typing_mode = QComboBox()
+        for label in TYPING_MODES:
+            self.typing_mode.addItem(label)
+        # New steps choose automatically; existing steps without a mode keep typing per character
+        current_mode = self.params.get("typing_mode", "per_char" if self.params else "auto")
+        for i, (label, mode) in enumerate(TYPING_MODES.items()):
+            if mode == current_mode:
+                self.typing_mode.setCurrentIndex(i)
+                break
+        self.typing_mode.setToolTip(
+            "Automatic: choose by text length\n"
+            "Per character: one key at a time with the delay below\n"
+            "Chunked: bursts of characters, delay only between bursts\n"
+            "Paste: via the clipboard (previous text is restored; if the clipboard\n"
+            "holds no text, e.g. an image, chunked typing is used instead)"
+        )
+        mode_layout.addWidget(self.typing_mode)
+        layout.addLayout(mode_layout)
+
         # Delay
         delay_layout = QHBoxLayout()
         self.delay = QSpinBox()
@@ -555,6 +867,7 @@ class KeyboardTypeDialog(BaseStepDialog):
                          for i in range(self.text_list.count())] if not is_single else [],
             "special_key": self.special_keys.currentText() if self.special_keys.currentText() != "None" else None,
             "delay": self.delay.value(),
+            "typing_mode": TYPING_MODES[self.typing_mode.currentText()],
             "current_text_index": 0  # Track which text to use in multiple mode
         })
         return params
@@ -704,6 +1017,340 @@ class LoopEndDialog(BaseStepDialog):
     def add_specific_fields(self, layout):
         layout.addWidget(QLabel("Marks the end of a loop block."))
 
+class TextStepDialog(BaseStepDialog):
+    """Shared fields for steps that locate text on screen with OCR"""
+    def add_specific_fields(self, layout):
+        # Text to search for
+        layout.addWidget(QLabel("Text to find:"))
+        self.search_text = QLineEdit(self.params.get("text", ""))
+        self.search_text.setPlaceholderText("e.g. Submit")
+        layout.addWidget(self.search_text)
+
+        # OCR options
+        ocr_group = QGroupBox("OCR Options")
+        ocr_layout = QVBoxLayout()
+
+        lang_layout = QHBoxLayout()
+        lang_layout.addWidget(QLabel("Language:"))
+        self.lang = QLineEdit(self.params.get("lang", "eng"))
+        self.lang.setToolTip("Tesseract language code(s), e.g. 'eng' or 'eng+deu'")
+        lang_layout.addWidget(self.lang)
+        ocr_layout.addLayout(lang_layout)
+
+        fuzzy_layout = QHBoxLayout()
+        self.fuzzy_threshold = QSpinBox()
+        self.fuzzy_threshold.setRange(1, 100)
+        self.fuzzy_threshold.setValue(int(self.params.get("fuzzy_threshold", 0.8) * 100))
+        self.fuzzy_threshold.setToolTip("How closely the recognised text must match (100% = exact)")
+        fuzzy_layout.addWidget(QLabel("Text Similarity (%):"))
+        fuzzy_layout.addWidget(self.fuzzy_threshold)
+        ocr_layout.addLayout(fuzzy_layout)
+
+        conf_layout = QHBoxLayout()
+        self.confidence = QSpinBox()
+        self.confidence.setRange(0, 100)
+        self.confidence.setValue(int(self.params.get("confidence", 0.6) * 100))
+        conf_layout.addWidget(QLabel("OCR Confidence (%):"))
+        conf_layout.addWidget(self.confidence)
+        ocr_layout.addLayout(conf_layout)
+
+        timeout_layout = QHBoxLayout()
+        self.timeout = QSpinBox()
+        self.timeout.setRange(0, 3600)
+        self.timeout.setValue(self.params.get("timeout", 10))
+        timeout_layout.addWidget(QLabel("Timeout (seconds):"))
+        timeout_layout.addWidget(self.timeout)
+        ocr_layout.addLayout(timeout_layout)
+
+        ocr_group.setLayout(ocr_layout)
+        layout.addWidget(ocr_group)
+
+        # Search region
+        self.region_group = QGroupBox("Restrict Search Region")
+        self.region_group.setCheckable(True)
+        region = self.params.get("region")
+        self.region_group.setChecked(bool(region))
+        region_layout = QHBoxLayout()
+        region = region or [0, 0, 400, 60]
+        self.region_fields = []
+        for label, value in zip(["X:", "Y:", "W:", "H:"], region):
+            spin = QSpinBox()
+            if label in ["X:", "Y:"]:
+                spin.setRange(-9999, 9999)
+            else:
+                spin.setRange(1, 9999)
+            spin.setValue(value)
+            region_layout.addWidget(QLabel(label))
+            region_layout.addWidget(spin)
+            self.region_fields.append(spin)
+        self.region_group.setLayout(region_layout)
+        layout.addWidget(self.region_group)
+
+        # Automatic region derivation
+        auto_layout = QHBoxLayout()
+        self.auto_region = QCheckBox("Remember region where text is found")
+        self.auto_region.setChecked(self.params.get("auto_region", True))
+        self.auto_region.setToolTip(
+            "Store the area around the first match and search only there on later runs.\n"
+            "The area is widened automatically if the text is not found."
+        )
+        auto_layout.addWidget(self.auto_region)
+        self.region_margin = QSpinBox()
+        self.region_margin.setRange(0, 1000)
+        self.region_margin.setValue(self.params.get("region_margin", 40))
+        auto_layout.addWidget(QLabel("Margin (px):"))
+        auto_layout.addWidget(self.region_margin)
+        layout.addLayout(auto_layout)
+
+    def get_params(self):
+        params = super().get_params()
+        params.update({
+            "text": self.search_text.text(),
+            "lang": self.lang.text().strip() or "eng",
+            "fuzzy_threshold": self.fuzzy_threshold.value() / 100,
+            "confidence": self.confidence.value() / 100,
+            "timeout": self.timeout.value(),
+            "region": [spin.value() for spin in self.region_fields] if self.region_group.isChecked() else None,
+            "auto_region": self.auto_region.isChecked(),
+            "region_margin": self.region_margin.value()
+        })
+        return params
+
+class ClickTextDialog(TextStepDialog):
+    def add_specific_fields(self, layout):
+        super().add_specific_fields(layout)
+
+        # Mouse button selection
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(QLabel("Mouse Button:"))
+        self.mouse_button = QComboBox()
+        self.mouse_button.addItems(["left", "right"])
+        index = self.mouse_button.findText(self.params.get("button", "left"))
+        self.mouse_button.setCurrentIndex(index if index >= 0 else 0)
+        button_layout.addWidget(self.mouse_button)
+        layout.addLayout(button_layout)
+
+        # Duration control
+        duration_layout = QHBoxLayout()
+        self.duration = QSpinBox()
+        self.duration.setRange(0, 10)  # 0-10 seconds
+        self.duration.setValue(self.params.get("duration", 0))
+        duration_layout.addWidget(QLabel("Mouse Movement Duration (seconds):"))
+        duration_layout.addWidget(self.duration)
+        layout.addLayout(duration_layout)
+        self.add_motion_field(layout)
+
+    def get_params(self):
+        params = super().get_params()
+        params.update({
+            "button": self.mouse_button.currentText(),
+            "duration": self.duration.value(),
+            "motion_mode": MOTION_LABELS[self.motion_mode.currentText()]
+        })
+        return params
+
+class WaitTextDialog(TextStepDialog):
+    def add_specific_fields(self, layout):
+        super().add_specific_fields(layout)
+
+        # Wait condition
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("Wait until text:"))
+        self.wait_mode = QComboBox()
+        self.wait_mode.addItems(["appears", "disappears"])
+        index = self.wait_mode.findText(self.params.get("wait_mode", "appears"))
+        self.wait_mode.setCurrentIndex(index if index >= 0 else 0)
+        mode_layout.addWidget(self.wait_mode)
+        layout.addLayout(mode_layout)
+
+    def get_params(self):
+        params = super().get_params()
+        params.update({
+            "wait_mode": self.wait_mode.currentText()
+        })
+        return params
+
+class WaitColorDialog(BaseStepDialog):
+    def add_specific_fields(self, layout):
+        # Probe points
+        points_group = QGroupBox("Pixels to Check")
+        points_layout = QVBoxLayout()
+        self.point_list = QListWidget()
+        for x, y, color in self.params.get("points", []):
+            self.point_list.addItem(f"{x}, {y}, {color}")
+        points_layout.addWidget(self.point_list)
+
+        entry_layout = QHBoxLayout()
+        self.point_x = QSpinBox()
+        self.point_y = QSpinBox()
+        self.point_x.setRange(0, 9999)
+        self.point_y.setRange(0, 9999)
+        self.point_color = QLineEdit()
+        self.point_color.setPlaceholderText("#00ff00")
+        entry_layout.addWidget(QLabel("X:"))
+        entry_layout.addWidget(self.point_x)
+        entry_layout.addWidget(QLabel("Y:"))
+        entry_layout.addWidget(self.point_y)
+        entry_layout.addWidget(QLabel("Colour:"))
+        entry_layout.addWidget(self.point_color)
+        points_layout.addLayout(entry_layout)
+
+        buttons_layout = QHBoxLayout()
+        add_point_btn = QPushButton("Add Point")
+        remove_point_btn = QPushButton("Remove Selected")
+        add_point_btn.clicked.connect(self.add_point)
+        remove_point_btn.clicked.connect(self.remove_point)
+        buttons_layout.addWidget(add_point_btn)
+        buttons_layout.addWidget(remove_point_btn)
+        points_layout.addLayout(buttons_layout)
+        points_group.setLayout(points_layout)
+        layout.addWidget(points_group)
+
+        # Matching options
+        tolerance_layout = QHBoxLayout()
+        self.tolerance = QSpinBox()
+        self.tolerance.setRange(0, 255)
+        self.tolerance.setValue(self.params.get("tolerance", 20))
+        self.tolerance.setToolTip("Maximum difference allowed in each colour channel")
+        tolerance_layout.addWidget(QLabel("Colour Tolerance:"))
+        tolerance_layout.addWidget(self.tolerance)
+        layout.addLayout(tolerance_layout)
+
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("Wait until:"))
+        self.match_mode = QComboBox()
+        self.match_mode.addItems(["all", "any"])
+        index = self.match_mode.findText(self.params.get("match_mode", "all"))
+        self.match_mode.setCurrentIndex(index if index >= 0 else 0)
+        mode_layout.addWidget(self.match_mode)
+        mode_layout.addWidget(QLabel("points"))
+        self.wait_mode = QComboBox()
+        self.wait_mode.addItems(["match", "stop matching"])
+        index = self.wait_mode.findText(self.params.get("wait_mode", "match"))
+        self.wait_mode.setCurrentIndex(index if index >= 0 else 0)
+        mode_layout.addWidget(self.wait_mode)
+        layout.addLayout(mode_layout)
+
+        timeout_layout = QHBoxLayout()
+        self.timeout = QSpinBox()
+        self.timeout.setRange(0, 3600)
+        self.timeout.setValue(self.params.get("timeout", 10))
+        timeout_layout.addWidget(QLabel("Timeout (seconds):"))
+        timeout_layout.addWidget(self.timeout)
+        layout.addLayout(timeout_layout)
+
+        poll_layout = QHBoxLayout()
+        self.poll_interval = QSpinBox()
+        self.poll_interval.setRange(1, 5000)
+        self.poll_interval.setValue(self.params.get("poll_interval", 20))
+        poll_layout.addWidget(QLabel("Check every (ms):"))
+        poll_layout.addWidget(self.poll_interval)
+        layout.addLayout(poll_layout)
+
+    def add_point(self):
+        """Add the point entered in the X/Y/colour fields to the list"""
+        color = self.point_color.text().strip() or "#000000"
+        if not color.startswith("#"):
+            color = "#" + color
+        if not re.fullmatch(r"#[0-9a-fA-F]{6}", color):
+            QMessageBox.warning(self, "Invalid Colour", f"'{color}' is not a colour; use #rrggbb, e.g. #1e90ff")
+            return
+        self.point_list.addItem(f"{self.point_x.value()}, {self.point_y.value()}, {color.lower()}")
+
+    def remove_point(self):
+        """Remove the selected point from the list"""
+        current_item = self.point_list.currentItem()
+        if current_item:
+            self.point_list.takeItem(self.point_list.row(current_item))
+
+    def get_params(self):
+        params = super().get_params()
+        points = []
+        for i in range(self.point_list.count()):
+            text = self.point_list.item(i).text()
+            try:
+                x, y, color = [part.strip() for part in text.split(",")]
+                points.append([int(x), int(y), color])
+            except ValueError:
+                raise ValueError(f"Invalid pixel '{text}': expected x, y, #rrggbb")
+            if not re.fullmatch(r"#[0-9a-fA-F]{6}", color):
+                raise ValueError(f"Invalid colour '{color}' for pixel {x}, {y}: use #rrggbb")
+        if not points:
+            raise ValueError("Add at least one pixel to wait for")
+        params.update({
+            "points": points,
+            "tolerance": self.tolerance.value(),
+            "match_mode": self.match_mode.currentText(),
+            "wait_mode": self.wait_mode.currentText(),
+            "timeout": self.timeout.value(),
+            "poll_interval": self.poll_interval.value()
+        })
+        return params
+
+class MouseDragDialog(BaseStepDialog):
+    def add_specific_fields(self, layout):
+        # Path points
+        path_group = QGroupBox("Drag Path")
+        path_layout = QVBoxLayout()
+        flat = self.params.get("path", [])
+        points = [f"{x},{y}" for x, y in zip(flat[0::2], flat[1::2])]
+        self.path_edit = QLineEdit(" ".join(points))
+        self.path_edit.setPlaceholderText("x,y x,y ... (first point is where the button is pressed)")
+        self.path_edit.setToolTip("Points the pointer passes through while the button is held")
+        path_layout.addWidget(self.path_edit)
+        path_layout.addWidget(QLabel(f"{len(points)} points"))
+        path_group.setLayout(path_layout)
+        layout.addWidget(path_group)
+
+        # Mouse button selection
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(QLabel("Mouse Button:"))
+        self.mouse_button = QComboBox()
+        self.mouse_button.addItems(["left", "right"])
+        index = self.mouse_button.findText(self.params.get("button", "left"))
+        self.mouse_button.setCurrentIndex(index if index >= 0 else 0)
+        button_layout.addWidget(self.mouse_button)
+        layout.addLayout(button_layout)
+
+        # Timing
+        duration_layout = QHBoxLayout()
+        self.duration = QDoubleSpinBox()
+        self.duration.setRange(0, 60)
+        self.duration.setDecimals(3)
+        self.duration.setValue(self.params.get("duration", 0.5))
+        self.duration.setToolTip("Time the drag takes; divided by the workflow playback speed")
+        duration_layout.addWidget(QLabel("Drag Duration (seconds):"))
+        duration_layout.addWidget(self.duration)
+        layout.addLayout(duration_layout)
+
+        rate_layout = QHBoxLayout()
+        self.rate = QSpinBox()
+        self.rate.setRange(1, 1000)
+        self.rate.setValue(self.params.get("rate", 60))
+        self.rate.setToolTip("Pointer positions sent per second while dragging")
+        rate_layout.addWidget(QLabel("Move Rate (per second):"))
+        rate_layout.addWidget(self.rate)
+        layout.addLayout(rate_layout)
+
+    def get_params(self):
+        params = super().get_params()
+        path = []
+        for point in self.path_edit.text().replace(";", " ").split():
+            try:
+                x, y = point.split(",")
+                path.extend([int(x), int(y)])
+            except ValueError:
+                raise ValueError(f"Invalid drag point '{point}': use x,y with whole numbers, e.g. 100,200")
+        if len(path) < 4:
+            raise ValueError("The drag path needs at least two points")
+        params.update({
+            "path": path,
+            "button": self.mouse_button.currentText(),
+            "duration": self.duration.value(),
+            "rate": self.rate.value()
+        })
+        return params
+
 STEP_DIALOGS = {
     StepType.MOUSE_CLICK: MouseClickDialog,
     StepType.KEYBOARD_TYPE: KeyboardTypeDialog,
@@ -711,5 +1358,9 @@ STEP_DIALOGS = {
     StepType.WAIT: WaitDialog,
     StepType.LOOP_START: LoopStartDialog,
     StepType.LOOP_END: LoopEndDialog,
+    StepType.CLICK_TEXT: ClickTextDialog,
+    StepType.WAIT_TEXT: WaitTextDialog,
+    StepType.WAIT_COLOR: WaitColorDialog,
+    StepType.MOUSE_DRAG: MouseDragDialog,
 }
  
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""Microbenchmark for the input injection backends.
+
+Measures events per second and end-to-end latency (event submitted ->
+pointer position observed) for every available backend. It only wiggles the
+pointer by one pixel and taps Shift, so it is safe to run on a desktop.
+
+    python -m benchmarks.input_backends --events 2000
+"""
+import argparse
+import json
+import statistics
+import time
+
+import pyautogui
+
+from input_backend import available_input_backends, get_input_backend
+
+
+def bench_throughput(backend, events, batch):
+    """Inject `events` pointer moves and Shift taps, flushing every `batch` events"""
+    x, y = backend.position()
+    start = time.perf_counter()
+    for i in range(events):
+        if i % 2:
+            backend.move(x + (i // 2) % 2, y, pause=False)
+        else:
+            backend.press("shift", pause=False)
+        if i % batch == batch - 1:
+            backend.flush()
+    backend.flush()
+    elapsed = time.perf_counter() - start
+    backend.move(x, y, pause=False)
+    backend.flush()
+    return events / elapsed if elapsed else float("inf")
+
+
+def bench_latency(backend, samples, timeout=0.5):
+    """Time from submitting a one-pixel move until the pointer is observed there (ms)"""
+    x, y = backend.position()
+    latencies = []
+    for i in range(samples):
+        target = (x + 1 if i % 2 == 0 else x, y)
+        start = time.perf_counter()
+        backend.move(*target, pause=False)
+        backend.flush()
+        while tuple(pyautogui.position()) != target:
+            if time.perf_counter() - start > timeout:
+                break
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1000, help="events per throughput run")
+    parser.add_argument("--batch", type=int, default=50, help="events between flushes")
+    parser.add_argument("--samples", type=int, default=100, help="latency samples")
+    parser.add_argument("--backends", nargs="*", help="backends to test (default: all available)")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.backends or available_input_backends():
+        backend = get_input_backend(name)
+        try:
+            rate = bench_throughput(backend, args.events, args.batch)
+            latencies = bench_latency(backend, args.samples)
+            results[name] = {
+                "events_per_second": round(rate, 1),
+                "latency_ms_p50": round(statistics.median(latencies), 3),
+                "latency_ms_max": round(max(latencies), 3),
+            }
+        finally:
+            backend.close()
+
+    print(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
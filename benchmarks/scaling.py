@@ -0,0 +1,129 @@
+"""Scaling stress test for large workflows.
+
+Generates synthetic workflows of growing size (see benchmarks/workflow_gen.py)
+and measures, per size: file load time, step list population time,
+validation time, and the executor's per-step overhead and memory growth
+when running a same-sized workflow against the synthetic screen and null
+input backend. Costs are reported per step so non-linear growth stands out.
+
+    python -m benchmarks.scaling --sizes 10000 25000 50000 100000 --output scaling.json
+"""
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+from PyQt6.QtWidgets import QApplication
+
+from executor import validate_workflow
+from metrics import rss_bytes
+from step_list import StepListView
+from benchmarks.stubs import offline_executor
+from benchmarks.workflow_gen import generate_workflow, write_templates
+
+# Per-step cost at the largest size over the smallest above which a measure is flagged
+NONLINEAR_RATIO = 1.5
+
+# Execution runs use only cheap steps and single-iteration loops, so the run measures the interpreter
+EXECUTION_MIX = {"click": 0.4, "type": 0.3, "wait": 0.3}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def measure_size(app, size, depth, image_paths, workdir):
+    path = os.path.join(workdir, f"workflow_{size}.json")
+    with open(path, "w") as f:
+        json.dump(generate_workflow(size, depth=depth, image_paths=image_paths), f)
+
+    # What load_workflow_file does: read the file, then fill the step list in one model reset
+    def load():
+        with open(path, "r") as f:
+            return json.load(f)
+
+    load_time, workflow = timed(load)
+    view = StepListView()
+
+    def populate():
+        view.set_steps(workflow["steps"])
+        app.processEvents()
+
+    populate_time, _ = timed(populate)
+    validate_time, problems = timed(lambda: validate_workflow(workflow["steps"]))
+    view.deleteLater()
+    del workflow
+    gc.collect()
+
+    steps = generate_workflow(size, depth=depth, mix=EXECUTION_MIX, loop_iterations=(1, 1))["steps"]
+    executor = offline_executor()
+    rss_before = rss_bytes()
+    run_time, _ = timed(lambda: executor.execute_workflow(steps))
+    rss_after = rss_bytes()
+    executed = executor.progress.snapshot()["steps_done"]
+
+    return {
+        "steps": size,
+        "file_mb": round(os.path.getsize(path) / 1024 / 1024, 2),
+        "load_s": round(load_time, 4),
+        "populate_s": round(populate_time, 4),
+        "validate_s": round(validate_time, 4),
+        "validation_problems": len(problems),
+        "executed_steps": executed,
+        "run_s": round(run_time, 4),
+        "per_step_us": round(run_time / executed * 1e6, 2) if executed else None,
+        "rss_growth_mb": round((rss_after - rss_before) / 1024 / 1024, 2) if rss_before is not None else None,
+    }
+
+
+def scaling_summary(rows):
+    """Per-step cost at the largest size relative to the smallest, for each timed measure"""
+    first, last = rows[0], rows[-1]
+    summary = {}
+    for key in ["load_s", "populate_s", "validate_s", "run_s"]:
+        if not first[key] or not last[key]:
+            continue
+        ratio = (last[key] / last["steps"]) / (first[key] / first["steps"])
+        summary[key] = {"per_step_ratio": round(ratio, 2), "nonlinear": ratio > NONLINEAR_RATIO}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 25000, 50000, 100000])
+    parser.add_argument("--depth", type=int, default=12, help="maximum loop nesting depth")
+    parser.add_argument("--templates", type=int, default=20, help="distinct templates shared by the image steps")
+    parser.add_argument("--output", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        image_paths = write_templates(os.path.join(workdir, "templates"), args.templates)
+        for size in sorted(args.sizes):
+            print(f"Measuring {size} steps...", file=sys.stderr)
+            row = measure_size(app, size, args.depth, image_paths, workdir)
+            rows.append(row)
+            print(
+                f"{row['steps']:>7} steps  {row['file_mb']:>7} MB  load {row['load_s']:.3f}s  "
+                f"populate {row['populate_s']:.3f}s  validate {row['validate_s']:.3f}s  "
+                f"run {row['per_step_us']} us/step  RSS +{row['rss_growth_mb']} MB"
+            )
+
+    summary = scaling_summary(rows) if len(rows) > 1 else {}
+    for key, entry in summary.items():
+        verdict = "grows faster than linear" if entry["nonlinear"] else "linear"
+        print(f"{key}: per-step cost x{entry['per_step_ratio']} from smallest to largest ({verdict})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": rows, "summary": summary}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Display-free stand-ins for the executor's screen capture and input injection.
+
+pyautogui is still imported by the executor, so on Linux without an X
+server run the benchmarks under a virtual one (e.g. `xvfb-run`); nothing is
+captured from or sent to it.
+"""
+import numpy as np
+import cv2
+
+from input_backend import InputBackend
+from vision import Frame, FramePool
+from motion import MotionEngine
+
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+
+class NullBackend(InputBackend):
+    """Input backend that only counts events"""
+    name = "null"
+
+    def __init__(self):
+        self.events = 0
+        self.x = 0
+        self.y = 0
+
+    def position(self):
+        return (self.x, self.y)
+
+    def move(self, x, y, duration=0, pause=True):
+        self.x, self.y = x, y
+        self.events += 1
+
+    def mouse_down(self, button="left", pause=True):
+        self.events += 1
+
+    def mouse_up(self, button="left", pause=True):
+        self.events += 1
+
+    def key_down(self, key, pause=True):
+        self.events += 1
+
+    def key_up(self, key, pause=True):
+        self.events += 1
+
+
+def synthetic_screen(width, height, seed=0):
+    """A desktop-like RGB image: flat panels, bordered boxes and lines of text over a little noise"""
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width, 3), 235, dtype=np.uint8)
+    for _ in range(width * height // 40000):
+        x, y = int(rng.integers(0, width - 40)), int(rng.integers(0, height - 20))
+        w, h = int(rng.integers(40, 400)), int(rng.integers(20, 200))
+        colour = tuple(int(c) for c in rng.integers(0, 255, 3))
+        cv2.rectangle(image, (x, y), (x + w, y + h), colour, -1 if rng.random() < 0.5 else 2)
+    for row in range(0, height, 60):
+        cv2.putText(image, f"Synthetic text line {row // 60}", (20 + row % 300, row + 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (20, 20, 20), 2)
+    noise = rng.integers(0, 6, image.shape, dtype=np.uint8)
+    return cv2.add(image, noise)
+
+
+class SyntheticCapture:
+    """ScreenCapture replacement that "grabs" from a fixed image into pooled buffers.
+
+    The copy into the pool buffer stands in for the real capture's
+    conversion, so lookups pay a comparable per-frame cost.
+    """
+    def __init__(self, screen):
+        self.screen = screen
+        self.pool = FramePool()
+        self.grabs = 0
+
+    def grab(self, region=None):
+        self.grabs += 1
+        if region:
+            x, y, w, h = region
+            source = self.screen[y:y + h, x:x + w]
+            origin = (x, y)
+        else:
+            source = self.screen
+            origin = (0, 0)
+        rgb = self.pool.get("rgb", source.shape)
+        np.copyto(rgb, source)
+        return Frame(rgb, self.pool, origin)
+
+    def sample(self, points):
+        xs = np.array([p[0] for p in points])
+        ys = np.array([p[1] for p in points])
+        return self.screen[ys, xs]
+
+    def close(self):
+        self.pool.clear()
+
+
+def offline_executor(screen=None):
+    """A WorkflowExecutor wired to the synthetic capture and null backend, with debug output off"""
+    from executor import WorkflowExecutor
+
+    executor = WorkflowExecutor()
+    executor.input = NullBackend()
+    executor.motion = MotionEngine(executor.input)
+    executor.motion.mode = "instant"
+    executor.capture = SyntheticCapture(screen if screen is not None else synthetic_screen(*RESOLUTIONS["1080p"]))
+    executor.debug_mode = False
+    executor.debug_sink = lambda message, *args: None
+    executor.replay_delays = False
+    return executor
@@ -0,0 +1,235 @@
+"""Benchmark suite for the executor hot paths.
+
+Runs without touching the real screen or input: frames are synthetic and
+input goes to a counting null backend (see benchmarks/stubs.py). Results are
+written as JSON; --compare flags metrics that got worse than a stored
+baseline by more than --threshold and exits non-zero if any did.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --quick --compare baseline.json --threshold 0.15
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+
+import cv2
+
+from automation_steps import StepType
+from executor import TESSERACT_AVAILABLE
+from vision import DebugImageWriter
+from benchmarks.stubs import RESOLUTIONS, synthetic_screen, offline_executor
+
+TEMPLATE_SIZES = [32, 96, 256]
+
+
+def median_ms(fn, repeat):
+    """Median wall time of `fn()` over `repeat` calls, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def metric(value, unit, better="lower"):
+    return {"value": round(value, 4), "unit": unit, "better": better}
+
+
+def nested_loop_workflow(depth, iterations, body):
+    """`depth` nested loops of `iterations` each, with `body` click steps in the innermost one"""
+    click = {"type": StepType.MOUSE_CLICK, "params": {"name": "Click", "click_type": "coordinates", "x": 10, "y": 10, "duration": 0}}
+    steps = [{"type": StepType.LOOP_START, "params": {"name": f"Loop {d}", "iterations": iterations}} for d in range(depth)]
+    steps += [click] * body
+    steps += [{"type": StepType.LOOP_END, "params": {"name": "Loop End"}} for _ in range(depth)]
+    return steps
+
+
+def bench_interpreter(executor, quick):
+    """Per-step overhead of execute_workflow with deep nested loops and no-op input"""
+    depth, iterations = (3, 4) if quick else (5, 4)
+    steps = nested_loop_workflow(depth, iterations, body=2)
+    start = time.perf_counter()
+    executor.execute_workflow(steps)
+    elapsed = time.perf_counter() - start
+    executed = executor.progress.snapshot()["steps_done"]
+    return {
+        "interpreter.per_step_us": metric(elapsed / executed * 1e6, "us"),
+        "interpreter.steps_per_sec": metric(executed / elapsed, "steps/s", "higher"),
+    }
+
+
+def bench_find_image(executor, quick, workdir):
+    """_find_image against full synthetic screens at several resolutions and template sizes"""
+    results = {}
+    resolutions = ["1080p"] if quick else list(RESOLUTIONS)
+    for name in resolutions:
+        screen = synthetic_screen(*RESOLUTIONS[name])
+        executor.capture.screen = screen
+        for size in TEMPLATE_SIZES:
+            # Cut the template from the middle of the screen so there is a true match
+            top, left = screen.shape[0] // 2, screen.shape[1] // 2
+            path = os.path.join(workdir, f"template_{name}_{size}.png")
+            cv2.imwrite(path, cv2.cvtColor(screen[top:top + size, left:left + size], cv2.COLOR_RGB2BGR))
+            location = executor._find_image(path, confidence=0.8)
+            if location is None:
+                print(f"Warning: template {size}px not found on the {name} screen", file=sys.stderr)
+            ms = median_ms(lambda: executor._find_image(path, confidence=0.8), 3 if quick else 10)
+            results[f"find_image.{name}.{size}px_ms"] = metric(ms, "ms")
+    executor.capture.screen = synthetic_screen(*RESOLUTIONS["1080p"])
+    return results
+
+
+def bench_ocr(executor, quick):
+    """The OCR lookup a text step runs (capture, binarise, Tesseract) on a fresh 1080p frame per call"""
+    if not TESSERACT_AVAILABLE:
+        print("Skipping ocr: Tesseract is not installed", file=sys.stderr)
+        return {}
+    repeat = 2 if quick else 5
+    return {
+        "ocr.locate_text_ms": metric(median_ms(lambda: executor._locate_text("Synthetic", confidence=0.6), repeat), "ms"),
+    }
+
+
+def bench_typing(executor, quick):
+    """Characters per second through _type_text into the null backend"""
+    text = "The quick brown fox jumps over the lazy dog. " * (20 if quick else 200)
+    results = {}
+    for mode in ["per_char", "chunked"]:
+        start = time.perf_counter()
+        executor._type_text(text, mode=mode)
+        elapsed = time.perf_counter() - start
+        results[f"typing.{mode}_chars_per_sec"] = metric(len(text) / elapsed, "chars/s", "higher")
+    return results
+
+
+def bench_debug_writes(quick, workdir):
+    """Cost of queueing a 1080p debug screenshot and how fast the writer thread drains them"""
+    screen = synthetic_screen(*RESOLUTIONS["1080p"])
+    writer = DebugImageWriter()
+    count = 5 if quick else 20
+    submit_ms = []
+    start = time.perf_counter()
+    for i in range(count):
+        path = os.path.join(workdir, f"debug_{i}.png")
+        while True:
+            submitted = time.perf_counter()
+            if writer.submit(path, screen.copy()):
+                submit_ms.append((time.perf_counter() - submitted) * 1000)
+                break
+            time.sleep(0.001)  # Queue full: wait for the writer rather than drop, to measure its throughput
+    writer.flush()
+    elapsed = time.perf_counter() - start
+    return {
+        "debug_writes.submit_ms": metric(statistics.median(submit_ms), "ms"),
+        "debug_writes.frames_per_sec": metric(count / elapsed, "frames/s", "higher"),
+    }
+
+
+def bench_workflow_json(quick, workdir):
+    """Saving and loading a large workflow file in the format save_automation writes"""
+    count = 2000 if quick else 20000
+    step_params = [
+        {"type": StepType.MOUSE_CLICK, "params": {"name": "Click", "click_type": "coordinates", "x": 100, "y": 200, "button": "left"}},
+        {"type": StepType.KEYBOARD_TYPE, "params": {"name": "Type", "text": "hello world " * 4}},
+        {"type": StepType.WAIT, "params": {"name": "Wait", "duration": 0.5}},
+    ]
+    workflow = {
+        "version": "1.0",
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "debug_mode": False,
+        "steps": [step_params[i % len(step_params)] for i in range(count)],
+    }
+    path = os.path.join(workdir, "workflow.json")
+
+    def save():
+        with open(path, "w") as f:
+            json.dump(workflow, f, indent=4)
+
+    def load():
+        with open(path, "r") as f:
+            json.load(f)
+
+    repeat = 3 if quick else 5
+    return {
+        f"workflow_json.save_{count}_steps_ms": metric(median_ms(save, repeat), "ms"),
+        f"workflow_json.load_{count}_steps_ms": metric(median_ms(load, repeat), "ms"),
+    }
+
+
+def run_suite(quick=False, only=None):
+    executor = offline_executor()
+    benchmarks = {
+        "interpreter": lambda workdir: bench_interpreter(executor, quick),
+        "find_image": lambda workdir: bench_find_image(executor, quick, workdir),
+        "ocr": lambda workdir: bench_ocr(executor, quick),
+        "typing": lambda workdir: bench_typing(executor, quick),
+        "debug_writes": lambda workdir: bench_debug_writes(quick, workdir),
+        "workflow_json": lambda workdir: bench_workflow_json(quick, workdir),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, bench in benchmarks.items():
+            if only and name not in only:
+                continue
+            print(f"Running {name}...", file=sys.stderr)
+            results.update(bench(workdir))
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Rows of (metric, baseline, current, change, regressed) for metrics present in both runs"""
+    rows = []
+    for name, entry in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or not base["value"]:
+            continue
+        change = entry["value"] / base["value"] - 1
+        worse = change if entry["better"] == "lower" else -change
+        rows.append((name, base["value"], entry["value"], change, worse > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer repeats")
+    parser.add_argument("--only", nargs="*", help="benchmarks to run (default: all)")
+    args = parser.parse_args()
+
+    current = run_suite(args.quick, args.only)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=4)
+    print(json.dumps(current["results"], indent=4))
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.threshold)
+        regressions = [row for row in rows if row[4]]
+        for name, base, value, change, regressed in rows:
+            print(f"{'REGRESSION' if regressed else 'ok':>10}  {name}: {base} -> {value} ({change:+.1%})")
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
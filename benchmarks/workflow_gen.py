@@ -0,0 +1,130 @@
+"""Synthetic large-workflow generator.
+
+Produces workflows in the format save_automation writes, with deep
+Loop Start/Loop End nesting, image clicks that share a small set of
+templates, and typing steps with long text lists. Templates are cut from the
+synthetic screen in benchmarks/stubs.py, so image steps find a match when the
+workflow runs against it.
+
+    python -m benchmarks.workflow_gen --steps 50000 --depth 12 --output big.json
+"""
+import os
+import json
+import random
+import argparse
+
+import cv2
+
+from automation_steps import StepType
+from benchmarks.stubs import RESOLUTIONS, synthetic_screen
+
+TEMPLATE_SIZE = 64
+
+# Relative frequency of each kind of action step
+STEP_MIX = {"image": 0.2, "click": 0.35, "type": 0.25, "special": 0.1, "wait": 0.1}
+
+
+def write_templates(directory, count, screen=None, seed=0):
+    """Cut `count` templates from the synthetic screen into `directory` and return their paths"""
+    screen = screen if screen is not None else synthetic_screen(*RESOLUTIONS["1080p"])
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(count):
+        x = rng.randrange(0, screen.shape[1] - TEMPLATE_SIZE)
+        y = rng.randrange(0, screen.shape[0] - TEMPLATE_SIZE)
+        path = os.path.join(directory, f"synthetic_{i}.png")
+        cv2.imwrite(path, cv2.cvtColor(screen[y:y + TEMPLATE_SIZE, x:x + TEMPLATE_SIZE], cv2.COLOR_RGB2BGR))
+        paths.append(path)
+    return paths
+
+
+def generate_steps(count, depth=10, image_paths=(), mix=None, text_list_length=50,
+                   loop_ratio=0.05, loop_iterations=(1, 3), seed=0):
+    """`count` steps (loop markers included) with loops nested up to `depth` deep.
+
+    Action steps are drawn with the frequencies in `mix` (default STEP_MIX);
+    image clicks are spread over `image_paths`. Loops open with probability
+    `loop_ratio` per step and run a random number of iterations in the
+    `loop_iterations` range.
+    """
+    mix = dict(mix or STEP_MIX)
+    if not image_paths:
+        mix.pop("image", None)
+    kinds, weights = list(mix), list(mix.values())
+    rng = random.Random(seed)
+    texts = [f"Synthetic entry {i} " + "x" * rng.randrange(5, 60) for i in range(text_list_length)]
+    steps = []
+    open_loops = 0
+
+    while len(steps) < count:
+        remaining = count - len(steps)
+        # Close loops in time to finish balanced, and sometimes on the way
+        if open_loops and (remaining <= open_loops or rng.random() < loop_ratio):
+            steps.append({"type": StepType.LOOP_END, "params": {"name": "Loop End"}})
+            open_loops -= 1
+            continue
+        if open_loops < depth and remaining > open_loops + 2 and rng.random() < loop_ratio:
+            steps.append({"type": StepType.LOOP_START, "params": {
+                "name": f"Loop {len(steps) + 1}",
+                "iterations": rng.randint(*loop_iterations),
+            }})
+            open_loops += 1
+            continue
+
+        n = len(steps) + 1
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "image":
+            steps.append({"type": StepType.MOUSE_CLICK, "params": {
+                "name": f"Image click {n}", "click_type": "image", "image_path": rng.choice(image_paths),
+                "confidence": 0.9, "button": "left", "duration": 0,
+            }})
+        elif kind == "click":
+            steps.append({"type": StepType.MOUSE_CLICK, "params": {
+                "name": f"Click {n}", "click_type": "coordinates", "x": rng.randrange(1920), "y": rng.randrange(1080),
+                "button": "left", "duration": 0,
+            }})
+        elif kind == "type":
+            steps.append({"type": StepType.KEYBOARD_TYPE, "params": {
+                "name": f"Type {n}", "input_type": "multiple", "text_list": texts, "current_text_index": 0,
+                "delay": 0, "typing_mode": "chunked",
+            }})
+        elif kind == "special":
+            steps.append({"type": StepType.KEYBOARD_SPECIAL, "params": {"name": f"Key {n}", "key": "Tab"}})
+        else:
+            steps.append({"type": StepType.WAIT, "params": {"name": f"Wait {n}", "duration": 0}})
+    return steps
+
+
+def generate_workflow(count, **options):
+    """A complete workflow document, as save_automation writes it"""
+    return {
+        "version": "1.0",
+        "created_at": "synthetic",
+        "debug_mode": False,
+        "steps": generate_steps(count, **options),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=10000, help="number of steps, loop markers included")
+    parser.add_argument("--depth", type=int, default=10, help="maximum loop nesting depth")
+    parser.add_argument("--templates", type=int, default=20, help="distinct template images shared by the image steps")
+    parser.add_argument("--text-list", type=int, default=50, help="entries in each typing step's text list")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="synthetic_workflow.json")
+    args = parser.parse_args()
+
+    template_dir = os.path.join(os.path.dirname(os.path.abspath(args.output)), "synthetic_templates")
+    image_paths = write_templates(template_dir, args.templates, seed=args.seed) if args.templates else []
+    workflow = generate_workflow(
+        args.steps, depth=args.depth, image_paths=image_paths, text_list_length=args.text_list, seed=args.seed
+    )
+    with open(args.output, "w") as f:
+        json.dump(workflow, f, indent=4)
+    print(f"Wrote {len(workflow['steps'])} steps to {args.output} ({len(image_paths)} templates in {template_dir})")
+
+
+if __name__ == "__main__":
+    main()
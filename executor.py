@@ -1,13 +1,24 @@
 import time
+import difflib
+import threading
 
 import pyautogui
-import keyboard
 import cv2
 import numpy as np
 from PIL import Image
 import logging
 from PyQt6.QtCore import QObject, pyqtSignal
 from automation_steps import StepType
+from input_backend import get_input_backend
+from motion import MotionEngine, unflatten_path
+from vision import ScreenCapture, DebugImageWriter, TemplateCache, FeatureMatcher
+from progress import ProgressChannel
+from profiler import StepProfiler, export_json, export_csv
+from tracing import TraceRecorder
+from metrics import RunMetrics, MetricsExporter, rss_bytes
+from memwatch import MemoryWatch
+from sampler import StackSampler
+from logging_setup import setup_logging
 import os
 import tempfile
 import sys
@@ -23,6 +34,8 @@ def get_application_path():
         # If the application is run from a Python interpreter
         return os.path.dirname(os.path.abspath(__file__))
 
+logger = logging.getLogger(__name__)
+
 # Directory constants
 APPLICATION_PATH = get_application_path()
 IMAGES_DIR = os.path.join(APPLICATION_PATH, "images")
@@ -36,10 +49,106 @@ try:
 except ImportError:
     TESSERACT_AVAILABLE = False
 
+# Try importing pyperclip for clipboard typing, but don't fail if not available
+try:
+    import pyperclip
+    CLIPBOARD_AVAILABLE = True
+except ImportError:
+    CLIPBOARD_AVAILABLE = False
+
+# Typing strategy thresholds (characters)
+CHUNK_SIZE = 32  # Texts at least this long are typed in bursts of this size
+PASTE_THRESHOLD = 200  # Texts at least this long are pasted through the clipboard
+
+# Recorded image anchors scoring below this are too ambiguous to trust over the recorded coordinates
+MIN_ANCHOR_SCORE = 0.1
+
+# Phase labels for image lookups, built once rather than per lookup
+IMAGE_MATCH_LABELS = {method: f"image match ({method})" for method in ["template", "feature", "auto"]}
+
+STEP_TYPES = {value for key, value in vars(StepType).items() if not key.startswith("_")}
+
+
+def validate_workflow(steps):
+    """Check a workflow before running it and return a list of (step index, problem).
+
+    Catches what would otherwise fail mid-run: unknown step types, unbalanced
+    Loop Start/Loop End, bad loop counts and missing required parameters or
+    image files. Each image file is checked once however many steps share it.
+    """
+    problems = []
+    open_loops = []
+    image_exists = {}
+
+    def check_image(index, path):
+        if not path:
+            problems.append((index, "No image selected"))
+            return
+        if not os.path.isabs(path):
+            path = os.path.join(IMAGES_DIR, os.path.basename(path))
+        exists = image_exists.get(path)
+        if exists is None:
+            exists = os.path.exists(path)
+            image_exists[path] = exists
+        if not exists:
+            problems.append((index, f"Image file not found: {os.path.basename(path)}"))
+
+    for index, step in enumerate(steps):
+        step_type = step.get("type")
+        params = step.get("params")
+        if step_type not in STEP_TYPES:
+            problems.append((index, f"Unknown step type: {step_type}"))
+            continue
+        if not isinstance(params, dict):
+            problems.append((index, "Step has no parameters"))
+            continue
+
+        if step_type == StepType.LOOP_START:
+            iterations = params.get("iterations", 1)
+            if not isinstance(iterations, int) or iterations < 1:
+                problems.append((index, f"Loop iterations must be a positive whole number, not {iterations!r}"))
+            open_loops.append(index)
+        elif step_type == StepType.LOOP_END:
+            if open_loops:
+                open_loops.pop()
+            else:
+                problems.append((index, "Loop End without a matching Loop Start"))
+        elif step_type == StepType.MOUSE_CLICK:
+            if params.get("click_type") == "image":
+                if params.get("input_type") == "multiple":
+                    if not params.get("image_list"):
+                        problems.append((index, "No images in the image list"))
+                    for path in params.get("image_list", []):
+                        check_image(index, path)
+                else:
+                    check_image(index, params.get("image_path"))
+        elif step_type == StepType.KEYBOARD_TYPE:
+            if params.get("input_type") == "multiple":
+                if not params.get("text_list"):
+                    problems.append((index, "No texts in the text list"))
+            elif "text" not in params:
+                problems.append((index, "No text to type"))
+        elif step_type in [StepType.CLICK_TEXT, StepType.WAIT_TEXT]:
+            if not params.get("text"):
+                problems.append((index, "No text to look for"))
+            elif not TESSERACT_AVAILABLE:
+                problems.append((index, "Text steps need Tesseract OCR, which is not installed"))
+        elif step_type == StepType.WAIT_COLOR:
+            if not params.get("points"):
+                problems.append((index, "No pixels specified"))
+        elif step_type == StepType.MOUSE_DRAG:
+            if len(params.get("path", [])) < 4:
+                problems.append((index, "Drag path needs at least two points"))
+
+    for index in open_loops:
+        problems.append((index, "Loop Start without a matching Loop End"))
+    return problems
+
+
 class WorkflowExecutor(QObject):
     """Executes automation workflows"""
-    step_started = pyqtSignal(int, str)  # Signal emitted when a step starts
-    step_completed = pyqtSignal(int)  # Signal emitted when a step completes
+    step_started = pyqtSignal(int, str)  # Signal emitted when a step starts (only if step_signals is set)
+    step_completed = pyqtSignal(int)  # Signal emitted when a step completes (only if step_signals is set)
     step_error = pyqtSignal(int, str)  # Signal emitted when a step encounters an error
     workflow_completed = pyqtSignal()  # Signal emitted when the workflow completes
     debug_info = pyqtSignal(str)  # Signal for debug information
@@ -50,37 +159,64 @@ class WorkflowExecutor(QObject):
         super().__init__()
         self.running = False
         self.paused = False
+        self.step_timings = {}
         self.debug_mode = True  # Enable debug mode by default
+        self.debug_sink = None  # Thread-safe callable that takes debug messages instead of debug_info
+        # Run state for the GUI to sample; per-step signals are opt-in
+        self.progress = ProgressChannel()
+        self.step_signals = False
+        # Per-step timing split into capture/match/input/sleep/debug I/O phases
+        # Chrome/Perfetto trace of the run timeline, written to the debug folder when enabled
+        self.tracer = TraceRecorder()
+        self.profiler = StepProfiler(self.tracer)
+        self.profile_report = None
+        # Live counters (read by the GUI's performance panel), also written periodically as OpenMetrics text when enabled
+        self.metrics = RunMetrics(self._metrics_gauges)
+        self.export_metrics = False
+        self.metrics_path = os.path.join(DEBUG_DIR, "automation.prom")
+        self.metrics_interval = 10.0  # Seconds between file writes
+        self.metrics_port = None  # Also serve on http://127.0.0.1:<port>/metrics if set
+        # Opt-in tracemalloc snapshots at global loop boundaries
+        self.memory_watch = False
+        self.memory_warn_growth = 5 * 1024 * 1024  # Bytes per iteration
+        self.memwatch = None
+        # Sampling profiler on the executor thread; started with the run if sample_runs is set,
+        # or at any time during a run with start_sampling()
+        self.sample_runs = False
+        self.sampler = None
+        self._sampler_lock = threading.Lock()
+        self._thread_id = None
+        self.current_step = -1
+        self.current_loop = 0
+        # Playback of recorded delays
+        self.replay_delays = True
+        self.playback_speed = 1.0  # >1 compresses recorded gaps
+        self.min_gap = 0.0  # Floor per gap (seconds)
+        self.max_gap = 5.0  # Ceiling per gap (seconds), also the adaptive wait timeout
         pyautogui.PAUSE = 1.0  # Increase delay for better reliability
         pyautogui.FAILSAFE = True  # Enable fail-safe feature
         
+        # Vision pipeline: pooled capture buffers, cached templates, background debug writes
+        self.capture = ScreenCapture()
+        self.templates = TemplateCache()
+        self.debug_writer = DebugImageWriter()
+        self.debug_writer.tracer = self.tracer
+        self.feature_matchers = {}  # detector name -> FeatureMatcher
+
+        # Input injection (pyautogui by default, see input_backend.py)
+        self.input = get_input_backend("pyautogui")
+        self.motion = MotionEngine(self.input)
+        
         # Ensure debug directory exists
         os.makedirs(DEBUG_DIR, exist_ok=True)
         
-        # Configure logging with error handling
-        log_file = os.path.join(DEBUG_DIR, 'automation.log')
-        try:
-            logging.basicConfig(
-                level=logging.DEBUG,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                handlers=[
-                    logging.FileHandler(log_file, encoding='utf-8'),
-                    logging.StreamHandler()
-                ]
-            )
-        except Exception as e:
-            # If file logging fails, fall back to console-only logging
-            logging.basicConfig(
-                level=logging.DEBUG,
-                format='%(asctime)s - %(levelname)s - %(message)s',
-                handlers=[logging.StreamHandler()]
-            )
-            print(f"Warning: Could not create log file. Falling back to console logging. Error: {str(e)}")
+        # Configure logging (queued to a background writer; a no-op if the GUI already did it)
+        setup_logging(DEBUG_DIR)
 
         if TESSERACT_AVAILABLE:
             self._debug_msg("Tesseract OCR is available")
         else:
-            self._debug_msg("Tesseract OCR is not available, will use OpenCV text detection as fallback")
+            self._debug_msg("Tesseract OCR is not available, text steps will fail")
             
 
 
@@ -88,6 +224,24 @@ class WorkflowExecutor(QObject):
         """Execute a sequence of automation steps with support for nested loops and delays"""
         self.running = True
         self.paused = False
+        self.step_timings = {}  # step index -> list of execution times (seconds)
+        self.motion.reset_stats()
+        self.progress.reset(len(steps), loop_count)
+        self.profiler.reset()
+        self.tracer.reset()
+        self.metrics.reset()
+        self.profiler.on_phase = self._observe_phase
+        exporter = None
+        if self.export_metrics:
+            exporter = MetricsExporter(self.metrics, self.metrics_path, self.metrics_interval, self.metrics_port)
+            exporter.start()
+        self._thread_id = threading.get_ident()
+        if self.sample_runs:
+            self.start_sampling()
+        self.memwatch = None
+        if self.memory_watch:
+            self.memwatch = MemoryWatch(warn_growth=self.memory_warn_growth)
+            self.memwatch.start()
         
         try:
             total_steps = len(steps)
@@ -101,7 +255,9 @@ class WorkflowExecutor(QObject):
                     self._debug_msg("\n❌ Workflow execution stopped by user")
                     break
                 
-                self._debug_msg(f"\n=== Starting Global Loop Iteration {global_loop + 1}/{loop_count} ===")
+                self._debug_msg("\n=== Starting Global Loop Iteration %d/%d ===", global_loop + 1, loop_count)
+                if self.tracer.enabled:
+                    self.tracer.begin(f"Global loop {global_loop + 1}", "loop")
                 
                 # Loop state management
                 # Stack to keep track of active loops: [{"start_index": int, "iterations": int, "current_iter": int}]
@@ -124,18 +280,22 @@ class WorkflowExecutor(QObject):
                     
                     # Log step execution (except strictly control flow steps to avoid spam, or log them differently)
                     if step_type not in [StepType.LOOP_END]:
-                        self._debug_msg(f"\n=== Step {i+1}/{total_steps}: {step_name} ({step_type}) ===")
-                        self.step_started.emit(i, step_type)
+                        self._debug_msg("\n=== Step %d/%d: %s (%s) ===", i + 1, total_steps, step_name, step_type)
+                        self.progress.step_started(i, step_type, step_name, loop_stack, global_loop + 1)
+                        self.current_step = i
+                        self.current_loop = global_loop + 1
+                        if self.step_signals:
+                            self.step_started.emit(i, step_type)
                     
                     try:
                         # Handle Loop Start
                         if step_type == StepType.LOOP_START:
                             iterations = params.get("iterations", 1)
-                            self._debug_msg(f"Processing Loop Start at index {i}. Iterations requested: {iterations}")
+                            self._debug_msg("Processing Loop Start at index %d. Iterations requested: %s", i, iterations)
                             
                             # Check if we are already in this loop (top of stack matches this index)
                             if loop_stack and loop_stack[-1]["start_index"] == i:
-                                self._debug_msg(f"  -> Re-entering Loop Start (already in stack)")
+                                self._debug_msg("  -> Re-entering Loop Start (already in stack)")
                             else:
                                 # New entry into this loop
                                 loop_stack.append({
@@ -143,9 +303,12 @@ class WorkflowExecutor(QObject):
                                     "iterations": iterations,
                                     "current_iter": 0
                                 })
-                                self._debug_msg(f"  -> New Loop Started (Stack depth: {len(loop_stack)})")
+                                if self.tracer.enabled:
+                                    self.tracer.begin(f"Loop at step {i + 1}: iteration 1", "loop")
+                                self._debug_msg("  -> New Loop Started (Stack depth: %d)", len(loop_stack))
                             
-                            self.step_completed.emit(i)
+                            if self.step_signals:
+                                self.step_completed.emit(i)
                             i += 1
                             continue
 
@@ -159,23 +322,36 @@ class WorkflowExecutor(QObject):
                             current_loop = loop_stack[-1]
                             current_loop["current_iter"] += 1
                             
-                            self._debug_msg(f"Loop End reached. Iteration {current_loop['current_iter']} of {current_loop['iterations']}")
+                            self._debug_msg("Loop End reached. Iteration %d of %s", current_loop["current_iter"], current_loop["iterations"])
                             
                             if current_loop["current_iter"] < current_loop["iterations"]:
                                 # Jump back to start + 1 (next step after Loop Start)
                                 jump_to = current_loop["start_index"] + 1
-                                self._debug_msg(f"  -> Jumping back to step index {jump_to} (Step {jump_to + 1})")
+                                self._debug_msg("  -> Jumping back to step index %d (Step %d)", jump_to, jump_to + 1)
+                                self.tracer.end()
+                                if self.tracer.enabled:
+                                    self.tracer.begin(f"Loop at step {current_loop['start_index'] + 1}: iteration {current_loop['current_iter'] + 1}", "loop")
                                 i = jump_to
                             else:
                                 # Loop finished
                                 self._debug_msg("  -> Loop finished. Popping from stack.")
+                                self.tracer.end()
                                 loop_stack.pop()
                                 i += 1
                             
-                            self.step_completed.emit(i - 1 if i > 0 else 0)
+                            if self.step_signals:
+                                self.step_completed.emit(i - 1 if i > 0 else 0)
                             continue
 
                         # Execute normal steps
+
+                        self.profiler.start_step(i, step_name, step_type)
+                        if self.tracer.enabled:  # Skip building the span name when not tracing
+                            self.tracer.begin(f"Step {i + 1}: {step_name}", "step", type=step_type)
+
+                        # Replay the recorded gap before this step (compressed by the playback settings)
+                        if self.replay_delays and "recorded_delay" in params:
+                            self._replay_delay(params)
                         
                         # Take debug screenshot before action
                         if self.debug_mode:
@@ -183,25 +359,37 @@ class WorkflowExecutor(QObject):
                         
                         start_time = time.time()
                         
+                        # Handlers open the "input" phase around their input calls; the rest of the step is "other"
                         self._execute_step(step_type, params)
                         
                         end_time = time.time()
                         
                         # Take debug screenshot after action
                         if self.debug_mode:
-                            time.sleep(0.5)  # Wait for UI to update
+                            with self.profiler.phase("sleep"):
+                                time.sleep(0.5)  # Wait for UI to update
                             self._take_debug_screenshot(f"step_{i+1}_after")
+                        self.profiler.end_step()
+                        self.tracer.end()
                         
-                        self.step_completed.emit(i)
-                        execution_time = round(end_time - start_time, 2)
-                        self._debug_msg(f"✓ Step {i+1} completed successfully (took {execution_time}s)")
+                        if self.step_signals:
+                            self.step_completed.emit(i)
+                        self.progress.step_finished(i, end_time - start_time)
+                        self.step_timings.setdefault(i, []).append(end_time - start_time)
+                        self._debug_msg("✓ Step %d completed successfully (took %.2fs)", i + 1, end_time - start_time)
                         
                         i += 1
 
                     except Exception as e:
+                        if step_type not in [StepType.LOOP_START, StepType.LOOP_END]:
+                            self.profiler.end_step()
+                            self.tracer.end(error=str(e))
                         # Convert technical errors to user-friendly messages
                         user_msg = self._get_user_friendly_error(e, step_type)
                         self._debug_msg(f"❌ Error in step {i+1}: {user_msg}")
+                        self.progress.step_finished(i, error=user_msg)
+                        self.metrics.count_error(i + 1, step_name)
+                        self.tracer.instant("step_error", step=i + 1)
                         self.step_error.emit(i, user_msg)
                         self._debug_msg(f"Technical details: {str(e)}")
                         
@@ -209,16 +397,159 @@ class WorkflowExecutor(QObject):
                         i += 1
                 
                 # Emit loop iteration completed signal for global loop
+                self.tracer.end()
                 if self.running:
+                    self.progress.loop_iteration_finished(global_loop + 1)
+                    self.tracer.instant("loop_iteration_completed", loop=global_loop + 1)
                     self.loop_iteration_completed.emit(global_loop + 1)
-                    self._debug_msg(f"=== Global Loop Iteration {global_loop + 1} Completed ===")
+                    self._debug_msg("=== Global Loop Iteration %d Completed ===", global_loop + 1)
+                    if self.memwatch:
+                        self._check_memory(global_loop + 1)
             
+            self._debug_msg(
+                f"Time spent in mouse motion: {self.motion.total_time:.2f}s "
+                f"over {self.motion.moves} move(s) (mode: {self.motion.mode})"
+            )
+            self._save_profile()
+            self.tracer.instant("workflow_completed")
             self.workflow_completed.emit()
             if self.running:
                 self._debug_msg("\n=== Workflow Completed Successfully ===")
             
         finally:
             self.running = False
+            self.progress.finish()
+            if exporter is not None:
+                exporter.stop()  # Writes the final figures
+            if self.memwatch:
+                self._save_memory_report()
+            with self._sampler_lock:
+                # Cleared first so a start_sampling() racing with the end of the run can't start a new sampler
+                self._thread_id = None
+            self.stop_sampling()
+            if self.tracer.enabled:
+                self._save_trace()
+
+    def _save_profile(self):
+        """Build the run's timing report, write it to the debug folder and log the slowest steps"""
+        self.profiler.finish()
+        self.profile_report = self.profiler.report()
+        try:
+            export_json(os.path.join(DEBUG_DIR, "profile.json"), self.profile_report)
+            export_csv(os.path.join(DEBUG_DIR, "profile.csv"), self.profile_report)
+        except Exception as e:
+            self._debug_msg(f"Failed to save timing profile: {str(e)}")
+
+        self._debug_msg("Slowest steps (of %.2fs run time):", self.profile_report["run_time"])
+        for row in self.profile_report["steps"][:5]:
+            self._debug_msg(
+                "  #%d step %d %s: total %.2fs (%.0f%%), p50 %.3fs, p95 %.3fs",
+                row["rank"], row["step"], row["name"], row["total"], row["share"] * 100, row["p50"], row["p95"]
+            )
+
+    def start_sampling(self, interval=0.005):
+        """Start sampling the executor thread's stack; callable from any thread while a run is going"""
+        with self._sampler_lock:
+            if self.sampler is not None or self._thread_id is None:
+                return False
+            self.sampler = StackSampler(
+                self._thread_id, interval,
+                tag=lambda: f"Step {self.current_step + 1} (loop {self.current_loop})"
+            )
+            self.sampler.start()
+        self._debug_msg("Sampling profiler started")
+        return True
+
+    def stop_sampling(self):
+        """Stop the sampling profiler and save its profile to the debug folder"""
+        with self._sampler_lock:
+            sampler, self.sampler = self.sampler, None
+        if sampler is None:
+            return None
+        sampler.stop()
+        try:
+            folded_path, summary_path = sampler.save(DEBUG_DIR)
+        except Exception as e:
+            self._debug_msg(f"Failed to save sampling profile: {str(e)}")
+            return None
+        self._debug_msg(
+            f"Sampling profile ({sampler.samples} samples over {sampler.duration:.1f}s) saved to: {summary_path}\n"
+            f"Flame graph data: {folded_path} (open in speedscope.app or flamegraph.pl)"
+        )
+        return folded_path, summary_path
+
+    def _check_memory(self, iteration):
+        """Log memory growth since the previous global loop iteration and warn if it is over the threshold"""
+        entry = self.memwatch.checkpoint(iteration)
+        mb = 1024 * 1024
+        rss = f"{entry['rss'] / mb:.1f} MB" if entry["rss"] is not None else "n/a"
+        self._debug_msg(
+            "Memory after iteration %d: RSS %s, traced %.1f MB (%+.2f MB)",
+            iteration, rss, entry["traced"] / mb, entry["traced_growth"] / mb
+        )
+        for site in entry["top"][:5]:
+            self._debug_msg("  %+.1f KB (%+d blocks) at %s", site["size_diff"] / 1024, site["count_diff"], site["site"])
+        if entry["warning"]:
+            growth = max(entry["traced_growth"], entry["rss_growth"] or 0)
+            message = f"Warning: memory grew {growth / mb:.1f} MB in global loop iteration {iteration}"
+            self._debug_msg(message)
+            logger.warning(message)
+
+    def _save_memory_report(self):
+        """Stop tracing and write the per-iteration memory figures to the debug folder"""
+        try:
+            path = os.path.join(DEBUG_DIR, "memory.json")
+            self.memwatch.save(path)
+            self._debug_msg(f"Memory report saved to: {path}")
+        except Exception as e:
+            self._debug_msg(f"Failed to save memory report: {str(e)}")
+        finally:
+            self.memwatch.stop()
+
+    def _observe_phase(self, name, label, seconds):
+        """Feed capture and match timings into the latency histograms"""
+        if name in ("capture", "match"):
+            self.metrics.observe(name, label, seconds)
+
+    def _metrics_gauges(self):
+        """Current run figures for the metrics exporter, read from the progress snapshot"""
+        state = self.progress.snapshot()
+        return {
+            "automation_running": ("1 while a workflow is running", int(state["running"])),
+            "automation_steps_total": ("Steps executed", state["steps_done"]),
+            "automation_errors_total": ("Steps that failed", state["errors"]),
+            "automation_loop_iterations_total": ("Global loop iterations completed", state["loop_iterations_done"]),
+            "automation_loop_iteration": ("Current global loop iteration", state["global_loop"]),
+            "automation_loop_count": ("Global loop iterations requested", state["loop_count"]),
+            "automation_current_step": ("Index of the step being executed", state["current_step"] + 1),
+            "automation_steps_per_second": ("Average step throughput since the start", round(state["steps_per_sec"], 4)),
+            "automation_recent_steps_per_second": ("Step throughput over the recent window", round(state["recent_steps_per_sec"], 4)),
+            "automation_elapsed_seconds": ("Time since the run started", round(state["elapsed"], 3)),
+            "automation_debug_queue_depth": ("Debug images waiting to be written", self.debug_writer.pending()),
+            "automation_debug_images_dropped_total": ("Debug images dropped because the writer was busy", self.debug_writer.dropped),
+            "automation_resident_memory_bytes": ("Resident set size of the process", rss_bytes()),
+        }
+
+    def perf_counters(self):
+        """Cumulative run counters for the GUI to sample; rates are worked out by the sampler"""
+        hits = self.templates.hits + sum(matcher.hits for matcher in list(self.feature_matchers.values()))
+        misses = self.templates.misses + sum(matcher.misses for matcher in list(self.feature_matchers.values()))
+        return {
+            "progress": self.progress.snapshot(),
+            "latency": self.metrics.latency_totals(),
+            "phases": self.profiler.phase_totals(),
+            "cache": (hits, misses),
+            "debug_queue": self.debug_writer.pending(),
+        }
+
+    def _save_trace(self):
+        """Write the recorded trace events to the debug folder"""
+        try:
+            path = os.path.join(DEBUG_DIR, f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+            self.tracer.save(path)
+            self._debug_msg(f"Trace saved to: {path} (open it in chrome://tracing or ui.perfetto.dev)")
+        except Exception as e:
+            self._debug_msg(f"Failed to save trace: {str(e)}")
 
     def _reset_text_indices(self, steps):
         """Reset the current indices for all steps with multiple inputs"""
@@ -228,22 +559,43 @@ class WorkflowExecutor(QObject):
             elif step["type"] == StepType.MOUSE_CLICK and step["params"].get("click_type") == "image" and step["params"].get("input_type") == "multiple":
                 step["params"]["current_image_index"] = 0
 
-    def _debug_msg(self, message):
-        """Log debug message and emit signal with error handling"""
+    def _debug_msg(self, message, *args):
+        """Log a debug message and pass it to the GUI with error handling.
+
+        Like logging, `args` are %-merged into `message` only if something
+        actually consumes the text.
+        """
         try:
-            logging.debug(message)
+            logger.debug(message, *args)
         except Exception as e:
             print(f"Logging failed: {str(e)}")
-        self.debug_info.emit(message)
+        if self.debug_sink is not None:
+            # Queued for the log view's next refresh, no cross-thread signal per message;
+            # the sink formats, so messages it drops are never formatted
+            self.debug_sink(message, *args)
+        elif self.receivers(self.debug_info) > 0:
+            self.tracer.instant("debug_info")
+            self.debug_info.emit(message % args if args else message)
+
+    def _log_error(self, message):
+        """Log an error and show it in the debug output"""
+        logger.error(message)
+        if self.debug_sink is not None:
+            self.debug_sink(f"❌ {message}")
 
     def _take_debug_screenshot(self, name):
         """Take a debug screenshot with error handling"""
         try:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = os.path.join(DEBUG_DIR, f"{name}_{timestamp}.png")
-            screenshot = pyautogui.screenshot()
-            screenshot.save(filename)
-            self._debug_msg(f"Debug screenshot saved: {filename}")
+            queued = False
+            if not self.debug_writer.busy():  # Don't capture a screen that would only be dropped
+                with self.profiler.phase("debug_io", "debug screenshot"):
+                    queued = self.debug_writer.submit_frame(filename, self.capture.grab())
+            if not queued:
+                self._debug_msg("Debug writer busy, skipped screenshot: %s", filename)
+                return
+            self._debug_msg("Debug screenshot queued: %s", filename)
         except Exception as e:
             self._debug_msg(f"Failed to take debug screenshot: {str(e)}")
             # Continue execution even if screenshot fails
@@ -259,28 +611,237 @@ class WorkflowExecutor(QObject):
             self._execute_keyboard_special(params)
         elif step_type == StepType.WAIT:
             self._execute_wait(params)
+        elif step_type == StepType.CLICK_TEXT:
+            self._execute_click_text(params)
+        elif step_type == StepType.WAIT_TEXT:
+            self._execute_wait_text(params)
+        elif step_type == StepType.WAIT_COLOR:
+            self._execute_wait_color(params)
+        elif step_type == StepType.MOUSE_DRAG:
+            self._execute_mouse_drag(params)
         elif step_type in [StepType.LOOP_START, StepType.LOOP_END]:
             # Handled in main loop, but just in case
             pass
         else:
             raise ValueError(f"Unknown step type: {step_type}")
 
+    def _replay_delay(self, params):
+        """Wait out a recorded inter-step gap, scaled by the playback speed and clamped to the floor/ceiling.
+
+        If the step has a delay_condition, the gap becomes an adaptive wait that
+        ends as soon as the condition holds (but never later than the ceiling).
+        """
+        gap = params.get("recorded_delay", 0) / max(self.playback_speed, 0.01)
+        gap = min(max(gap, self.min_gap), self.max_gap)
+
+        condition = params.get("delay_condition")
+        if not condition or condition.get("type", "none") == "none":
+            if gap > 0:
+                self._sleep(gap)
+            return
+
+        start_time = time.time()
+        self._sleep(self.min_gap)
+        while self.running and time.time() - start_time < self.max_gap:
+            if self._check_condition(condition):
+                self._debug_msg("Adaptive wait satisfied after %.2fs", time.time() - start_time)
+                return
+            self._sleep(0.05)
+        self._debug_msg("Adaptive wait timed out after %ss, continuing", self.max_gap)
+
+    def _check_condition(self, condition):
+        """Evaluate a screen condition once: text, image or colour present"""
+        condition_type = condition.get("type")
+        region = condition.get("region")
+        if condition_type == "text":
+            return bool(self._find_text(
+                condition.get("text", ""),
+                region=tuple(region) if region else None,
+                confidence=condition.get("confidence", 0.6),
+                fuzzy_threshold=condition.get("fuzzy_threshold", 0.8)
+            ))
+        if condition_type == "image":
+            return bool(self._find_image(
+                condition.get("image_path", ""),
+                confidence=condition.get("confidence", 0.9),
+                region=tuple(region) if region else None
+            ))
+        if condition_type == "color":
+            if not condition.get("points"):
+                raise ValueError("Colour delay condition has no pixels to check")
+            return self._colors_match(condition)
+        return True
+
+    def _sleep(self, duration):
+        """Sleep that stays responsive to stop and pause"""
+        end_time = time.time() + duration
+        with self.profiler.phase("sleep"):
+            while self.running:
+                while self.paused and self.running:
+                    time.sleep(0.1)
+                remaining = end_time - time.time()
+                if remaining <= 0:
+                    break
+                time.sleep(min(remaining, 0.1))
+
     def _execute_wait(self, params):
         """Execute a wait step"""
         duration = params.get("duration", 1)
-        self._debug_msg(f"Waiting for {duration} seconds...")
+        self._debug_msg("Waiting for %s seconds...", duration)
         
         start_time = time.time()
-        while time.time() - start_time < duration:
-            if not self.running:
-                break
-            
-            while self.paused:
+        with self.profiler.phase("sleep"):
+            while time.time() - start_time < duration:
                 if not self.running:
                     break
-                time.sleep(0.1)
                 
-            time.sleep(0.1)
+                while self.paused:
+                    if not self.running:
+                        break
+                    time.sleep(0.1)
+                    
+                time.sleep(0.1)
+
+    def _execute_click_text(self, params):
+        """Find text on screen with OCR and click on it"""
+        text = params.get("text", "")
+        if not text:
+            raise ValueError("No text specified for Click Text step")
+
+        location = self._wait_for_text(params, appear=True)
+        if not location:
+            raise ValueError(f"Could not find text on screen: '{text}'")
+
+        x, y = location
+        with self.profiler.phase("input"):
+            self.motion.move_to(x, y, duration=params.get("duration", 0), mode=params.get("motion_mode"))
+            self.input.click(button=params.get("button", "left"))
+            self.input.flush()
+
+    def _execute_wait_text(self, params):
+        """Wait until text appears on (or disappears from) the screen"""
+        text = params.get("text", "")
+        if not text:
+            raise ValueError("No text specified for Wait For Text step")
+
+        appear = params.get("wait_mode", "appears") == "appears"
+        location = self._wait_for_text(params, appear=appear)
+        if appear and not location:
+            raise ValueError(f"Timed out waiting for text: '{text}'")
+        if not appear and location:
+            raise ValueError(f"Timed out waiting for text to disappear: '{text}'")
+
+    def _wait_for_text(self, params, appear=True):
+        """Poll the OCR path until the text's presence matches `appear` or the timeout expires"""
+        if not TESSERACT_AVAILABLE:
+            # The OpenCV contour heuristic can't read text, so it must not stand in for a match
+            raise RuntimeError("OCR unavailable: text steps need Tesseract (pytesseract) installed")
+
+        text = params.get("text", "")
+        timeout = params.get("timeout", 10)
+        region = params.get("region")
+        search_region = tuple(region) if region else None
+        margin = params.get("region_margin", 40)
+        start_time = time.time()
+        attempts = 0
+        location = None
+        match = None
+
+        while self.running:
+            while self.paused and self.running:
+                time.sleep(0.1)
+
+            attempts += 1
+            match = self._locate_text(
+                text,
+                region=search_region,
+                confidence=params.get("confidence", 0.6),
+                lang=params.get("lang", "eng"),
+                fuzzy_threshold=params.get("fuzzy_threshold", 0.8)
+            )
+            location = match[0] if match else None
+            if bool(location) == appear:
+                break
+            if time.time() - start_time >= timeout:
+                break
+
+            # The text may have moved: widen the search region before the next attempt
+            if appear and search_region:
+                search_region = self._expand_region(search_region, margin)
+                margin *= 2
+                self._debug_msg("Text not found, widening search region to %s", search_region)
+
+            with self.profiler.phase("sleep"):
+                time.sleep(0.25)
+
+        # Seed (or re-seed after widening) the stored region, only from a successful "appears" search;
+        # a match left over when waiting for text to disappear (or timing out) is not where it belongs
+        if appear and location and params.get("auto_region", True) and (not region or search_region != tuple(region)):
+            params["region"] = list(self._expand_region(match[1], params.get("region_margin", 40)))
+            self._debug_msg("Stored search region %s for future runs", params["region"])
+
+        self._debug_msg(
+            f"Text search for '{text}' finished after {attempts} attempt(s) "
+            f"in {time.time() - start_time:.2f}s (found: {bool(location)})"
+        )
+        return location
+
+    def _expand_region(self, region, margin):
+        """Grow an (x, y, width, height) region by `margin` pixels on every side, clamped to the screen"""
+        screen_width, screen_height = pyautogui.size()
+        x, y, w, h = region
+        left = max(0, x - margin)
+        top = max(0, y - margin)
+        right = min(screen_width, x + w + margin)
+        bottom = min(screen_height, y + h + margin)
+        return (left, top, right - left, bottom - top)
+
+    def _execute_wait_color(self, params):
+        """Poll a handful of pixels until they match (or stop matching) their expected colours"""
+        if not params.get("points"):
+            raise ValueError("No pixels specified for Wait For Color step")
+
+        want_match = params.get("wait_mode", "match") == "match"
+        timeout = params.get("timeout", 10)
+        poll_interval = params.get("poll_interval", 20) / 1000
+
+        start_time = time.time()
+        checks = 0
+        satisfied = False
+        while self.running:
+            while self.paused and self.running:
+                time.sleep(0.1)
+
+            checks += 1
+            if self._colors_match(params) == want_match:
+                satisfied = True
+                break
+            if time.time() - start_time >= timeout:
+                break
+            with self.profiler.phase("sleep"):
+                time.sleep(poll_interval)
+
+        elapsed = time.time() - start_time
+        self._debug_msg("Colour probe finished after %d check(s) in %.3fs", checks, elapsed)
+        if self.running and not satisfied:
+            raise ValueError(f"Timed out after {timeout}s waiting for pixel colours to {params.get('wait_mode', 'match')}")
+
+    def _colors_match(self, params):
+        """Check the step's probe points against their expected colours once"""
+        points = params["points"]
+        coords = [(x, y) for x, y, _ in points]
+        expected = np.array([self._parse_color(color) for _, _, color in points], dtype=np.int16)
+        with self.profiler.phase("capture", "pixel sample"):
+            actual = self.capture.sample(coords).astype(np.int16)
+        within = (np.abs(actual - expected) <= params.get("tolerance", 20)).all(axis=1)
+        if params.get("match_mode", "all") == "all":
+            return bool(within.all())
+        return bool(within.any())
+
+    def _parse_color(self, color):
+        """Convert '#rrggbb' to an (r, g, b) tuple"""
+        color = color.lstrip("#")
+        return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
 
     def _execute_mouse_click(self, step_data):
         """Execute a mouse click step"""
@@ -293,7 +854,11 @@ class WorkflowExecutor(QObject):
             if click_type == "coordinates":
                 x = step_data.get("x", 0)
                 y = step_data.get("y", 0)
-                pyautogui.moveTo(x, y, duration=duration)
+                anchored = self._resolve_anchor(step_data)
+                if anchored:
+                    x, y = anchored
+                with self.profiler.phase("input"):
+                    self.motion.move_to(x, y, duration=duration, mode=step_data.get("motion_mode"))
             else:  # image-based click
                 image_path = step_data.get("image_path")
                 confidence = step_data.get("confidence", 0.9)
@@ -302,31 +867,47 @@ class WorkflowExecutor(QObject):
                     raise ValueError("Image not found: " + str(image_path))
                 
                 # Find and click the image
-                location = pyautogui.locateCenterOnScreen(image_path, confidence=confidence)
+                location = self._find_image(
+                    image_path,
+                    confidence=confidence,
+                    method=step_data.get("match_method", "template"),
+                    detector=step_data.get("feature_detector", "orb")
+                )
                 if not location:
                     raise ValueError(f"Could not find image on screen: {image_path}")
                 
                 x, y = location
-                pyautogui.moveTo(x, y, duration=duration)
+                with self.profiler.phase("input"):
+                    self.motion.move_to(x, y, duration=duration, mode=step_data.get("motion_mode"))
             
-            # Perform the click
-            pyautogui.click(button=button)
+            # Perform the click (recorded double-clicks repeat it after the recorded gap)
+            clicks = step_data.get("clicks", 1)
+            with self.profiler.phase("input"):
+                for n in range(clicks):
+                    if n:
+                        self.input.flush()
+                        time.sleep(step_data.get("click_interval", 0.1))
+                    self.input.click(button=button, pause=n == clicks - 1)
+                self.input.flush()
             
             # Handle text input after click if enabled
             if step_data.get("type_after_click"):
-                time.sleep(step_data.get("type_delay", 1))
+                with self.profiler.phase("sleep"):
+                    time.sleep(step_data.get("type_delay", 1))
                 
                 text_to_type = step_data.get("text_to_type", "")
 
                 
                 # Type the text
                 if text_to_type:
-                    pyautogui.write(text_to_type)
+                    self._type_text(text_to_type, mode=step_data.get("typing_mode", "per_char"))
                     
                     # Handle special key after typing
                     special_key = step_data.get("special_key")
                     if special_key:
-                        pyautogui.press(special_key.lower())
+                        with self.profiler.phase("input"):
+                            self.input.press(special_key.lower())
+                            self.input.flush()
             
             return True
             
@@ -336,6 +917,62 @@ class WorkflowExecutor(QObject):
 
 
 
+    def _resolve_anchor(self, params):
+        """Locate a recorded click's image anchor near its hint and return the click point, or None"""
+        anchor = params.get("anchor")
+        if not anchor or not params.get("use_anchor", True):
+            return None
+
+        score = anchor.get("score")
+        if score is None:
+            # Never scored (e.g. recording stopped before the encoder finished): don't trust it
+            self._debug_msg("Anchor uniqueness unknown, using recorded coordinates")
+            return None
+        if score < MIN_ANCHOR_SCORE:
+            self._debug_msg("Anchor uniqueness %.2f too low, using recorded coordinates", score)
+            return None
+
+        # Search a window around where the patch was recorded
+        hint_x, hint_y = anchor.get("hint", [params.get("x", 0), params.get("y", 0)])
+        reach = anchor.get("search_margin", 150) + anchor.get("size", 64) // 2
+        screen_width, screen_height = pyautogui.size()
+        left = max(0, hint_x - reach)
+        top = max(0, hint_y - reach)
+        region = (
+            left, top,
+            min(screen_width, hint_x + reach) - left,
+            min(screen_height, hint_y + reach) - top
+        )
+
+        location = self._find_image(anchor.get("image_path", ""), confidence=anchor.get("confidence", 0.8), region=region)
+        if not location:
+            self._debug_msg("Anchor not found near its recorded position, using recorded coordinates")
+            return None
+
+        offset_x, offset_y = anchor.get("offset", [0, 0])
+        self._debug_msg("Anchor found at %s, moved %d, %d px", location, location[0] - hint_x, location[1] - hint_y)
+        return location[0] + offset_x, location[1] + offset_y
+
+    def _execute_mouse_drag(self, params):
+        """Press a button at the start of the recorded path, follow it, and release at the end"""
+        path = unflatten_path(params.get("path", []))
+        if len(path) < 2:
+            raise ValueError("Drag path needs at least two points")
+
+        button = params.get("button", "left")
+        duration = params.get("duration", 0.5) / max(self.playback_speed, 0.01)
+        with self.profiler.phase("input"):
+            self.motion.move_to(*path[0], mode="instant")
+            self.input.mouse_down(button=button)
+            self.input.flush()
+            try:
+                self.motion.follow_path(path, duration=duration, rate=params.get("rate", 60))
+            finally:
+                # Never leave the button held down, even if the move fails
+                self.input.mouse_up(button=button)
+                self.input.flush()
+        self._debug_msg("Dragged through %d points in %.2fs", len(path), duration)
+
     def _execute_keyboard_type(self, params):
         """Execute a keyboard typing action with support for multiple text inputs"""
         if params.get("input_type") == "multiple":
@@ -358,9 +995,9 @@ class WorkflowExecutor(QObject):
 
         delay = params.get("delay", 10) / 1000  # Convert to seconds
         
-        # Type the text using pyautogui.write which handles spaces and special characters better
-        self._debug_msg(f"Typing text: '{text}' (Length: {len(text)}, Delay: {delay}s)")
-        pyautogui.write(text, interval=delay)
+        mode = params.get("typing_mode", "per_char")  # Steps saved before typing modes existed typed per character
+        self._debug_msg("Typing text: '%s' (Length: %d, Delay: %ss, Mode: %s)", text, len(text), delay, mode)
+        self._type_text(text, delay, mode)
         
         # Handle special key if specified
         special_key = params.get("special_key")
@@ -380,10 +1017,76 @@ class WorkflowExecutor(QObject):
             }
             
             key_to_press = key_mapping.get(special_key, special_key.lower())
-            self._debug_msg(f"Pressing special key: {key_to_press}")
-            pyautogui.press(key_to_press)
+            self._debug_msg("Pressing special key: %s", key_to_press)
+            with self.profiler.phase("input"):
+                self.input.press(key_to_press)
+                self.input.flush()
             time.sleep(0.1)  # Small delay after special key
 
+    def _type_text(self, text, delay=0, mode="auto"):
+        """Type text using the given strategy: per_char, chunked, paste or auto (chosen by length)"""
+        requested = mode
+        if mode == "auto":
+            if len(text) >= PASTE_THRESHOLD and CLIPBOARD_AVAILABLE:
+                mode = "paste"
+            elif len(text) >= CHUNK_SIZE:
+                mode = "chunked"
+            else:
+                mode = "per_char"
+
+        if mode == "paste" and not CLIPBOARD_AVAILABLE:
+            self._paste_downgraded(requested, "clipboard not available (pyperclip is not installed)", len(text))
+            mode = "chunked"
+
+        start_time = time.time()
+        with self.profiler.phase("input"):
+            if mode == "paste" and not self._paste_text(text):
+                self._paste_downgraded(requested, "clipboard holds no text that could be restored", len(text))
+                mode = "chunked"
+
+            if mode == "chunked":
+                # Send bursts of characters with no per-key interval, pausing only between chunks
+                for i in range(0, len(text), CHUNK_SIZE):
+                    self.input.write(text[i:i + CHUNK_SIZE], interval=0, pause=False)
+                    self.input.flush()
+                    if delay:
+                        time.sleep(delay)
+            elif mode != "paste":
+                self.input.write(text, interval=delay)
+                self.input.flush()
+        self._debug_msg("Typed %d characters using '%s' mode in %.3fs", len(text), mode, time.time() - start_time)
+
+    def _paste_downgraded(self, requested, reason, length):
+        """Report typing a text by keystrokes instead of pasting it; a warning if the step asked for paste"""
+        if requested == "paste":
+            logger.warning("Step asked to paste %d characters but %s; typing them in chunks instead", length, reason)
+        self._debug_msg("Warning: %s, falling back to chunked typing for %d characters", reason, length)
+
+    def _paste_text(self, text):
+        """Paste text through the clipboard, restoring the previous clipboard contents afterwards.
+
+        pyperclip only reads text, and reports an empty clipboard for images or
+        files as well, so nothing is pasted (and False returned) unless the
+        current contents are text that can be put back.
+        """
+        try:
+            previous = pyperclip.paste()
+        except Exception:
+            previous = None
+        if not previous:
+            return False
+
+        pyperclip.copy(text)
+        try:
+            paste_key = "command" if sys.platform == "darwin" else "ctrl"
+            self.input.hotkey(paste_key, "v", pause=False)
+            self.input.flush()
+            # Give the target application time to read the clipboard before it is restored
+            time.sleep(0.1)
+        finally:
+            pyperclip.copy(previous)
+        return True
+
     def _execute_keyboard_special(self, params):
         """Execute a special keyboard action"""
         try:
@@ -412,8 +1115,10 @@ class WorkflowExecutor(QObject):
                 key_combo.append(key)
             
             key_sequence = '+'.join(key_combo)
-            self._debug_msg(f"Executing keyboard combination: {key_sequence}")
-            keyboard.press_and_release(key_sequence)
+            self._debug_msg("Executing keyboard combination: %s", key_sequence)
+            with self.profiler.phase("input"):
+                self.input.hotkey(*key_combo)
+                self.input.flush()
             time.sleep(0.1)
             
         except Exception as e:
@@ -422,8 +1127,12 @@ class WorkflowExecutor(QObject):
 
 
 
-    def _find_image(self, image_path, confidence=0.9):
-        """Find an image on screen and return its center coordinates"""
+    def _find_image(self, image_path, confidence=0.9, region=None, method="template", detector="orb"):
+        """Find an image on screen and return its center coordinates.
+
+        `method` is "template" (normalised cross-correlation), "feature"
+        (keypoint matching) or "auto" (template first, features on a miss).
+        """
         try:
             # Convert relative path to absolute path if needed
             if not os.path.isabs(image_path):
@@ -435,60 +1144,35 @@ class WorkflowExecutor(QObject):
                     f"Please make sure the image exists in the 'images' folder."
                 )
             
-            # Take screenshot and save for debugging
-            screenshot = pyautogui.screenshot()
-            debug_screen = os.path.join(DEBUG_DIR, "current_screen.png")
-            screenshot.save(debug_screen)
-            self._debug_msg(f"Current screen saved to: {debug_screen}")
+            # Capture the screen into the pooled frame buffers
+            with self.profiler.phase("capture", "screenshot capture"):
+                frame = self.capture.grab(region)
             
-            screenshot_np = np.array(screenshot)
-            screenshot_gray = cv2.cvtColor(screenshot_np, cv2.COLOR_RGB2GRAY)
-            
-            # Load and save template image for debugging
-            template = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+            # Load template (cached between lookups)
+            template = self.templates.get(image_path)
             if template is None:
                 raise RuntimeError(
                     f"Failed to load image: {os.path.basename(image_path)}\n"
                     "Please ensure the image file is a valid image format (PNG, JPG, etc.)"
                 )
-            
-            debug_template = os.path.join(DEBUG_DIR, "template.png")
-            cv2.imwrite(debug_template, template)
-            self._debug_msg(f"Template image saved to: {debug_template}")
-            
-            # Perform template matching
-            result = cv2.matchTemplate(screenshot_gray, template, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            self._debug_msg(f"Best match confidence: {max_val:.4f}")
-            
-            if max_val >= confidence:
-                # Calculate center point
-                w, h = template.shape[::-1]
-                center_x = max_loc[0] + w//2
-                center_y = max_loc[1] + h//2
-                
-                # Save debug image with match highlighted
-                debug_result = screenshot_np.copy()
-                cv2.rectangle(
-                    debug_result,
-                    max_loc,
-                    (max_loc[0] + w, max_loc[1] + h),
-                    (0, 255, 0),
-                    2
-                )
-                cv2.circle(
-                    debug_result,
-                    (center_x, center_y),
-                    5,
-                    (255, 0, 0),
-                    -1
-                )
-                debug_match = os.path.join(DEBUG_DIR, "match_result.png")
-                cv2.imwrite(debug_match, debug_result)
-                self._debug_msg(f"Match result saved to: {debug_match}")
-                
-                return (center_x, center_y)
+
+            if self.debug_mode:
+                with self.profiler.phase("debug_io"):
+                    debug_screen = os.path.join(DEBUG_DIR, "current_screen.png")
+                    self.debug_writer.submit_frame(debug_screen, frame)
+                    debug_template = os.path.join(DEBUG_DIR, "template.png")
+                    self.debug_writer.submit(debug_template, template)
+
+            location = None
+            with self.profiler.phase("match", IMAGE_MATCH_LABELS.get(method, "image match")):
+                if method in ["template", "auto"]:
+                    location = self._match_template(frame, template, confidence)
+                if location is None and method in ["feature", "auto"]:
+                    # The same frame is reused, so its descriptors are computed only once
+                    location = self._match_features(frame, image_path, template, detector)
+
+            if location:
+                return (location[0] + frame.origin[0], location[1] + frame.origin[1])
             
             self._debug_msg(
                 f"No match found above confidence threshold ({confidence})\n"
@@ -500,139 +1184,153 @@ class WorkflowExecutor(QObject):
             self._debug_msg(f"Error finding image: {str(e)}")
             return None
 
-    def _find_text(self, text, region=None, confidence=0.7):
-        """Find text on screen using OCR"""
-        try:
-            # Take screenshot of the specified region or full screen
-            screenshot = pyautogui.screenshot(region=region)
-            screenshot_np = np.array(screenshot)
-            
-            # Save screenshot for debugging
-            debug_screen = os.path.join(DEBUG_DIR, "ocr_screen.png")
-            screenshot.save(debug_screen)
-            self._debug_msg(f"OCR screen saved to: {debug_screen}")
-
-            # Try Tesseract first if available
-            if TESSERACT_AVAILABLE:
-                try:
-                    self._debug_msg("Attempting to use Tesseract OCR")
-                    result = self._find_text_tesseract(screenshot_np, text, confidence)
-                    if result:
-                        return result
-                except Exception as e:
-                    self._debug_msg(f"Tesseract OCR failed: {str(e)}, falling back to OpenCV")
-
-            # Fall back to OpenCV text detection
-            self._debug_msg("Using OpenCV text detection")
-            return self._find_text_opencv(screenshot_np, text, confidence)
+    def _match_template(self, frame, template, confidence):
+        """Template-match a grayscale template in a frame and return its center in frame coordinates"""
+        result = cv2.matchTemplate(frame.gray(), template, cv2.TM_CCOEFF_NORMED)
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+        
+        self._debug_msg("Best match confidence: %.4f", max_val)
+        if max_val < confidence:
+            return None
 
-        except Exception as e:
-            self._debug_msg(f"Error finding text: {str(e)}")
+        # Calculate center point
+        w, h = template.shape[::-1]
+        center_x = max_loc[0] + w//2
+        center_y = max_loc[1] + h//2
+
+        if self.debug_mode:
+            # Save debug image with match highlighted
+            debug_match = os.path.join(DEBUG_DIR, "match_result.png")
+            self.debug_writer.submit_frame(
+                debug_match, frame,
+                rects=[(max_loc[0], max_loc[1], w, h)],
+                circles=[(center_x, center_y)]
+            )
+            self._debug_msg("Match result saved to: %s", debug_match)
+
+        return (center_x, center_y)
+
+    def _match_features(self, frame, image_path, template, detector="orb"):
+        """Keypoint-match a template in a frame and return its center in frame coordinates"""
+        matcher = self.feature_matchers.get(detector)
+        if matcher is None:
+            matcher = FeatureMatcher(detector)
+            self.feature_matchers[detector] = matcher
+
+        result = matcher.match(frame, image_path, template)
+        if result is None:
+            self._debug_msg("Feature matching (%s) found no reliable match", detector.upper())
             return None
 
-    def _find_text_tesseract(self, image_np, target_text, confidence):
-        """Find text using Tesseract OCR"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(image_np, cv2.COLOR_RGB2GRAY)
-        
-        # Apply thresholding to get better OCR results
-        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        center_x, center_y, inlier_ratio = result
+        self._debug_msg("Feature match (%s) found with inlier ratio: %.2f", detector.upper(), inlier_ratio)
+
+        if self.debug_mode:
+            debug_match = os.path.join(DEBUG_DIR, "feature_match.png")
+            self.debug_writer.submit_frame(debug_match, frame, circles=[(center_x, center_y)])
+
+        return (center_x, center_y)
+
+    def _find_text(self, text, region=None, confidence=0.7, lang="eng", fuzzy_threshold=1.0):
+        """Find text on screen using OCR and return its center in screen coordinates"""
+        match = self._locate_text(text, region, confidence, lang, fuzzy_threshold)
+        return match[0] if match else None
+
+    def _locate_text(self, text, region=None, confidence=0.7, lang="eng", fuzzy_threshold=1.0):
+        """Find text on screen using OCR and return (center, bounding box) in screen coordinates.
+
+        Returns None only when the text isn't on screen; OCR and capture errors
+        (such as a missing language pack) are raised so the step fails instead
+        of treating them as "not found".
+        """
+        if not TESSERACT_AVAILABLE:
+            raise RuntimeError("OCR unavailable: Tesseract (pytesseract) is not installed")
+
+        start_time = time.time()
+
+        # Take screenshot of the specified region or full screen
+        with self.profiler.phase("capture", "screenshot capture"):
+            frame = self.capture.grab(region)
+
+        # Save screenshot for debugging
+        if self.debug_mode:
+            with self.profiler.phase("debug_io"):
+                debug_screen = os.path.join(DEBUG_DIR, "ocr_screen.png")
+                self.debug_writer.submit_frame(debug_screen, frame)
+            self._debug_msg("OCR screen saved to: %s", debug_screen)
+
+        with self.profiler.phase("match", "ocr"):
+            bbox = self._find_text_tesseract(frame, text, confidence, lang, fuzzy_threshold)
+
+        self._debug_msg("OCR lookup took %.3fs", time.time() - start_time)
+        if not bbox:
+            return None
+
+        # Translate region-relative results back into screen coordinates
+        x, y, w, h = bbox
+        x += frame.origin[0]
+        y += frame.origin[1]
+        return (x + w//2, y + h//2), (x, y, w, h)
+
+    def _text_similarity(self, candidate, target_text):
+        """Fuzzy similarity between recognised text and the target text (0.0-1.0)"""
+        candidate = candidate.strip().lower()
+        target_text = target_text.strip().lower()
+        if not candidate or not target_text:
+            return 0.0
+        if target_text in candidate:
+            return 1.0
+        return difflib.SequenceMatcher(None, candidate, target_text).ratio()
+
+    def _find_text_tesseract(self, frame, target_text, confidence, lang="eng", fuzzy_threshold=1.0):
+        """Find text using Tesseract OCR and return its bounding box"""
+        # Binarised grayscale gives better OCR results
+        binary = frame.binary()
         
         # Perform OCR
-        data = pytesseract.image_to_data(binary, output_type=pytesseract.Output.DICT)
+        data = pytesseract.image_to_data(binary, lang=lang, output_type=pytesseract.Output.DICT)
         
-        # Search for target text
+        # Group recognised words by line so multi-word targets can be matched as phrases
+        lines = {}
         for i, text in enumerate(data['text']):
-            if target_text.lower() in text.lower():
-                confidence_score = float(data['conf'][i]) / 100
-                if confidence_score >= confidence:
-                    x = data['left'][i]
-                    y = data['top'][i]
-                    w = data['width'][i]
-                    h = data['height'][i]
-                    center_x = x + w//2
-                    center_y = y + h//2
-                    
-                    # Save debug image
-                    debug_result = image_np.copy()
-                    cv2.rectangle(debug_result, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                    cv2.circle(debug_result, (center_x, center_y), 5, (255, 0, 0), -1)
-                    debug_match = os.path.join(DEBUG_DIR, "tesseract_match.png")
-                    cv2.imwrite(debug_match, debug_result)
-                    
-                    self._debug_msg(f"Tesseract found text with confidence: {confidence_score:.4f}")
-                    return (center_x, center_y)
-        
-        return None
+            if text.strip():
+                key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+                lines.setdefault(key, []).append(i)
 
-    def _find_text_opencv(self, image_np, target_text, confidence):
-        """Find text using OpenCV text detection"""
-        # Convert to grayscale
-        gray = cv2.cvtColor(image_np, cv2.COLOR_RGB2GRAY)
-        
-        # Apply preprocessing to improve text detection
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        # Find contours
-        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        
-        # Filter contours based on area and aspect ratio
-        text_regions = []
-        for contour in contours:
-            x, y, w, h = cv2.boundingRect(contour)
-            aspect_ratio = float(w) / h
-            area = cv2.contourArea(contour)
-            
-            if 0.1 < aspect_ratio < 10 and area > 100:  # Adjust these thresholds as needed
-                text_regions.append((x, y, w, h))
-        
-        # Sort regions by position (left to right, top to bottom)
-        text_regions.sort(key=lambda r: (r[1], r[0]))
-        
-        # Save debug image with detected regions
-        debug_result = image_np.copy()
-        for x, y, w, h in text_regions:
-            cv2.rectangle(debug_result, (x, y), (x + w, y + h), (0, 255, 0), 2)
-        debug_match = os.path.join(DEBUG_DIR, "opencv_regions.png")
-        cv2.imwrite(debug_match, debug_result)
-        
-        # For each region, try to match the text pattern
-        for x, y, w, h in text_regions:
-            roi = gray[y:y+h, x:x+w]
-            
-            # Apply additional preprocessing for better matching
-            _, roi_binary = cv2.threshold(roi, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
-            # Calculate similarity with target text pattern
-            # This is a simplified approach - in practice, you might want to use
-            # more sophisticated pattern matching or feature extraction
-            similarity = self._calculate_text_similarity(roi_binary, target_text)
-            
-            if similarity >= confidence:
-                center_x = x + w//2
-                center_y = y + h//2
-                self._debug_msg(f"OpenCV found potential text match with confidence: {similarity:.4f}")
-                return (center_x, center_y)
-        
-        return None
+        word_count = max(1, len(target_text.split()))
+        best = None
+        for indices in lines.values():
+            for start in range(len(indices)):
+                window = indices[start:start + word_count]
+                phrase = " ".join(data['text'][i] for i in window)
+                similarity = self._text_similarity(phrase, target_text)
+                confidence_score = min(float(data['conf'][i]) for i in window) / 100
+                if similarity < fuzzy_threshold or confidence_score < confidence:
+                    continue
+                if best is None or similarity > best[0]:
+                    best = (similarity, confidence_score, window)
 
-    def _calculate_text_similarity(self, roi, target_text):
-        """Calculate similarity between ROI and target text pattern"""
-        # This is a simplified implementation
-        # You might want to implement more sophisticated text recognition here
-        # For now, we'll use basic image statistics as a rough approximation
-        
-        # Normalize ROI
-        roi_norm = cv2.normalize(roi, None, 0, 1, cv2.NORM_MINMAX)
+        if best is None:
+            return None
+
+        similarity, confidence_score, window = best
+        x = min(data['left'][i] for i in window)
+        y = min(data['top'][i] for i in window)
+        w = max(data['left'][i] + data['width'][i] for i in window) - x
+        h = max(data['top'][i] + data['height'][i] for i in window) - y
         
-        # Calculate basic statistics
-        mean = np.mean(roi_norm)
-        std = np.std(roi_norm)
+        # Save debug image
+        if self.debug_mode:
+            debug_match = os.path.join(DEBUG_DIR, "tesseract_match.png")
+            self.debug_writer.submit_frame(
+                debug_match, frame, rects=[(x, y, w, h)], circles=[(x + w//2, y + h//2)]
+            )
         
-        # Return a confidence score based on image statistics
-        # This is a very basic approach and should be improved based on your needs
-        return (mean + std) / 2
+        self._debug_msg(
+            f"Tesseract found text with confidence: {confidence_score:.4f} "
+            f"(similarity: {similarity:.2f})"
+        )
+        return (x, y, w, h)
 
     def _get_user_friendly_error(self, error, step_type):
         """Convert technical error messages to user-friendly ones"""
@@ -641,6 +1339,16 @@ class WorkflowExecutor(QObject):
         if "image not found" in error_str:
             return str(error)
 
+        return str(error)
+
+    def set_input_backend(self, name):
+        """Switch the input injection backend ("pyautogui", "xtest", "uinput" or "auto")"""
+        backend = get_input_backend(name)
+        self.input.close()
+        self.input = backend
+        self.motion.backend = backend
+        self._debug_msg(f"Using input backend: {backend.name}")
+
     def pause(self):
         """Pause workflow execution"""
         self.paused = True
@@ -653,3 +1361,11 @@ class WorkflowExecutor(QObject):
         """Stop workflow execution"""
         self.running = False
 
+    def close(self):
+        """Release the capture handles, writer thread and input backend once the executor is no longer used"""
+        self.running = False
+        self.stop_sampling()
+        self.debug_writer.close()
+        self.capture.close()
+        self.input.close()
+
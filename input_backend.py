@@ -0,0 +1,353 @@
+import sys
+import time
+import os
+from abc import ABC, abstractmethod
+
+import pyautogui
+import keyboard
+
+# Try importing python-xlib for XTEST injection, but don't fail if not available
+try:
+    from Xlib import X, XK, display as xdisplay
+    from Xlib.ext import xtest
+    XTEST_AVAILABLE = True
+except ImportError:
+    XTEST_AVAILABLE = False
+
+# Try importing python-evdev for uinput injection, but don't fail if not available
+try:
+    from evdev import UInput, AbsInfo, ecodes
+    UINPUT_AVAILABLE = True
+except ImportError:
+    UINPUT_AVAILABLE = False
+
+# Key names used by the executor -> X keysym names
+X_KEYSYMS = {
+    "\n": "Return", "\t": "Tab", " ": "space",
+    "enter": "Return", "tab": "Tab", "space": "space", "backspace": "BackSpace",
+    "delete": "Delete", "esc": "Escape", "escape": "Escape", "up": "Up", "down": "Down",
+    "left": "Left", "right": "Right", "ctrl": "Control_L", "alt": "Alt_L",
+    "shift": "Shift_L", "win": "Super_L", "command": "Super_L", "home": "Home",
+    "end": "End", "pageup": "Prior", "pagedown": "Next", "insert": "Insert",
+}
+
+# Mouse button names -> X button numbers
+X_BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+
+class InputBackend(ABC):
+    """Interface for injecting mouse and keyboard input.
+
+    Backends may queue events; nothing is guaranteed to reach the OS until
+    flush() is called. Methods take a `pause` flag that applies the backend's
+    post-action pause (pyautogui.PAUSE); backends without one ignore it.
+    """
+    name = "base"
+    failsafe_interval = 16  # Moves between fail-safe pointer checks, for backends that check themselves
+    _moves_since_check = 0
+
+    def position(self):
+        """Return the current pointer position"""
+        return pyautogui.position()
+
+    @abstractmethod
+    def move(self, x, y, duration=0, pause=True):
+        pass
+
+    @abstractmethod
+    def mouse_down(self, button="left", pause=True):
+        pass
+
+    @abstractmethod
+    def mouse_up(self, button="left", pause=True):
+        pass
+
+    def click(self, button="left", pause=True):
+        self.mouse_down(button, pause=False)
+        self.mouse_up(button, pause=pause)
+
+    @abstractmethod
+    def key_down(self, key, pause=True):
+        pass
+
+    @abstractmethod
+    def key_up(self, key, pause=True):
+        pass
+
+    def press(self, key, pause=True):
+        self.key_down(key, pause=False)
+        self.key_up(key, pause=pause)
+
+    def hotkey(self, *keys, pause=True):
+        for key in keys:
+            self.key_down(key, pause=False)
+        for key in reversed(keys):
+            self.key_up(key, pause=False)
+
+    def write(self, text, interval=0.0, pause=True):
+        for char in text:
+            self.press(char, pause=False)
+            if interval:
+                self.flush()
+                time.sleep(interval)
+
+    def flush(self):
+        """Submit any queued events"""
+        pass
+
+    def close(self):
+        """Release any resources held by the backend"""
+        pass
+
+    def _check_failsafe(self, every=1):
+        """Raise pyautogui's FailSafeException if the pointer is in a fail-safe corner, as pyautogui itself does.
+
+        Reading the pointer costs a round-trip, so with `every` > 1 it is only
+        read on every `every`-th call; button presses check with every=1.
+        """
+        self._moves_since_check = (self._moves_since_check + 1) % every
+        if self._moves_since_check:
+            return
+        if pyautogui.FAILSAFE and tuple(pyautogui.position()) in pyautogui.FAILSAFE_POINTS:
+            raise pyautogui.FailSafeException(
+                "Fail-safe triggered from mouse moving to a corner of the screen. "
+                "To disable this fail-safe, set pyautogui.FAILSAFE to False."
+            )
+
+
+class PyAutoGUIBackend(InputBackend):
+    """Default backend: pyautogui for mouse and typing, the keyboard library for combinations"""
+    name = "pyautogui"
+
+    def move(self, x, y, duration=0, pause=True):
+        pyautogui.moveTo(x, y, duration=duration, _pause=pause)
+
+    def mouse_down(self, button="left", pause=True):
+        pyautogui.mouseDown(button=button, _pause=pause)
+
+    def mouse_up(self, button="left", pause=True):
+        pyautogui.mouseUp(button=button, _pause=pause)
+
+    def click(self, button="left", pause=True):
+        pyautogui.click(button=button, _pause=pause)
+
+    def key_down(self, key, pause=True):
+        pyautogui.keyDown(key, _pause=pause)
+
+    def key_up(self, key, pause=True):
+        pyautogui.keyUp(key, _pause=pause)
+
+    def press(self, key, pause=True):
+        pyautogui.press(key, _pause=pause)
+
+    def hotkey(self, *keys, pause=True):
+        keyboard.press_and_release('+'.join(keys))
+
+    def write(self, text, interval=0.0, pause=True):
+        pyautogui.write(text, interval=interval, _pause=pause)
+
+
+class XTestBackend(InputBackend):
+    """Linux/X11 backend that queues events through the XTEST extension.
+
+    Events are buffered in the Xlib connection and submitted together by
+    flush(), which costs a single round-trip to the X server.
+    """
+    name = "xtest"
+
+    def __init__(self, display_name=None):
+        self.display = xdisplay.Display(display_name)
+        if not self.display.has_extension("XTEST"):
+            raise RuntimeError("X server does not support the XTEST extension")
+        self._keycodes = {}
+
+    def position(self):
+        pointer = self.display.screen().root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def _keycode(self, key):
+        """Return (keycode, needs_shift) for a key name or character"""
+        cached = self._keycodes.get(key)
+        if cached is not None:
+            return cached
+
+        name = X_KEYSYMS.get(key if len(key) == 1 else key.lower())
+        if name:
+            keysym = XK.string_to_keysym(name)
+        elif len(key) == 1:
+            # Latin-1 keysyms equal their code point (covers punctuation such as ',' and '/')
+            keysym = XK.string_to_keysym(key) or ord(key)
+        else:
+            keysym = XK.string_to_keysym(key) or XK.string_to_keysym(key.upper())
+        keycode = self.display.keysym_to_keycode(keysym)
+        if not keycode:
+            raise ValueError(f"No keycode for key: {key}")
+
+        needs_shift = len(key) == 1 and self.display.keycode_to_keysym(keycode, 0) != keysym
+        self._keycodes[key] = (keycode, needs_shift)
+        return keycode, needs_shift
+
+    def move(self, x, y, duration=0, pause=True):
+        self._check_failsafe(self.failsafe_interval)
+        if duration > 0:
+            # Linear tween; each intermediate position has to reach the server to be visible
+            start_x, start_y = self.position()
+            steps = max(1, int(duration * 60))
+            for i in range(1, steps + 1):
+                xtest.fake_input(
+                    self.display, X.MotionNotify,
+                    x=int(start_x + (x - start_x) * i / steps),
+                    y=int(start_y + (y - start_y) * i / steps)
+                )
+                self.display.flush()
+                time.sleep(duration / steps)
+        else:
+            xtest.fake_input(self.display, X.MotionNotify, x=int(x), y=int(y))
+
+    def mouse_down(self, button="left", pause=True):
+        self._check_failsafe()
+        xtest.fake_input(self.display, X.ButtonPress, X_BUTTONS.get(button, 1))
+
+    def mouse_up(self, button="left", pause=True):
+        xtest.fake_input(self.display, X.ButtonRelease, X_BUTTONS.get(button, 1))
+
+    def key_down(self, key, pause=True):
+        keycode, needs_shift = self._keycode(key)
+        if needs_shift:
+            xtest.fake_input(self.display, X.KeyPress, self._keycode("shift")[0])
+        xtest.fake_input(self.display, X.KeyPress, keycode)
+
+    def key_up(self, key, pause=True):
+        keycode, needs_shift = self._keycode(key)
+        xtest.fake_input(self.display, X.KeyRelease, keycode)
+        if needs_shift:
+            xtest.fake_input(self.display, X.KeyRelease, self._keycode("shift")[0])
+
+    def flush(self):
+        self.display.sync()
+
+    def close(self):
+        self.display.close()
+
+
+class UinputBackend(InputBackend):
+    """Linux backend that injects events through a virtual uinput device.
+
+    Works under any display server (or a virtual display) but needs write
+    access to /dev/uinput. Key and button events are reported as they happen;
+    pointer moves are coalesced until the next SYN_REPORT.
+    """
+    name = "uinput"
+
+    def __init__(self, screen_size=None):
+        width, height = screen_size or pyautogui.size()
+        # ecodes also lists KEY_MAX/KEY_CNT, which are bounds rather than keys and are rejected by uinput
+        keys = [code for name, code in ecodes.ecodes.items() if name.startswith("KEY_") and code < ecodes.KEY_MAX]
+        capabilities = {
+            ecodes.EV_KEY: keys + [ecodes.BTN_LEFT, ecodes.BTN_RIGHT, ecodes.BTN_MIDDLE],
+            ecodes.EV_ABS: [
+                (ecodes.ABS_X, AbsInfo(0, 0, width - 1, 0, 0, 0)),
+                (ecodes.ABS_Y, AbsInfo(0, 0, height - 1, 0, 0, 0)),
+            ],
+        }
+        self.device = UInput(capabilities, name="automation-tool-input")
+        self._position = (0, 0)
+
+    def position(self):
+        return self._position
+
+    def _keycode(self, key):
+        """Return (keycode, needs_shift) for a key name or character"""
+        shifted = {
+            "!": "1", "@": "2", "#": "3", "$": "4", "%": "5", "^": "6", "&": "7", "*": "8",
+            "(": "9", ")": "0", "_": "-", "+": "=", "{": "[", "}": "]", "|": "\\",
+            ":": ";", "\"": "'", "<": ",", ">": ".", "?": "/", "~": "`",
+        }
+        names = {
+            " ": "SPACE", "-": "MINUS", "=": "EQUAL", "[": "LEFTBRACE", "]": "RIGHTBRACE",
+            "\\": "BACKSLASH", ";": "SEMICOLON", "'": "APOSTROPHE", ",": "COMMA",
+            ".": "DOT", "/": "SLASH", "`": "GRAVE", "\n": "ENTER", "\t": "TAB",
+            "enter": "ENTER", "tab": "TAB", "space": "SPACE", "backspace": "BACKSPACE",
+            "delete": "DELETE", "esc": "ESC", "escape": "ESC", "up": "UP", "down": "DOWN",
+            "left": "LEFT", "right": "RIGHT", "ctrl": "LEFTCTRL", "alt": "LEFTALT",
+            "shift": "LEFTSHIFT", "win": "LEFTMETA", "command": "LEFTMETA",
+        }
+        needs_shift = False
+        if len(key) == 1 and (key.isupper() or key in shifted):
+            needs_shift = True
+            key = shifted.get(key, key.lower())
+        name = names.get(key, names.get(key.lower(), key.upper()))
+        code = ecodes.ecodes.get(f"KEY_{name}")
+        if code is None:
+            raise ValueError(f"No keycode for key: {key}")
+        return code, needs_shift
+
+    def move(self, x, y, duration=0, pause=True):
+        self._check_failsafe(self.failsafe_interval)
+        self.device.write(ecodes.EV_ABS, ecodes.ABS_X, int(x))
+        self.device.write(ecodes.EV_ABS, ecodes.ABS_Y, int(y))
+        self._position = (int(x), int(y))
+        if duration > 0:
+            self.flush()
+            time.sleep(duration)
+
+    def _button(self, button):
+        return {"left": ecodes.BTN_LEFT, "right": ecodes.BTN_RIGHT, "middle": ecodes.BTN_MIDDLE}.get(button, ecodes.BTN_LEFT)
+
+    def mouse_down(self, button="left", pause=True):
+        self._check_failsafe()
+        self.device.write(ecodes.EV_KEY, self._button(button), 1)
+        self.device.syn()
+
+    def mouse_up(self, button="left", pause=True):
+        self.device.write(ecodes.EV_KEY, self._button(button), 0)
+        self.device.syn()
+
+    def key_down(self, key, pause=True):
+        code, needs_shift = self._keycode(key)
+        if needs_shift:
+            self.device.write(ecodes.EV_KEY, ecodes.KEY_LEFTSHIFT, 1)
+        self.device.write(ecodes.EV_KEY, code, 1)
+        self.device.syn()
+
+    def key_up(self, key, pause=True):
+        code, needs_shift = self._keycode(key)
+        self.device.write(ecodes.EV_KEY, code, 0)
+        if needs_shift:
+            self.device.write(ecodes.EV_KEY, ecodes.KEY_LEFTSHIFT, 0)
+        self.device.syn()
+
+    def flush(self):
+        self.device.syn()
+
+    def close(self):
+        self.device.close()
+
+
+INPUT_BACKENDS = {
+    "pyautogui": PyAutoGUIBackend,
+    "xtest": XTestBackend,
+    "uinput": UinputBackend,
+}
+
+
+def available_input_backends():
+    """Names of the backends that can be used on this system"""
+    names = ["pyautogui"]
+    if sys.platform.startswith("linux"):
+        if XTEST_AVAILABLE and os.environ.get("DISPLAY"):
+            names.append("xtest")
+        if UINPUT_AVAILABLE and os.access("/dev/uinput", os.W_OK):
+            names.append("uinput")
+    return names
+
+
+def get_input_backend(name="pyautogui"):
+    """Create an input backend by name; "auto" picks the fastest available one"""
+    if name == "auto":
+        available = available_input_backends()
+        name = "xtest" if "xtest" in available else "pyautogui"
+    backend_class = INPUT_BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"Unknown input backend: {name}")
+    return backend_class()
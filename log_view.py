@@ -0,0 +1,126 @@
+import time
+import html
+from collections import deque
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QComboBox, QLabel
+from PyQt6.QtCore import QTimer
+
+# Message level -> (rank, colour). Levels are inferred from the message text, as the old colouring was.
+LEVELS = {
+    "debug": (0, "#FFFFFF"),
+    "step": (1, "#00FFFF"),
+    "success": (1, "#00FF00"),
+    "warning": (2, "#FFA500"),
+    "error": (3, "#FF0000"),
+}
+
+# Filter label -> minimum rank shown
+LEVEL_FILTERS = {
+    "All": 0,
+    "Steps & results": 1,
+    "Warnings & errors": 2,
+    "Errors only": 3,
+}
+
+
+def message_level(message):
+    """Infer a level from the markers the executor puts in its messages"""
+    if "❌" in message or "Error" in message:
+        return "error"
+    if "Warning" in message or "timed out" in message:
+        return "warning"
+    if "✓" in message:
+        return "success"
+    if "===" in message:
+        return "step"
+    return "debug"
+
+
+class LogView(QWidget):
+    """Bounded debug log that renders batches of lines on a timer.
+
+    append() is safe to call from any thread and only queues the line (and,
+    like logging, its %-args); the GUI thread formats and renders everything
+    queued since the last tick as one batch with a single repaint, and the
+    document never grows past max_lines.
+    """
+    def __init__(self, parent=None, max_lines=5000, refresh_ms=100):
+        super().__init__(parent)
+        self.pending = deque(maxlen=max_lines)  # Lines waiting to be rendered; oldest dropped first
+        self.history = deque(maxlen=max_lines)  # Rendered lines, kept so the filter can be changed
+        self.min_rank = 0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Show:"))
+        self.level_filter = QComboBox()
+        self.level_filter.addItems(LEVEL_FILTERS.keys())
+        self.level_filter.currentTextChanged.connect(self.set_filter)
+        filter_layout.addWidget(self.level_filter)
+        filter_layout.addStretch(1)
+        layout.addLayout(filter_layout)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(max_lines)
+        self.text.setStyleSheet("""
+            QPlainTextEdit {
+                background-color: #1e1e1e;
+                color: #e0e0e0;
+                font-family: 'Consolas', 'Courier New', monospace;
+                font-size: 10pt;
+            }
+        """)
+        layout.addWidget(self.text)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(refresh_ms)
+
+    def append(self, message, *args):
+        """Queue a message for display (thread-safe); `args` are %-merged into it when it is rendered"""
+        self.pending.append((time.strftime("%H:%M:%S"), message, args))
+
+    def clear(self):
+        self.pending.clear()
+        self.history.clear()
+        self.text.clear()
+
+    def set_filter(self, label):
+        """Show only messages at or above the chosen level, re-rendering the kept history"""
+        self.min_rank = LEVEL_FILTERS.get(label, 0)
+        self.text.clear()
+        self._render(list(self.history))
+
+    def flush(self):
+        """Render everything queued since the last tick"""
+        if not self.pending:
+            return
+        lines = []
+        while self.pending:
+            timestamp, message, args = self.pending.popleft()
+            if args:
+                message = message % args
+            lines.append((timestamp, message, message_level(message)))
+        self.history.extend(lines)
+        self._render(lines)
+
+    def _render(self, lines):
+        shown = [line for line in lines if LEVELS[line[2]][0] >= self.min_rank]
+        if not shown:
+            return
+
+        scrollbar = self.text.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+        # Lay out and repaint once per batch rather than once per line
+        self.text.setUpdatesEnabled(False)
+        for timestamp, message, level in shown:
+            colour = LEVELS[level][1]
+            text = html.escape(message.strip("\n")).replace("\n", "<br>")
+            self.text.appendHtml(f'<span style="color: {colour};">[{timestamp}] {text}</span>')
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+        self.text.setUpdatesEnabled(True)
@@ -0,0 +1,107 @@
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# The running listener, so setup_logging() can be called from several places but configures once
+_listener = None
+
+
+class RotatingLogHandler(RotatingFileHandler):
+    """Size-based rotation with numbered backups that also rotates once the file is `max_age` seconds old"""
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5, max_age=24 * 3600, encoding='utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.max_age = max_age
+        self.opened_at = os.path.getmtime(filename) if os.path.exists(filename) else time.time()
+
+    def shouldRollover(self, record):
+        if self.max_age and time.time() - self.opened_at >= self.max_age and os.path.exists(self.baseFilename):
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.opened_at = time.time()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, for tools that parse the log"""
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        # Context passed with extra={...}, e.g. step index and loop iteration
+        for key in ("step", "loop"):
+            if hasattr(record, key):
+                entry[key] = getattr(record, key)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queues records untouched, so %-style arguments are merged on the listener thread, not the caller's"""
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(log_dir, level=logging.DEBUG, console_level=logging.INFO, json_lines=False,
+                  max_bytes=10 * 1024 * 1024, backup_count=5, max_age=24 * 3600):
+    """Route all logging through a queue to a listener thread that owns the file and console handlers.
+
+    Writes `automation.log` (and `automation.jsonl` if `json_lines`) in
+    `log_dir`, rotating at `max_bytes` or `max_age` seconds. Only the first
+    call configures anything; later calls return the running listener.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    handlers = []
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = RotatingLogHandler(os.path.join(log_dir, 'automation.log'), max_bytes, backup_count, max_age)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(file_handler)
+        if json_lines:
+            json_handler = RotatingLogHandler(os.path.join(log_dir, 'automation.jsonl'), max_bytes, backup_count, max_age)
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
+    except Exception as e:
+        # If file logging fails, fall back to console-only logging
+        print(f"Warning: Could not create log file. Falling back to console logging. Error: {str(e)}")
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(console_level)
+    console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Write out everything still queued and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
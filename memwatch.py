@@ -0,0 +1,78 @@
+import json
+import tracemalloc
+
+from metrics import rss_bytes
+
+# Allocations from these files are bookkeeping, not the workflow
+IGNORED_FILES = ["<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>", "<unknown>", tracemalloc.__file__]
+
+
+class MemoryWatch:
+    """Tracks memory growth between global loop iterations with tracemalloc snapshots.
+
+    Each checkpoint() compares a new snapshot with the previous one and
+    records the allocation sites that grew the most, plus traced and
+    resident memory. Tracing slows allocation-heavy code down noticeably,
+    so this is opt-in.
+    """
+    def __init__(self, top=10, warn_growth=5 * 1024 * 1024, frames=1):
+        self.top = top
+        self.warn_growth = warn_growth  # Bytes of growth per iteration that trigger a warning
+        self.frames = frames
+        self.iterations = []
+        self._snapshot = None
+        self._started = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+        self._snapshot = self._take()
+        self.iterations = [self._entry(0, [])]
+
+    def stop(self):
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+        self._snapshot = None
+
+    def _take(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, filename) for filename in IGNORED_FILES]
+        )
+
+    def _entry(self, iteration, top):
+        traced, peak = tracemalloc.get_traced_memory()
+        return {"iteration": iteration, "traced": traced, "peak": peak, "rss": rss_bytes(), "top": top}
+
+    def checkpoint(self, iteration):
+        """Snapshot after `iteration` and return its entry, with growth since the previous checkpoint"""
+        if self._snapshot is None:
+            return None
+        snapshot = self._take()
+        stats = snapshot.compare_to(self._snapshot, "lineno")
+        self._snapshot = snapshot
+        top = [
+            {
+                "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+            }
+            for stat in stats[:self.top] if stat.size_diff > 0
+        ]
+
+        entry = self._entry(iteration, top)
+        previous = self.iterations[-1]
+        entry["traced_growth"] = entry["traced"] - previous["traced"]
+        if entry["rss"] is not None and previous["rss"] is not None:
+            entry["rss_growth"] = entry["rss"] - previous["rss"]
+        else:
+            entry["rss_growth"] = None
+        entry["warning"] = max(entry["traced_growth"], entry["rss_growth"] or 0) > self.warn_growth
+        self.iterations.append(entry)
+        return entry
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"warn_growth": self.warn_growth, "iterations": self.iterations}, f, indent=4)
@@ -0,0 +1,231 @@
+import os
+import sys
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Try importing psutil for memory figures, but don't fail if not available
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Latency histogram bucket bounds (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def rss_bytes():
+    """Resident set size of this process, or None if it can't be read"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        psapi = ctypes.WinDLL("psapi")
+        kernel32 = ctypes.WinDLL("kernel32")
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        if psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f"{name}_bucket{_labels(labels + [('le', bound)])} {cumulative}"
+        yield f"{name}_bucket{_labels(labels + [('le', '+Inf')])} {self.count}"
+        yield f"{name}_count{_labels(labels)} {self.count}"
+        yield f"{name}_sum{_labels(labels)} {self.sum}"
+
+
+class RunMetrics:
+    """Counters and latency histograms of the running workflow, rendered as OpenMetrics text.
+
+    The executor updates them as it goes; gauges that are cheap to read on
+    demand (progress, queue depth, memory) come from `gauges`, a callable
+    returning {name: (help, value)} that is called only when rendering.
+    """
+    def __init__(self, gauges=None):
+        self._lock = threading.Lock()
+        self.gauges = gauges
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.errors = {}  # (step number, step name) -> count
+            self.latency = {}  # (phase, kind) -> Histogram
+
+    def count_error(self, step, name):
+        with self._lock:
+            self.errors[(step, name)] = self.errors.get((step, name), 0) + 1
+
+    def observe(self, phase, kind, seconds):
+        """Record one capture/match timing"""
+        with self._lock:
+            histogram = self.latency.get((phase, kind))
+            if histogram is None:
+                histogram = Histogram()
+                self.latency[(phase, kind)] = histogram
+            histogram.observe(seconds)
+
+    def latency_totals(self):
+        """(count, sum) of every latency histogram, for samplers that work out recent averages"""
+        with self._lock:
+            return {key: (histogram.count, histogram.sum) for key, histogram in self.latency.items()}
+
+    def render(self):
+        lines = []
+        if self.gauges:
+            for name, (help_text, value) in self.gauges().items():
+                if value is None:
+                    continue
+                kind = "counter" if name.endswith("_total") else "gauge"
+                family = name[:-len("_total")] if kind == "counter" else name
+                lines += [f"# TYPE {family} {kind}", f"# HELP {family} {help_text}", f"{name} {value}"]
+
+        with self._lock:
+            lines += ["# TYPE automation_step_errors counter", "# HELP automation_step_errors Failed executions per step"]
+            for (step, name), count in sorted(self.errors.items()):
+                lines.append(f"automation_step_errors_total{_labels([('step', step), ('name', name)])} {count}")
+
+            lines += ["# TYPE automation_phase_latency_seconds histogram",
+                      "# HELP automation_phase_latency_seconds Duration of screen captures and matches"]
+            for (phase, kind), histogram in sorted(self.latency.items()):
+                lines += histogram.lines("automation_phase_latency_seconds", [("phase", phase), ("kind", kind)])
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """Periodically writes RunMetrics to a text file and optionally serves them on localhost.
+
+    The file is replaced atomically (written next to itself, then renamed),
+    so a scraper never reads half a file. The HTTP endpoint binds to
+    127.0.0.1 only and serves the same text at /metrics.
+    """
+    def __init__(self, metrics, path, interval=10.0, http_port=None):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.http_port = http_port
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+        if self.http_port:
+            self._start_server()
+
+    def stop(self):
+        """Stop writing (after one final write) and shut the endpoint down"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def write(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.metrics.render())
+        os.replace(temp_path, self.path)
+
+    def _run(self):
+        while True:
+            try:
+                self.write()
+            except Exception as e:
+                logger.error("Failed to write metrics file %s: %s", self.path, e)
+            if self._stop.wait(self.interval):
+                break
+        try:
+            self.write()
+        except Exception as e:
+            logger.error("Failed to write metrics file %s: %s", self.path, e)
+
+    def _start_server(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes would otherwise flood the console
+
+        try:
+            self._server = ThreadingHTTPServer(("127.0.0.1", self.http_port), Handler)
+        except OSError as e:
+            logger.error("Could not serve metrics on port %s: %s", self.http_port, e)
+            return
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
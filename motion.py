@@ -0,0 +1,144 @@
+import time
+import math
+from bisect import bisect_left
+from functools import lru_cache
+
+# Motion modes: "tween" animates over the step's duration (the original behaviour),
+# "instant" teleports the pointer, "path" plays a short precomputed eased path
+# for applications that need to see hover/move events.
+MOTION_MODES = ["tween", "instant", "path"]
+
+
+@lru_cache(maxsize=32)
+def unit_path(points):
+    """Precomputed ease-in-out progress values (0..1] for a path of `points` steps"""
+    path = []
+    for i in range(1, points + 1):
+        t = i / points
+        path.append(2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2)
+    return tuple(path)
+
+
+def simplify_path(points, epsilon=2.0):
+    """Ramer-Douglas-Peucker simplification of a polyline of (x, y) points.
+
+    Keeps the endpoints and every point that deviates more than `epsilon`
+    pixels from the simplified line. Iterative, so long drags can't hit the
+    recursion limit.
+    """
+    if len(points) < 3:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        (x1, y1), (x2, y2) = points[first], points[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = math.hypot(dx, dy)
+
+        max_dist, index = 0.0, None
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if length:
+                dist = abs(dy * px - dx * py + x2 * y1 - y2 * x1) / length
+            else:
+                dist = math.hypot(px - x1, py - y1)
+            if dist > max_dist:
+                max_dist, index = dist, i
+
+        if index is not None and max_dist > epsilon:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def flatten_path(points):
+    """[(x, y), ...] -> [x0, y0, x1, y1, ...] as stored in workflow files"""
+    return [int(round(c)) for point in points for c in point]
+
+
+def unflatten_path(flat):
+    """[x0, y0, x1, y1, ...] -> [(x, y), ...]"""
+    return list(zip(flat[0::2], flat[1::2]))
+
+
+class MotionEngine:
+    """Moves the pointer through an input backend and accounts for the time spent moving"""
+    def __init__(self, backend, mode="tween", path_points=8, path_duration=0.05):
+        self.backend = backend
+        self.mode = mode
+        self.path_points = path_points
+        self.path_duration = path_duration
+        self.total_time = 0.0
+        self.moves = 0
+
+    def reset_stats(self):
+        """Clear the accumulated motion statistics"""
+        self.total_time = 0.0
+        self.moves = 0
+
+    def move_to(self, x, y, duration=0, mode=None):
+        """Move the pointer to (x, y); `mode` overrides the engine default for this move"""
+        mode = mode if mode in MOTION_MODES else self.mode
+        start_time = time.perf_counter()
+
+        if mode == "instant":
+            self.backend.move(x, y, pause=False)
+        elif mode == "path":
+            start_x, start_y = self.backend.position()
+            progress = unit_path(self.path_points)
+            interval = self.path_duration / len(progress)
+            for p in progress:
+                self.backend.move(
+                    round(start_x + (x - start_x) * p),
+                    round(start_y + (y - start_y) * p),
+                    pause=False
+                )
+                self.backend.flush()
+                time.sleep(interval)
+        else:
+            self.backend.move(x, y, duration=duration)
+
+        self.total_time += time.perf_counter() - start_time
+        self.moves += 1
+
+    def follow_path(self, points, duration=0, rate=60):
+        """Move the pointer along a polyline of (x, y) points.
+
+        The path is resampled by arc length at `rate` positions per second so
+        the pointer speed is even regardless of how the vertices are spaced.
+        With no duration the pointer just visits each vertex.
+        """
+        start_time = time.perf_counter()
+
+        if duration <= 0 or len(points) < 2:
+            for x, y in points:
+                self.backend.move(x, y, pause=False)
+                self.backend.flush()
+        else:
+            # Cumulative distance along the path at each vertex
+            distances = [0.0]
+            for (x1, y1), (x2, y2) in zip(points, points[1:]):
+                distances.append(distances[-1] + math.hypot(x2 - x1, y2 - y1))
+            total = distances[-1] or 1.0
+
+            ticks = max(1, int(duration * rate))
+            for i in range(1, ticks + 1):
+                target = total * i / ticks
+                segment = min(max(bisect_left(distances, target), 1), len(points) - 1)
+                (x1, y1), (x2, y2) = points[segment - 1], points[segment]
+                span = distances[segment] - distances[segment - 1]
+                t = (target - distances[segment - 1]) / span if span else 1.0
+                self.backend.move(round(x1 + (x2 - x1) * t), round(y1 + (y2 - y1) * t), pause=False)
+                self.backend.flush()
+                # Sleep until this tick's deadline so per-move overhead doesn't stretch the drag
+                remaining = start_time + duration * i / ticks - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+
+        self.total_time += time.perf_counter() - start_time
+        self.moves += 1
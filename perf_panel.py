@@ -0,0 +1,197 @@
+from collections import deque
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLabel
+from PyQt6.QtCore import Qt, QTimer, QPointF
+from PyQt6.QtGui import QPainter, QPen, QColor, QPolygonF
+
+# Chart series -> line colour
+SERIES = {
+    "capture": "#00BFFF",
+    "match": "#32CD32",
+    "ocr": "#FFA500",
+}
+
+
+def series_name(phase, kind):
+    """Chart series a (phase, kind) latency histogram belongs to"""
+    if phase == "match" and kind == "ocr":
+        return "ocr"
+    return phase
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class LatencyChart(QWidget):
+    """Rolling line chart of average latency per sample interval, in milliseconds"""
+    def __init__(self, history=120, parent=None):
+        super().__init__(parent)
+        self.samples = {name: deque(maxlen=history) for name in SERIES}
+        self.history = history
+        self.setMinimumHeight(110)
+
+    def add(self, values):
+        """Append one sample; `values` maps series name -> milliseconds (None for no activity)"""
+        for name, samples in self.samples.items():
+            samples.append(values.get(name))
+        self.update()
+
+    def clear(self):
+        for samples in self.samples.values():
+            samples.clear()
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor("#1e1e1e"))
+
+        peak = max((value for samples in self.samples.values() for value in samples if value is not None), default=0)
+        scale = max(peak * 1.1, 1.0)
+        width, height = self.width(), self.height() - 16
+        step = width / max(self.history - 1, 1)
+
+        for name, samples in self.samples.items():
+            painter.setPen(QPen(QColor(SERIES[name]), 1.5))
+            # Gaps (no activity in an interval) break the line
+            line = QPolygonF()
+            offset = self.history - len(samples)
+            for i, value in enumerate(samples):
+                if value is None:
+                    if line.count() > 1:
+                        painter.drawPolyline(line)
+                    line = QPolygonF()
+                    continue
+                line.append(QPointF((offset + i) * step, 16 + height - value / scale * height))
+            if line.count() > 1:
+                painter.drawPolyline(line)
+
+        # Scale in the top left, colour-coded legend in the top right
+        painter.setPen(QColor("#e0e0e0"))
+        painter.drawText(4, 12, f"{scale:.0f} ms")
+        metrics = painter.fontMetrics()
+        x = width - 4 - sum(metrics.horizontalAdvance(name) + 10 for name in SERIES)
+        for name, colour in SERIES.items():
+            painter.setPen(QColor(colour))
+            painter.drawText(x, 12, name)
+            x += metrics.horizontalAdvance(name) + 10
+        painter.end()
+
+
+class PerfPanel(QWidget):
+    """Live view of a run's throughput, latency, sleep share and cache use.
+
+    Samples a counters callable (WorkflowExecutor.perf_counters) on a timer
+    and derives rates from the difference between samples, so the executor
+    never has to send anything to the GUI.
+    """
+    def __init__(self, parent=None, refresh_ms=1000, history=120):
+        super().__init__(parent)
+        self.source = None
+        self.previous = None
+        self.last_seq = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        grid = QGridLayout()
+        self.values = {}
+        for row, (key, label) in enumerate([
+            ("throughput", "Throughput:"),
+            ("loops", "Loop iterations:"),
+            ("remaining", "Remaining:"),
+            ("work", "Work vs sleep:"),
+            ("cache", "Cache hits:"),
+            ("queue", "Debug write queue:"),
+        ]):
+            grid.addWidget(QLabel(label), row, 0)
+            value = QLabel("-")
+            value.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            grid.addWidget(value, row, 1)
+            self.values[key] = value
+        grid.setColumnStretch(1, 1)
+        layout.addLayout(grid)
+
+        layout.addWidget(QLabel("Average latency per sample (ms):"))
+        self.chart = LatencyChart(history)
+        layout.addWidget(self.chart, 1)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.sample)
+        self.timer.start(refresh_ms)
+
+    def set_source(self, source):
+        """Start sampling a new run's counters"""
+        self.source = source
+        self.previous = None
+        self.last_seq = None
+        self.chart.clear()
+
+    def sample(self):
+        if self.source is None:
+            return
+        counters = self.source()
+        state = counters["progress"]
+        if not state["running"] and state["seq"] == self.last_seq:
+            return  # Finished and already shown
+        self.last_seq = state["seq"]
+
+        # Throughput, flagging a recent rate well under the run's average
+        average = state["steps_per_sec"] * 60
+        recent = state["recent_steps_per_sec"] * 60
+        trend = ""
+        if state["running"] and state["elapsed"] > 30 and recent < average * 0.8:
+            trend = ' <span style="color: #FFA500;">▼ slowing down</span>'
+        self.values["throughput"].setText(f"{recent:.1f} steps/min now, {average:.1f} average{trend}")
+
+        loops_done = state["loop_iterations_done"]
+        per_hour = loops_done / state["elapsed"] * 3600 if state["elapsed"] > 0 else 0.0
+        self.values["loops"].setText(f"{loops_done}/{state['loop_count']} ({per_hour:.1f}/hour)")
+        self.values["remaining"].setText(self._remaining(state))
+
+        phases = counters["phases"]
+        spent = sum(phases.values())
+        if spent > 0:
+            sleep_share = phases["sleep"] / spent
+            self.values["work"].setText(f"{1 - sleep_share:.0%} work / {sleep_share:.0%} sleep")
+
+        hits, misses = counters["cache"]
+        if hits + misses:
+            self.values["cache"].setText(f"{hits / (hits + misses):.0%} ({hits} of {hits + misses} lookups)")
+        self.values["queue"].setText(str(counters["debug_queue"]))
+
+        self._add_latency(counters["latency"])
+
+    def _remaining(self, state):
+        """Estimate from completed global loops, or from steps during the first one"""
+        elapsed = state["elapsed"]
+        if not state["running"]:
+            return "done"
+        if state["loop_iterations_done"]:
+            per_loop = elapsed / state["loop_iterations_done"]
+            return "~" + format_duration(per_loop * (state["loop_count"] - state["loop_iterations_done"]))
+        if state["steps_done"] and state["total_steps"]:
+            # Ignores nested loops, which repeat steps within one global iteration
+            per_step = elapsed / state["steps_done"]
+            return "~" + format_duration(per_step * max(state["total_steps"] * state["loop_count"] - state["steps_done"], 0))
+        return "-"
+
+    def _add_latency(self, latency):
+        """Average latency per series since the previous sample"""
+        totals = {}
+        for (phase, kind), (count, total) in latency.items():
+            name = series_name(phase, kind)
+            if name in SERIES:
+                previous_count, previous_total = totals.get(name, (0, 0.0))
+                totals[name] = (previous_count + count, previous_total + total)
+
+        values = {}
+        if self.previous is not None:
+            for name, (count, total) in totals.items():
+                previous_count, previous_total = self.previous.get(name, (0, 0.0))
+                if count > previous_count:
+                    values[name] = (total - previous_total) / (count - previous_count) * 1000
+        self.previous = totals
+        self.chart.add(values)
@@ -0,0 +1,83 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QFileDialog, QMessageBox
+)
+
+from profiler import PHASES, export_json, export_csv
+
+# Column header -> (report key, format)
+COLUMNS = [
+    ("#", "rank", "{}"),
+    ("Step", "step", "{}"),
+    ("Name", "name", "{}"),
+    ("Runs", "count", "{}"),
+    ("Total (s)", "total", "{:.2f}"),
+    ("Share", "share", "{:.0%}"),
+    ("p50 (s)", "p50", "{:.3f}"),
+    ("p95 (s)", "p95", "{:.3f}"),
+] + [(f"{phase} (s)", f"{phase}_total", "{:.2f}") for phase in PHASES]
+
+
+class ProfileView(QWidget):
+    """Table of the last run's per-step timings, slowest first, with export buttons"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.report = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        controls = QHBoxLayout()
+        self.summary = QLabel("Run a workflow to see where its time goes.")
+        controls.addWidget(self.summary, 1)
+        self.json_btn = QPushButton("Export JSON")
+        self.json_btn.clicked.connect(lambda: self.export("json"))
+        controls.addWidget(self.json_btn)
+        self.csv_btn = QPushButton("Export CSV")
+        self.csv_btn.clicked.connect(lambda: self.export("csv"))
+        controls.addWidget(self.csv_btn)
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([column[0] for column in COLUMNS])
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        self.json_btn.setEnabled(False)
+        self.csv_btn.setEnabled(False)
+
+    def set_report(self, report):
+        self.report = report
+        if not report:
+            return
+        rows = report["steps"]
+        self.table.setRowCount(len(rows))
+        for row, entry in enumerate(rows):
+            for column, (_, key, fmt) in enumerate(COLUMNS):
+                self.table.setItem(row, column, QTableWidgetItem(fmt.format(entry[key])))
+
+        phases = report["phase_totals"]
+        busiest = ", ".join(f"{phase} {phases[phase]:.2f}s" for phase in sorted(phases, key=phases.get, reverse=True)[:3])
+        self.summary.setText(f"Run time {report['run_time']:.2f}s, in steps {report['step_time']:.2f}s ({busiest})")
+        self.json_btn.setEnabled(True)
+        self.csv_btn.setEnabled(True)
+
+    def export(self, kind):
+        if not self.report:
+            return
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Export Timing Profile", f"profile.{kind}",
+            "JSON Files (*.json)" if kind == "json" else "CSV Files (*.csv)"
+        )
+        if not file_name:
+            return
+        try:
+            if kind == "json":
+                export_json(file_name, self.report)
+            else:
+                export_csv(file_name, self.report)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export profile: {str(e)}")
@@ -0,0 +1,162 @@
+import csv
+import json
+import math
+import time
+from contextlib import contextmanager, nullcontext
+
+# Where a step's time can go. "input" covers only the actual mouse/keyboard injection;
+# "other" is whatever no phase claimed (template loading, validation, step logic).
+PHASES = ["capture", "match", "input", "sleep", "debug_io", "other"]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def export_json(path, report):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=4)
+
+
+def export_csv(path, report):
+    """One row per step, slowest first"""
+    fields = ["rank", "step", "name", "type", "count", "total", "share", "mean", "p50", "p95", "max"] + [f"{phase}_total" for phase in PHASES]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for row in report["steps"]:
+            writer.writerow({key: row[key] for key in fields})
+
+
+class StepStats:
+    """Timings of every execution of one step across all loop iterations"""
+    def __init__(self, index, name, step_type):
+        self.index = index
+        self.name = name
+        self.step_type = step_type
+        self.durations = []
+        self.phases = dict.fromkeys(PHASES, 0.0)
+
+    def summary(self):
+        durations = sorted(self.durations)
+        total = sum(durations)
+        return {
+            "step": self.index + 1,
+            "name": self.name,
+            "type": self.step_type,
+            "count": len(durations),
+            "total": total,
+            "mean": total / len(durations) if durations else 0.0,
+            "p50": percentile(durations, 0.50),
+            "p95": percentile(durations, 0.95),
+            "max": durations[-1] if durations else 0.0,
+            **{f"{phase}_total": value for phase, value in self.phases.items()},
+        }
+
+
+class StepProfiler:
+    """Collects per-step wall time, split into phases, across global and nested loop iterations.
+
+    Phases are exclusive: entering a phase pauses the one around it, so
+    capture time inside an image click isn't also counted as input. Step time
+    spent outside every phase is reported as "other". If a
+    `tracer` is set, every phase is also recorded as a trace span, and
+    `on_phase(name, label, seconds)` is called with each phase's full duration.
+    """
+    def __init__(self, tracer=None):
+        self.tracer = tracer
+        self.on_phase = None
+        self.reset()
+
+    def reset(self):
+        self.steps = {}  # step index -> StepStats
+        self._current = None
+        self._stack = []  # [phase name, time it (re)started]
+        self._step_start = 0.0
+        self._attributed_before = 0.0
+        self.run_start = time.perf_counter()
+        self.run_time = 0.0
+
+    def start_step(self, index, name, step_type):
+        stats = self.steps.get(index)
+        if stats is None:
+            stats = StepStats(index, name, step_type)
+            self.steps[index] = stats
+        self._current = stats
+        self._stack = []
+        self._attributed_before = sum(stats.phases.values())
+        self._step_start = time.perf_counter()
+
+    def end_step(self):
+        if self._current is None:
+            return
+        now = time.perf_counter()
+        while self._stack:
+            name, started = self._stack.pop()
+            self._current.phases[name] += now - started
+        duration = now - self._step_start
+        attributed = sum(self._current.phases.values()) - self._attributed_before
+        self._current.phases["other"] += max(0.0, duration - attributed)
+        self._current.durations.append(duration)
+        self._current = None
+
+    @contextmanager
+    def phase(self, name, label=None):
+        """Attribute the time spent in the block to `name` for the current step.
+
+        `label` names the trace span (e.g. "ocr" for a match phase) and defaults to the phase.
+        """
+        entered = time.perf_counter()
+        with self.tracer.span(label or name, name) if self.tracer else nullcontext():
+            if self._current is None:
+                try:
+                    yield
+                finally:
+                    if self.on_phase:
+                        self.on_phase(name, label or name, time.perf_counter() - entered)
+                return
+            if self._stack:
+                outer = self._stack[-1]
+                self._current.phases[outer[0]] += entered - outer[1]
+            self._stack.append([name, entered])
+            try:
+                yield
+            finally:
+                now = time.perf_counter()
+                if self._stack and self._current is not None:
+                    inner_name, started = self._stack.pop()
+                    self._current.phases[inner_name] += now - started
+                    if self._stack:
+                        self._stack[-1][1] = now  # Resume the outer phase
+                if self.on_phase:
+                    self.on_phase(name, label or name, now - entered)
+
+    def phase_totals(self):
+        """Time per phase over all finished step executions so far (safe to call while a run is going)"""
+        totals = dict.fromkeys(PHASES, 0.0)
+        for stats in list(self.steps.values()):
+            for phase, value in list(stats.phases.items()):
+                totals[phase] += value
+        return totals
+
+    def finish(self):
+        """Mark the end of the run"""
+        self.run_time = time.perf_counter() - self.run_start
+
+    def report(self):
+        """Per-step summaries, ranked by total time"""
+        rows = sorted((stats.summary() for stats in self.steps.values()), key=lambda row: row["total"], reverse=True)
+        step_time = sum(row["total"] for row in rows)
+        for rank, row in enumerate(rows, 1):
+            row["rank"] = rank
+            row["share"] = row["total"] / step_time if step_time else 0.0
+        return {
+            "run_time": self.run_time,
+            "step_time": step_time,
+            "phase_totals": {phase: sum(row[f"{phase}_total"] for row in rows) for phase in PHASES},
+            "steps": rows,
+        }
@@ -0,0 +1,100 @@
+import time
+import threading
+from collections import deque
+
+
+class ProgressChannel:
+    """Latest-state snapshot of a workflow run, published by the executor and sampled by the GUI.
+
+    Publishing only updates a few fields under a lock, so it costs the same
+    however often the GUI looks. Per-step events go into a fixed-size ring
+    buffer instead of being sent as signals; readers fetch what they missed
+    with events_since().
+    """
+    def __init__(self, history=1000, rate_window=10.0):
+        self._lock = threading.Lock()
+        self.events = deque(maxlen=history)  # (seq, timestamp, step index, kind, detail)
+        self.rate_window = rate_window  # Seconds of history used for the recent steps/sec figure
+        # (timestamp, steps done) taken at most every tenth of the window, independent of the event ring's size
+        self.rate_samples = deque(maxlen=12)
+        self.reset()
+
+    def reset(self, total_steps=0, loop_count=1):
+        """Start a new run"""
+        with self._lock:
+            self.events.clear()
+            self.rate_samples.clear()
+            self._seq = 0
+            self._state = {
+                "running": True,
+                "started_at": time.time(),
+                "total_steps": total_steps,
+                "loop_count": loop_count,
+                "global_loop": 0,
+                "current_step": -1,
+                "step_type": "",
+                "step_name": "",
+                "loop_stack": [],  # [(start index, current iteration, iterations)] outermost first
+                "steps_done": 0,
+                "loop_iterations_done": 0,
+                "errors": 0,
+            }
+
+    def _record(self, index, kind, detail):
+        self._seq += 1
+        self.events.append((self._seq, time.time(), index, kind, detail))
+
+    def step_started(self, index, step_type, step_name, loop_stack, global_loop):
+        with self._lock:
+            self._state.update({
+                "current_step": index,
+                "step_type": step_type,
+                "step_name": step_name,
+                "global_loop": global_loop,
+                "loop_stack": [(loop["start_index"], loop["current_iter"] + 1, loop["iterations"]) for loop in loop_stack],
+            })
+
+    def step_finished(self, index, duration=None, error=None):
+        with self._lock:
+            self._state["steps_done"] += 1
+            now = time.time()
+            if not self.rate_samples or now - self.rate_samples[-1][0] >= self.rate_window / 10:
+                self.rate_samples.append((now, self._state["steps_done"]))
+            if error is not None:
+                self._state["errors"] += 1
+                self._record(index, "error", error)
+            else:
+                self._record(index, "done", duration)
+
+    def loop_iteration_finished(self, global_loop):
+        with self._lock:
+            self._state["loop_iterations_done"] = global_loop
+            self._record(-1, "loop", global_loop)
+
+    def finish(self):
+        with self._lock:
+            self._state["running"] = False
+
+    def snapshot(self):
+        """Copy of the current state, with elapsed time and throughput filled in"""
+        with self._lock:
+            state = dict(self._state)
+            now = time.time()
+            # Oldest sample still inside the window; none at all means nothing finished in it
+            since, steps_then = (now, state["steps_done"]) if self.rate_samples else (state["started_at"], 0)
+            for sample in self.rate_samples:
+                if now - sample[0] <= self.rate_window:
+                    since, steps_then = sample
+                    break
+            state["seq"] = self._seq
+        elapsed = now - state["started_at"]
+        state["elapsed"] = elapsed
+        state["steps_per_sec"] = state["steps_done"] / elapsed if elapsed > 0 else 0.0
+        span = now - since
+        state["recent_steps_per_sec"] = (state["steps_done"] - steps_then) / span if span > 0 else 0.0
+        return state
+
+    def events_since(self, seq):
+        """Events newer than `seq` that are still in the ring buffer"""
+        with self._lock:
+            return [event for event in self.events if event[0] > seq]
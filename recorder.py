@@ -1,10 +1,18 @@
 import threading
 import time
+import queue
+import math
+import logging
 import pyautogui
 import keyboard
 import mouse
 from PyQt6.QtCore import QObject, pyqtSignal
 from automation_steps import StepType
+from motion import simplify_path, flatten_path
+from vision import ScreenCapture, AnchorEncoder
+from executor import IMAGES_DIR
+
+logger = logging.getLogger(__name__)
 
 class ActionRecorder(QObject):
     """Records user actions for automation"""
@@ -12,6 +20,7 @@ class ActionRecorder(QObject):
     recording_stopped = pyqtSignal()  # Signal emitted when recording stops
     coordinate_recorded = pyqtSignal(int, int)  # Signal emitted when coordinates are recorded
     recording_armed = pyqtSignal(bool)  # Signal emitted when recording is armed/disarmed
+    anchor_scored = pyqtSignal(str, float)  # Signal emitted when a recorded anchor's uniqueness is known
 
     def __init__(self):
         super().__init__()
@@ -20,14 +29,30 @@ class ActionRecorder(QObject):
         self.is_coordinate_armed = False
         self.record_thread = None
         self.last_mouse_pos = None
-        self.last_click_time = 0
         self.key_buffer = []
         self.key_buffer_time = 0
+        self.key_buffer_start = 0
+        self.last_action_time = None  # Timestamp of the event that ended the previous step
+        self.key_flush_delay = 1.0  # Seconds of keyboard inactivity before buffered text becomes a step
+        self.press = None  # (timestamp, button) of the mouse button currently held down
+        self.pending_click = None  # (params, press_time, release_time) of a click that may become a double-click
+        self.double_click_window = 0.5  # Seconds after a click during which a second press can make it a double-click
+        self.drag_points = []  # Pointer positions seen while a button is held
+        self.drag_threshold = 8  # Pixels the pointer must travel while held for a press to count as a drag
+        self.path_epsilon = 2.0  # Ramer-Douglas-Peucker tolerance (pixels) for recorded drag paths
+        self.capture_anchors = False  # Grab an image anchor around each recorded click
+        self.press_frame = None  # Screen captured when the current button went down
+        self.capture = ScreenCapture()
+        self.anchors = AnchorEncoder(IMAGES_DIR, on_scored=self.anchor_scored.emit)
+        # Raw (timestamp, kind, event) tuples pushed by the OS hooks and consumed by the record thread
+        self.events = queue.SimpleQueue()
 
     def start_recording(self):
         """Start recording user actions"""
         if not self.is_recording:
             self.is_recording = True
+            self.events = queue.SimpleQueue()
+            self.last_action_time = None
             self.record_thread = threading.Thread(target=self._record_loop)
             self.record_thread.daemon = True
             self.record_thread.start()
@@ -35,6 +60,7 @@ class ActionRecorder(QObject):
     def stop_recording(self):
         """Stop recording user actions"""
         self.is_recording = False
+        self.events.put((time.perf_counter(), "stop", None))  # Wake the record thread
         if self.record_thread:
             self.record_thread.join()
         self.recording_stopped.emit()
@@ -66,26 +92,54 @@ class ActionRecorder(QObject):
             self.coordinate_recorded.emit(x, y)
 
     def _record_loop(self):
-        """Main recording loop"""
+        """Consume hook events and turn them into steps"""
         # Initialize listeners
         keyboard.hook(self._on_keyboard_event)
         mouse.hook(self._on_mouse_event)
 
-        while self.is_recording:
-            # Process any buffered keyboard input
-            current_time = time.time()
-            if self.key_buffer and (current_time - self.key_buffer_time) > 1.0:
-                self._flush_key_buffer()
-            time.sleep(0.01)
+        try:
+            while True:
+                # Block until the next event, or until buffered text is due to be flushed
+                timeout = None
+                if self.key_buffer:
+                    timeout = max(0, self.key_buffer_time + self.key_flush_delay - time.perf_counter())
+                elif self.pending_click and not self.press:
+                    timeout = max(0, self.pending_click[2] + self.double_click_window - time.perf_counter())
+                try:
+                    timestamp, kind, event = self.events.get(timeout=timeout)
+                except queue.Empty:
+                    self._flush_key_buffer()
+                    self._flush_pending_click()
+                    continue
 
-        # Clean up
-        keyboard.unhook_all()
-        mouse.unhook_all()
+                if kind == "stop":
+                    break
+                elif kind == "key":
+                    self._process_keyboard_event(timestamp, event)
+                elif kind == "mouse":
+                    self._process_mouse_event(timestamp, event)
+        finally:
+            # Clean up
+            keyboard.unhook_all()
+            mouse.unhook_all()
+            self._flush_pending_click()
+            self._flush_key_buffer()
 
     def _on_keyboard_event(self, event):
-        """Handle keyboard events"""
-        if not self.is_recording or not event.event_type == keyboard.KEY_DOWN:
+        """Keyboard hook: timestamp and enqueue only, never block the OS hook thread"""
+        if self.is_recording:
+            self.events.put((time.perf_counter(), "key", event))
+
+    def _on_mouse_event(self, event):
+        """Mouse hook: timestamp and enqueue only, never block the OS hook thread"""
+        if self.is_recording:
+            self.events.put((time.perf_counter(), "mouse", event))
+
+    def _process_keyboard_event(self, timestamp, event):
+        """Handle a queued keyboard event"""
+        if event.event_type != keyboard.KEY_DOWN:
             return
+        self._flush_pending_click()  # Typing ends any double-click
 
         # Special keys handling
         special_keys = {
@@ -103,63 +157,175 @@ class ActionRecorder(QObject):
 
         if event.name in special_keys:
             self._flush_key_buffer()  # Flush any pending regular text
-            self.action_recorded.emit(StepType.KEYBOARD_SPECIAL, {
+            self._emit_step(StepType.KEYBOARD_SPECIAL, {
                 "name": f"Press {special_keys[event.name]}",
+                "key": special_keys[event.name],
                 "special_key": special_keys[event.name]
-            })
+            }, timestamp)
         else:
             # Buffer regular keystrokes
-            if event.name.isalnum() or event.name in ['.', '/', '-', ' ']:
+            if event.name and (event.name.isalnum() or event.name in ['.', '/', '-', ' ']):
+                if not self.key_buffer:
+                    self.key_buffer_start = timestamp
                 self.key_buffer.append(event.name)
-                self.key_buffer_time = time.time()
+                self.key_buffer_time = timestamp
 
-    def _on_mouse_event(self, event):
-        """Handle mouse events"""
-        if not self.is_recording:
+    def _process_mouse_event(self, timestamp, event):
+        """Handle a queued mouse event"""
+        # Track pointer position from move events so clicks don't need to query it
+        if isinstance(event, mouse.MoveEvent):
+            self.last_mouse_pos = (event.x, event.y)
+            if self.press:
+                self.drag_points.append(self.last_mouse_pos)
             return
 
-        current_time = time.time()
-        
-        # Handle clicks
-        if hasattr(event, 'button') and event.button in [mouse.LEFT, mouse.RIGHT]:
-            # Avoid duplicate events
-            if current_time - self.last_click_time < 0.1:
-                return
-                
-            self.last_click_time = current_time
-            # Get current mouse position using pyautogui
-            x, y = pyautogui.position()
-            
-            # Flush any pending keyboard input
-            self._flush_key_buffer()
-            
-            self.action_recorded.emit(StepType.MOUSE_CLICK, {
+        # Clicks and drags are resolved on release, once we know whether the pointer moved
+        if isinstance(event, mouse.ButtonEvent) and event.button in [mouse.LEFT, mouse.RIGHT]:
+            # On Windows the hook reports the second press of a double-click as DOUBLE rather than DOWN
+            if event.event_type in (mouse.DOWN, mouse.DOUBLE):
+                # Flush any pending keyboard input
+                self._flush_key_buffer()
+                self.press = (timestamp, event.button)
+                self.drag_points = [self.last_mouse_pos or mouse.get_position()]
+                # Capture before the application reacts to the press (hover/pressed states aside)
+                self.press_frame = self._grab_press_frame() if self.capture_anchors else None
+            elif event.event_type == mouse.UP and self.press and self.press[1] == event.button:
+                self._finish_press(timestamp)
+
+    def _finish_press(self, timestamp):
+        """Emit a click or drag step for the button press that just ended"""
+        press_time, button = self.press
+        points = self.drag_points
+        self.press = None
+        self.drag_points = []
+        button = "right" if button == mouse.RIGHT else "left"
+        x, y = points[0]
+
+        travelled = max(math.hypot(px - x, py - y) for px, py in points)
+        if travelled < self.drag_threshold:
+            params = {
                 "name": f"Click at ({x}, {y})",
                 "click_type": "coordinates",
+                "button": button,
                 "x": x,
                 "y": y
-            })
+            }
+            if self._merge_double_click(params, press_time, timestamp):
+                return
+            self._flush_pending_click()
+            anchor = self._make_anchor(x, y)
+            if anchor:
+                params["anchor"] = anchor
+            # Held back briefly in case a second press turns it into a double-click
+            self.pending_click = (params, press_time, timestamp)
+            return
 
-        # Handle moves to update position tracking if needed, or just pass
-        elif hasattr(event, 'dx') or hasattr(event, 'dy'):
-            pass
+        # Drags are replayed by coordinates, so the anchor frame isn't needed
+        self.press_frame = None
+        self._flush_pending_click()
+
+        # Drop consecutive duplicates before simplifying
+        path = [points[0]]
+        for point in points[1:]:
+            if point != path[-1]:
+                path.append(point)
+        path = simplify_path(path, self.path_epsilon)
+        end_x, end_y = path[-1]
+        self._emit_step(StepType.MOUSE_DRAG, {
+            "name": f"Drag ({x}, {y}) to ({end_x}, {end_y})",
+            "button": button,
+            "path": flatten_path(path),
+            "duration": round(timestamp - press_time, 3)
+        }, press_time, timestamp)
+
+    def _merge_double_click(self, params, press_time, release_time):
+        """Turn the pending click into a double-click if this click quickly repeats it; returns whether it did"""
+        if self.pending_click is None:
+            return False
+        first, first_press, first_release = self.pending_click
+        if press_time - first_release > self.double_click_window:
+            return False
+        if first["button"] != params["button"]:
+            return False
+        if math.hypot(params["x"] - first["x"], params["y"] - first["y"]) >= self.drag_threshold:
+            return False
+        self.pending_click = None
+        self.press_frame = None
+        first.update({
+            "name": f"Double-click at ({first['x']}, {first['y']})",
+            "clicks": 2,
+            "click_interval": round(press_time - first_release, 3),  # The real gap between the two clicks
+        })
+        self._emit_step(StepType.MOUSE_CLICK, first, first_press, release_time)
+        return True
+
+    def _flush_pending_click(self):
+        """Emit the click held back for double-click detection, if any"""
+        if self.pending_click is not None:
+            params, press_time, release_time = self.pending_click
+            self.pending_click = None
+            self._emit_step(StepType.MOUSE_CLICK, params, press_time, release_time)
+
+    def _grab_press_frame(self):
+        """Capture the screen for anchoring the click that just started"""
+        try:
+            return self.capture.grab()
+        except Exception as e:
+            logger.error("Error capturing anchor frame: %s", e)
+            return None
+
+    def _make_anchor(self, x, y):
+        """Hand the patch around a click to the anchor encoder and describe it for the step"""
+        frame, self.press_frame = self.press_frame, None
+        if frame is None:
+            return None
+        submitted = self.anchors.submit(frame, x, y)
+        if submitted is None:
+            return None
+        path, hint, offset = submitted
+        return {
+            "image_path": path,
+            "hint": hint,
+            "offset": offset,
+            "size": self.anchors.size,
+            "search_margin": self.anchors.search_margin,
+            "score": self.anchors.scores.get(path)  # None until the encoder has scored it
+        }
+
+    def _emit_step(self, step_type, params, start_time, end_time=None):
+        """Emit a recorded step, storing the real gap since the previous step as recorded_delay"""
+        if self.last_action_time is not None:
+            params["recorded_delay"] = round(max(0, start_time - self.last_action_time), 3)
+        else:
+            params["recorded_delay"] = 0
+        self.last_action_time = end_time if end_time is not None else start_time
+        self.action_recorded.emit(step_type, params)
 
     def _flush_key_buffer(self):
         """Flush the keyboard buffer as a typing action"""
         if self.key_buffer:
             text = ''.join(self.key_buffer)
-            self.action_recorded.emit(StepType.KEYBOARD_TYPE, {
+            self._emit_step(StepType.KEYBOARD_TYPE, {
                 "name": f"Type '{text}'",
                 "text": text,
                 "delay": 10  # Default delay between keystrokes
-            })
+            }, self.key_buffer_start, self.key_buffer_time)
             self.key_buffer = []
 
-    def take_screenshot(self, x, y, width, height):
+    @staticmethod
+    def take_screenshot(x, y, width, height):
         """Take a screenshot of a specific region"""
         try:
             screenshot = pyautogui.screenshot(region=(x, y, width, height))
             return screenshot
         except Exception as e:
             print(f"Error taking screenshot: {e}")
-            return None 
\ No newline at end of file
+            return None 
+
+    def sample_color(self, x, y):
+        """Return the colour of the pixel at (x, y) as '#rrggbb', or None on failure"""
+        screenshot = self.take_screenshot(x, y, 1, 1)
+        if screenshot is None:
+            return None
+        r, g, b = screenshot.convert("RGB").getpixel((0, 0))
+        return f"#{r:02x}{g:02x}{b:02x}"
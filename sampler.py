@@ -0,0 +1,104 @@
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter
+
+
+def frame_label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler:
+    """Low-overhead sampling profiler for one thread.
+
+    A background thread reads the target thread's current stack every
+    `interval` seconds; nothing runs on the target thread itself. Each
+    sample is prefixed with the label returned by `tag` (e.g. the step being
+    executed), so the flame graph splits by step. save() writes collapsed
+    stacks (for flamegraph.pl or speedscope) and a JSON summary.
+    """
+    def __init__(self, thread_id, interval=0.005, tag=None, max_depth=64):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.tag = tag
+        self.max_depth = max_depth
+        self.stacks = Counter()  # "tag;outer;...;inner" -> samples
+        self.samples = 0
+        self.started_at = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.duration = time.time() - self.started_at
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            del frame
+            stack.reverse()
+            if self.tag is not None:
+                stack.insert(0, self.tag().replace(";", ","))  # ";" separates frames
+            self.stacks[";".join(stack)] += 1
+            self.samples += 1
+
+    def summary(self, top=20):
+        """Sample counts per tag and the functions most often on top of the stack"""
+        per_tag = Counter()
+        self_time = Counter()
+        tag_self_time = {}
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            tag = frames[0] if self.tag is not None else None
+            leaf = frames[-1]
+            self_time[leaf] += count
+            if tag is not None:
+                per_tag[tag] += count
+                tag_self_time.setdefault(tag, Counter())[leaf] += count
+        return {
+            "samples": self.samples,
+            "interval": self.interval,
+            "duration": self.duration,
+            "top_functions": self_time.most_common(top),
+            "by_tag": [
+                {"tag": tag, "samples": count, "top_functions": tag_self_time[tag].most_common(5)}
+                for tag, count in per_tag.most_common()
+            ],
+        }
+
+    def save(self, directory, name=None):
+        """Write `<name>.folded` and `<name>.json` into `directory` and return their paths"""
+        name = name or f"sample_profile_{time.strftime('%Y%m%d_%H%M%S')}"
+        folded_path = os.path.join(directory, f"{name}.folded")
+        with open(folded_path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        summary_path = os.path.join(directory, f"{name}.json")
+        with open(summary_path, "w") as f:
+            json.dump(self.summary(), f, indent=4)
+        return folded_path, summary_path
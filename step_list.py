@@ -0,0 +1,326 @@
+import json
+
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView, QDialog
+from PyQt6.QtCore import Qt, QEvent, QAbstractListModel, QModelIndex, QMimeData, QRect, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPen
+from automation_steps import StepType, STEP_DIALOGS
+
+# Step Colors
+STEP_COLORS = {
+    StepType.MOUSE_CLICK: "#4da6ff",     # Blue
+    StepType.KEYBOARD_TYPE: "#66ff66",   # Green
+    StepType.KEYBOARD_SPECIAL: "#00cc99", # Teal
+    StepType.WAIT: "#ffcc00",            # Orange
+    StepType.LOOP_START: "#cc66ff",      # Purple
+    StepType.LOOP_END: "#cc66ff",        # Purple
+    StepType.CLICK_TEXT: "#66ccff",      # Light blue
+    StepType.WAIT_TEXT: "#ff9966",       # Salmon
+    StepType.WAIT_COLOR: "#ff66aa",      # Pink
+    StepType.MOUSE_DRAG: "#3399cc"       # Steel blue
+}
+
+# Step type icons
+STEP_ICONS = {
+    StepType.MOUSE_CLICK: "🖱️",
+    StepType.KEYBOARD_TYPE: "⌨️",
+    StepType.KEYBOARD_SPECIAL: "🔣",
+    StepType.WAIT: "⏱️",
+    StepType.LOOP_START: "🔄",
+    StepType.LOOP_END: "↩️",
+    StepType.CLICK_TEXT: "🔤",
+    StepType.WAIT_TEXT: "👁️",
+    StepType.WAIT_COLOR: "🎨",
+    StepType.MOUSE_DRAG: "✋"
+}
+
+# Model roles
+StepTypeRole = Qt.ItemDataRole.UserRole + 1
+ParamsRole = Qt.ItemDataRole.UserRole + 2
+DetailRole = Qt.ItemDataRole.UserRole + 3
+
+STEP_MIME_TYPE = "application/x-automation-step-rows"
+ROW_HEIGHT = 44
+
+
+def step_detail(step_type, params):
+    """Short detail text shown on the right of a step row"""
+    if step_type == StepType.MOUSE_CLICK:
+        return f"({params.get('x', '?')}, {params.get('y', '?')})"
+    if step_type == StepType.WAIT:
+        return f"{params.get('duration', 1)}s"
+    if step_type == StepType.LOOP_START:
+        return f"x{params.get('iterations', 1)}"
+    if step_type == StepType.WAIT_COLOR:
+        return f"{len(params.get('points', []))} px"
+    if step_type in [StepType.CLICK_TEXT, StepType.WAIT_TEXT]:
+        return f"\"{params.get('text', '')}\""
+    if step_type == StepType.MOUSE_DRAG:
+        path = params.get("path", [])
+        return f"({', '.join(map(str, path[:2]))}) → ({', '.join(map(str, path[-2:]))})"
+    return ""
+
+
+class StepListModel(QAbstractListModel):
+    """Workflow steps as plain {"type", "params"} dicts, the same shape as the saved workflow file"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._steps = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._steps)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        step = self._steps[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return step["params"].get("name", "")
+        if role == StepTypeRole:
+            return step["type"]
+        if role == ParamsRole:
+            return step["params"]
+        if role == DetailRole:
+            return step_detail(step["type"], step["params"])
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index) | Qt.ItemFlag.ItemIsDropEnabled
+        if index.isValid():
+            flags |= Qt.ItemFlag.ItemIsDragEnabled
+        return flags
+
+    def step(self, row):
+        """The {"type", "params"} dict for a row"""
+        return self._steps[row]
+
+    def steps(self):
+        """All steps, in order. The dicts are shared with the model, as the executor's were with the old widgets."""
+        return list(self._steps)
+
+    def set_steps(self, steps):
+        """Replace all steps with one model reset"""
+        self.beginResetModel()
+        self._steps = [{"type": step["type"], "params": step["params"]} for step in steps]
+        self.endResetModel()
+
+    def add_step(self, step_type, params):
+        row = len(self._steps)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._steps.append({"type": step_type, "params": params})
+        self.endInsertRows()
+        return row
+
+    def update_params(self, row, new_params):
+        """Merge new parameters into a step and repaint its row"""
+        self._steps[row]["params"].update(new_params)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row + count > len(self._steps):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._steps[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def moveRows(self, source_parent, source_row, count, destination_parent, destination_child):
+        if source_parent.isValid() or destination_parent.isValid():
+            return False
+        if source_row <= destination_child <= source_row + count:
+            return False  # Dropped onto itself
+        if not self.beginMoveRows(source_parent, source_row, source_row + count - 1, destination_parent, destination_child):
+            return False
+        moving = self._steps[source_row:source_row + count]
+        del self._steps[source_row:source_row + count]
+        if destination_child > source_row:
+            destination_child -= count
+        self._steps[destination_child:destination_child] = moving
+        self.endMoveRows()
+        return True
+
+    # Drag-and-drop reordering moves rows in place; steps are never copied through the clipboard format
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def mimeTypes(self):
+        return [STEP_MIME_TYPE]
+
+    def mimeData(self, indexes):
+        data = QMimeData()
+        rows = sorted({index.row() for index in indexes if index.isValid()})
+        data.setData(STEP_MIME_TYPE, json.dumps(rows).encode())
+        return data
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if action != Qt.DropAction.MoveAction or not data.hasFormat(STEP_MIME_TYPE):
+            return False
+        if row < 0:
+            row = parent.row() if parent.isValid() else len(self._steps)
+        rows = json.loads(bytes(data.data(STEP_MIME_TYPE)).decode())
+        if rows:
+            # Single selection, so the dragged rows are always one contiguous block
+            self.moveRows(QModelIndex(), rows[0], len(rows), QModelIndex(), row)
+        # Returning False stops the view from also deleting the source rows
+        return False
+
+
+class StepDelegate(QStyledItemDelegate):
+    """Paints a step row (accent, icon, name, type, detail, Edit/Delete) without creating widgets"""
+    edit_requested = pyqtSignal(int)
+    delete_requested = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont()
+        self.name_font.setPointSize(9)
+        self.name_font.setBold(True)
+        self.small_font = QFont()
+        self.small_font.setPointSize(8)
+        self.button_font = QFont()
+        self.button_font.setPointSize(9)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def _button_rects(self, rect):
+        """(edit, delete) button rectangles for a row"""
+        height = rect.height() - 16
+        delete_rect = QRect(rect.right() - 84, rect.top() + 8, 78, height)
+        edit_rect = QRect(delete_rect.left() - 68, rect.top() + 8, 62, height)
+        return edit_rect, delete_rect
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        step_type = index.data(StepTypeRole)
+        step_color = QColor(STEP_COLORS.get(step_type, "#e0e0e0"))
+
+        # Frame with coloured left accent
+        background = "#2d2d2d"
+        if option.state & QStyle.StateFlag.State_Selected:
+            background = "#0d3a5c"
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            background = "#353535"
+        painter.setPen(QPen(QColor("#3d3d3d")))
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.fillRect(QRect(rect.left(), rect.top(), 5, rect.height()), step_color)
+
+        # Reorder handle and icon
+        x = rect.left() + 10
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("#666666"))
+        painter.drawText(QRect(x, rect.top(), 14, rect.height()), Qt.AlignmentFlag.AlignVCenter, "⋮⋮")
+        x += 18
+        painter.setPen(QColor("#e0e0e0"))
+        painter.drawText(QRect(x, rect.top(), 24, rect.height()), Qt.AlignmentFlag.AlignVCenter, STEP_ICONS.get(step_type, "❓"))
+        x += 28
+
+        # Buttons and detail are laid out from the right
+        edit_rect, delete_rect = self._button_rects(option.rect)
+        detail = index.data(DetailRole)
+        detail_width = 0
+        if detail:
+            painter.setFont(self.small_font)
+            detail_width = min(painter.fontMetrics().horizontalAdvance(detail) + 8, 200)
+            detail_rect = QRect(edit_rect.left() - detail_width - 6, rect.top(), detail_width, rect.height())
+            painter.setPen(QColor("#aaaaaa"))
+            painter.drawText(detail_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight,
+                             painter.fontMetrics().elidedText(detail, Qt.TextElideMode.ElideRight, detail_width))
+
+        # Name and coloured type
+        text_width = max(0, edit_rect.left() - detail_width - 12 - x)
+        half = rect.height() // 2
+        painter.setFont(self.name_font)
+        painter.setPen(QColor("#e0e0e0"))
+        name = painter.fontMetrics().elidedText(index.data() or "", Qt.TextElideMode.ElideRight, text_width)
+        painter.drawText(QRect(x, rect.top() + 2, text_width, half), Qt.AlignmentFlag.AlignBottom, name)
+        painter.setFont(self.small_font)
+        painter.setPen(step_color)
+        painter.drawText(QRect(x, rect.top() + half, text_width, half - 2), Qt.AlignmentFlag.AlignTop, step_type or "")
+
+        # Edit/Delete buttons
+        painter.setFont(self.button_font)
+        for button_rect, label in [(edit_rect, "✏️ Edit"), (delete_rect, "🗑️ Delete")]:
+            painter.setPen(QPen(QColor("#4d4d4d")))
+            painter.setBrush(QColor("#3a3a3a"))
+            painter.drawRoundedRect(button_rect, 3, 3)
+            painter.setPen(QColor("#e0e0e0"))
+            painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, label)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            edit_rect, delete_rect = self._button_rects(option.rect)
+            position = event.position().toPoint()
+            if edit_rect.contains(position):
+                self.edit_requested.emit(index.row())
+                return True
+            if delete_rect.contains(position):
+                self.delete_requested.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class StepListView(QListView):
+    """Workflow step list. Rows are painted by StepDelegate, so only visible rows cost anything."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.step_model = StepListModel(self)
+        self.setModel(self.step_model)
+        self.delegate = StepDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.delegate.edit_requested.connect(self.edit_step)
+        self.delegate.delete_requested.connect(self.delete_step)
+        self.doubleClicked.connect(lambda index: self.edit_step(index.row()))
+
+        # Every row has the same height, so the view never measures rows it doesn't show
+        self.setUniformItemSizes(True)
+        self.setMouseTracking(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        self.setDefaultDropAction(Qt.DropAction.MoveAction)
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(True)
+
+    def count(self):
+        return self.step_model.rowCount()
+
+    def step(self, row):
+        return self.step_model.step(row)
+
+    def steps(self):
+        return self.step_model.steps()
+
+    def set_steps(self, steps):
+        self.step_model.set_steps(steps)
+
+    def add_step(self, step_type, params):
+        row = self.step_model.add_step(step_type, params)
+        self.scrollTo(self.step_model.index(row))
+        return row
+
+    def update_params(self, row, new_params):
+        self.step_model.update_params(row, new_params)
+
+    def clear(self):
+        self.step_model.set_steps([])
+
+    def current_row(self):
+        """Row of the selected step, or -1"""
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def edit_step(self, row):
+        step = self.step_model.step(row)
+        if step["type"] in STEP_DIALOGS:
+            # Pass the current parameters to the dialog
+            dialog = STEP_DIALOGS[step["type"]](params=step["params"].copy())
+            if dialog.exec() == QDialog.DialogCode.Accepted:
+                self.step_model.update_params(row, dialog.get_params())
+
+    def delete_step(self, row):
+        self.step_model.removeRows(row, 1)
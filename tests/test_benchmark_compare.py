@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("cv2")
+
+from benchmarks.suite import compare, metric
+
+
+def results(**values):
+    return {"results": values}
+
+
+def test_lower_is_better_regression():
+    rows = compare(results(a=metric(12.0, "ms")), results(a=metric(10.0, "ms")), threshold=0.1)
+    name, base, value, change, regressed = rows[0]
+    assert (name, base, value) == ("a", 10.0, 12.0)
+    assert round(change, 2) == 0.2
+    assert regressed
+
+
+def test_higher_is_better_regression():
+    rows = compare(
+        results(rate=metric(80.0, "steps/s", "higher")),
+        results(rate=metric(100.0, "steps/s", "higher")),
+        threshold=0.1,
+    )
+    assert rows[0][4]
+
+
+def test_improvement_and_small_change_are_not_regressions():
+    rows = compare(
+        results(a=metric(5.0, "ms"), b=metric(10.5, "ms")),
+        results(a=metric(10.0, "ms"), b=metric(10.0, "ms")),
+        threshold=0.1,
+    )
+    assert [row[4] for row in rows] == [False, False]
+
+
+def test_metrics_missing_from_baseline_or_zero_are_skipped():
+    rows = compare(
+        results(new=metric(1.0, "ms"), zero=metric(1.0, "ms")),
+        results(zero=metric(0.0, "ms")),
+        threshold=0.1,
+    )
+    assert rows == []
@@ -0,0 +1,42 @@
+from metrics import RunMetrics
+
+
+def test_render_empty_is_valid_openmetrics():
+    text = RunMetrics().render()
+    assert text.endswith("# EOF\n")
+    assert "automation_step_errors_total" not in text
+
+
+def test_render_gauges_and_counters():
+    metrics = RunMetrics(lambda: {
+        "automation_running": ("1 while a workflow is running", 1),
+        "automation_steps_total": ("Steps executed", 42),
+        "automation_rss_bytes": ("Resident memory", None),
+    })
+    lines = metrics.render().splitlines()
+    assert "# TYPE automation_running gauge" in lines
+    assert "automation_running 1" in lines
+    assert "# TYPE automation_steps counter" in lines
+    assert "automation_steps_total 42" in lines
+    # Gauges without a value are left out
+    assert not any("automation_rss_bytes" in line for line in lines)
+
+
+def test_render_errors_escape_labels():
+    metrics = RunMetrics()
+    metrics.count_error(3, 'Click "OK"')
+    metrics.count_error(3, 'Click "OK"')
+    assert 'automation_step_errors_total{step="3",name="Click \\"OK\\""} 2' in metrics.render()
+
+
+def test_render_histogram_buckets_are_cumulative():
+    metrics = RunMetrics()
+    for seconds in [0.001, 0.02, 0.02, 20.0]:
+        metrics.observe("match", "template", seconds)
+    lines = metrics.render().splitlines()
+    prefix = 'automation_phase_latency_seconds_bucket{phase="match",kind="template",le="'
+    assert prefix + '0.005"} 1' in lines
+    assert prefix + '0.025"} 3' in lines
+    assert prefix + '10.0"} 3' in lines
+    assert prefix + '+Inf"} 4' in lines
+    assert 'automation_phase_latency_seconds_count{phase="match",kind="template"} 4' in lines
@@ -0,0 +1,34 @@
+from motion import simplify_path, flatten_path, unflatten_path
+
+
+def test_simplify_path_keeps_short_paths():
+    assert simplify_path([(0, 0), (5, 5)]) == [(0, 0), (5, 5)]
+
+
+def test_simplify_path_drops_collinear_points():
+    points = [(x, 0) for x in range(100)]
+    assert simplify_path(points) == [(0, 0), (99, 0)]
+
+
+def test_simplify_path_keeps_corners():
+    points = [(x, 0) for x in range(50)] + [(49, y) for y in range(1, 50)]
+    assert simplify_path(points) == [(0, 0), (49, 0), (49, 49)]
+
+
+def test_simplify_path_ignores_jitter_within_epsilon():
+    points = [(0, 0), (10, 1), (20, -1), (30, 0)]
+    assert simplify_path(points, epsilon=2.0) == [(0, 0), (30, 0)]
+
+
+def test_simplify_path_handles_long_drags():
+    # Iterative, so a long zigzag can't hit the recursion limit
+    points = [(x, (x % 2) * 10) for x in range(1000)]
+    simplified = simplify_path(points)
+    assert simplified[0] == points[0] and simplified[-1] == points[-1]
+    assert len(simplified) > 900
+
+
+def test_flatten_round_trip():
+    points = [(1, 2), (3, 4)]
+    assert flatten_path(points) == [1, 2, 3, 4]
+    assert unflatten_path(flatten_path(points)) == points
@@ -0,0 +1,34 @@
+import time
+
+from profiler import PHASES, StepProfiler, percentile
+
+
+def test_percentile_empty():
+    assert percentile([], 0.5) == 0.0
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.95) == 95
+    assert percentile(values, 1.0) == 100
+
+
+def test_percentile_clamps_fraction():
+    values = [1.0, 2.0, 3.0]
+    assert percentile(values, 0.0) == 1.0
+    assert percentile(values, 2.0) == 3.0
+
+
+def test_unclaimed_step_time_is_other():
+    profiler = StepProfiler()
+    profiler.start_step(0, "Click", "Mouse Click")
+    time.sleep(0.02)
+    with profiler.phase("input"):
+        time.sleep(0.02)
+    profiler.end_step()
+    row = profiler.report()["steps"][0]
+    assert row["input_total"] >= 0.02
+    assert row["other_total"] >= 0.02
+    phase_sum = sum(row[f"{phase}_total"] for phase in PHASES)
+    assert abs(phase_sum - row["total"]) < 1e-9
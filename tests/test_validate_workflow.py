@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+pytest.importorskip("cv2")
+pytest.importorskip("pyautogui")
+
+from automation_steps import StepType
+from executor import validate_workflow
+
+
+def click(**params):
+    return {"type": StepType.MOUSE_CLICK, "params": {"click_type": "coordinates", "x": 1, "y": 1, **params}}
+
+
+def loop_start(iterations=2):
+    return {"type": StepType.LOOP_START, "params": {"iterations": iterations}}
+
+
+def loop_end():
+    return {"type": StepType.LOOP_END, "params": {}}
+
+
+def test_valid_workflow_has_no_problems():
+    assert validate_workflow([loop_start(), click(), loop_end()]) == []
+
+
+def test_unbalanced_loops():
+    problems = validate_workflow([loop_end(), loop_start()])
+    assert problems == [
+        (0, "Loop End without a matching Loop Start"),
+        (1, "Loop Start without a matching Loop End"),
+    ]
+
+
+def test_bad_loop_count():
+    problems = validate_workflow([loop_start(0), loop_end()])
+    assert [index for index, _ in problems] == [0]
+
+
+def test_unknown_type_and_missing_params():
+    problems = validate_workflow([{"type": "Teleport", "params": {}}, {"type": StepType.WAIT}])
+    assert problems == [(0, "Unknown step type: Teleport"), (1, "Step has no parameters")]
+
+
+def test_missing_image_reported_once_per_step(tmp_path):
+    missing = str(tmp_path / "missing.png")
+    problems = validate_workflow([click(click_type="image", image_path=missing)] * 2)
+    assert problems == [(0, "Image file not found: missing.png"), (1, "Image file not found: missing.png")]
+
+
+def test_short_drag_and_empty_colour_wait():
+    problems = validate_workflow([
+        {"type": StepType.MOUSE_DRAG, "params": {"path": [0, 0]}},
+        {"type": StepType.WAIT_COLOR, "params": {"points": []}},
+    ])
+    assert problems == [(0, "Drag path needs at least two points"), (1, "No pixels specified")]
@@ -0,0 +1,119 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+
+# Shared no-op context for disabled tracing, so an untraced span costs one attribute check
+_NO_SPAN = nullcontext()
+
+
+class TraceRecorder:
+    """Collects Chrome trace events (the JSON format chrome://tracing and Perfetto load).
+
+    Spans become complete ("X") events when they fit in one block, or
+    begin/end ("B"/"E") pairs when they open and close in different places,
+    such as steps and loop iterations. Events carry the recording thread's id,
+    so background writers show up as their own tracks next to the executor.
+    Recording is off until `enabled` is set. At most `max_events` are kept
+    (roughly 75 MB, several minutes of a busy run); later events are counted in `dropped`.
+    """
+    def __init__(self, enabled=False, max_events=200_000):
+        self.enabled = enabled
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._open = {}  # thread id -> [(name, category)] of unclosed begin events
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.events = []
+            self.dropped = 0
+            self._open = {}
+            self._threads = set()
+        self._pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    def _now(self):
+        return (time.perf_counter() - self._origin) * 1_000_000  # Microseconds since reset
+
+    def _add(self, event):
+        tid = threading.get_ident()
+        event["pid"] = self._pid
+        event["tid"] = tid
+        with self._lock:
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            if tid not in self._threads:
+                self._threads.add(tid)
+                self.events.append({
+                    "name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                })
+            self.events.append(event)
+
+    def span(self, name, category="executor", **args):
+        """Context manager recording the block as one complete event"""
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, category, args)
+
+    @contextmanager
+    def _span(self, name, category, args):
+        start = self._now()
+        try:
+            yield
+        finally:
+            event = {"name": name, "cat": category, "ph": "X", "ts": start, "dur": self._now() - start}
+            if args:
+                event["args"] = args
+            self._add(event)
+
+    def begin(self, name, category="executor", **args):
+        """Open a span that is closed later by end() on the same thread"""
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": category, "ph": "B", "ts": self._now()}
+        if args:
+            event["args"] = args
+        self._open.setdefault(threading.get_ident(), []).append((name, category))
+        self._add(event)
+
+    def end(self, **args):
+        """Close the innermost span opened by begin() on this thread"""
+        if not self.enabled:
+            return
+        stack = self._open.get(threading.get_ident())
+        if not stack:
+            return
+        name, category = stack.pop()
+        event = {"name": name, "cat": category, "ph": "E", "ts": self._now()}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def instant(self, name, category="signal", **args):
+        """Record a point in time, e.g. a signal emission"""
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": category, "ph": "i", "s": "t", "ts": self._now()}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    def save(self, path):
+        """Write the trace, closing any spans a stopped run left open"""
+        now = self._now()
+        with self._lock:
+            events = list(self.events)
+            for tid, stack in self._open.items():
+                for name, category in reversed(stack):
+                    events.append({"name": name, "cat": category, "ph": "E", "ts": now, "pid": self._pid, "tid": tid})
+        with open(path, "w") as f:
+            json.dump({
+                "traceEvents": events,
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": self.dropped},
+            }, f)
+        return path
@@ -0,0 +1,500 @@
+import os
+import time
+import queue
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+
+import cv2
+import numpy as np
+import pyautogui
+
+logger = logging.getLogger(__name__)
+
+# Try importing mss for fast region capture, but don't fail if not available
+try:
+    import mss
+    MSS_AVAILABLE = True
+except ImportError:
+    MSS_AVAILABLE = False
+
+
+class FramePool:
+    """Owns one reusable buffer per (resolution, view) so captures don't allocate per lookup.
+
+    Region captures come in many sizes, so only the `max_buffers` most
+    recently used buffers are kept; the rest are released.
+    """
+    def __init__(self, max_buffers=16):
+        self._buffers = OrderedDict()
+        self.max_buffers = max_buffers
+
+    def get(self, name, shape, dtype=np.uint8):
+        """Return the preallocated buffer for `name` at `shape`, creating it on first use"""
+        key = (name, shape)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[key] = buffer
+            while len(self._buffers) > self.max_buffers:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(key)
+        return buffer
+
+    def clear(self):
+        """Drop all buffers (e.g. after a resolution change)"""
+        self._buffers.clear()
+
+
+class Frame:
+    """A captured screen image with lazily computed, cached derived views.
+
+    The pixel data lives in buffers owned by a FramePool and is overwritten by the
+    next capture at the same resolution, so a Frame is only valid until then.
+    Call copy() on anything that has to outlive the current lookup.
+    """
+    def __init__(self, rgb, pool, origin=(0, 0)):
+        self.rgb = rgb
+        self.pool = pool
+        self.origin = origin  # Screen coordinates of the top-left pixel
+        self._views = {}
+
+    @property
+    def width(self):
+        return self.rgb.shape[1]
+
+    @property
+    def height(self):
+        return self.rgb.shape[0]
+
+    def gray(self):
+        """Grayscale view of the frame"""
+        view = self._views.get("gray")
+        if view is None:
+            dst = self.pool.get("gray", self.rgb.shape[:2])
+            view = cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY, dst=dst)
+            self._views["gray"] = view
+        return view
+
+    def binary(self, blur=False):
+        """Otsu-binarised grayscale view, optionally blurred first to suppress noise"""
+        key = "binary_blur" if blur else "binary"
+        view = self._views.get(key)
+        if view is None:
+            source = self.gray()
+            if blur:
+                source = cv2.GaussianBlur(source, (5, 5), 0, dst=self.pool.get("blur", source.shape))
+            dst = self.pool.get(key, source.shape)
+            _, view = cv2.threshold(source, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=dst)
+            self._views[key] = view
+        return view
+
+    def downscaled(self, factor):
+        """Grayscale view shrunk by `factor` (e.g. 0.5 for half size)"""
+        key = ("down", factor)
+        view = self._views.get(key)
+        if view is None:
+            gray = self.gray()
+            size = (max(1, int(gray.shape[1] * factor)), max(1, int(gray.shape[0] * factor)))
+            dst = self.pool.get(key, (size[1], size[0]))
+            view = cv2.resize(gray, size, dst=dst, interpolation=cv2.INTER_AREA)
+            self._views[key] = view
+        return view
+
+    def cached(self, key, compute):
+        """Return a derived value cached on this frame, computing it with `compute(frame)` once"""
+        value = self._views.get(key)
+        if value is None:
+            value = compute(self)
+            self._views[key] = value
+        return value
+
+    def copy(self):
+        """Detach the RGB pixels from the pool buffer"""
+        return self.rgb.copy()
+
+
+class ScreenCapture:
+    """Grabs the screen (or a region of it) into pooled buffers"""
+    def __init__(self):
+        self.pool = FramePool()
+        self._local = threading.local()  # mss handles are not shareable between threads
+        self._handles = []  # Every thread's handle, so close() can release them all
+        self._handles_lock = threading.Lock()
+
+    def _mss(self):
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            with self._handles_lock:
+                self._handles.append(sct)
+        return sct
+
+    def close(self):
+        """Release the mss handles and pooled buffers"""
+        with self._handles_lock:
+            handles, self._handles = self._handles, []
+        for sct in handles:
+            try:
+                sct.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+        self.pool.clear()
+
+    def grab(self, region=None):
+        """Capture the primary screen, or an (x, y, width, height) region of it, as a Frame"""
+        origin = (region[0], region[1]) if region else (0, 0)
+
+        if MSS_AVAILABLE:
+            sct = self._mss()
+            if region:
+                monitor = {"left": region[0], "top": region[1], "width": region[2], "height": region[3]}
+            else:
+                monitor = sct.monitors[1]
+            shot = sct.grab(monitor)
+            # View the raw BGRA bytes without copying, then convert straight into the pooled buffer
+            bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+            rgb = self.pool.get("rgb", (shot.height, shot.width, 3))
+            cv2.cvtColor(bgra, cv2.COLOR_BGRA2RGB, dst=rgb)
+        else:
+            # PIL owns its pixels, so the array interface costs exactly one copy
+            rgb = np.asarray(pyautogui.screenshot(region=region))
+
+        return Frame(rgb, self.pool, origin)
+
+    def sample(self, points, group_span=32):
+        """Return the RGB colour at each (x, y) screen point.
+
+        Points within `group_span` pixels of each other share one small grab;
+        distant points are grabbed separately, so probes in opposite corners
+        don't capture the whole screen between them.
+        """
+        groups = []  # [left, top, right, bottom, indices]
+        for i in sorted(range(len(points)), key=lambda i: tuple(points[i])):
+            x, y = points[i]
+            for group in groups:
+                left, top = min(group[0], x), min(group[1], y)
+                right, bottom = max(group[2], x), max(group[3], y)
+                if right - left < group_span and bottom - top < group_span:
+                    group[:4] = [left, top, right, bottom]
+                    group[4].append(i)
+                    break
+            else:
+                groups.append([x, y, x, y, [i]])
+
+        colours = np.empty((len(points), 3), dtype=np.uint8)
+        for left, top, right, bottom, indices in groups:
+            frame = self.grab((left, top, right - left + 1, bottom - top + 1))
+            xs = np.array([points[i][0] for i in indices]) - left
+            ys = np.array([points[i][1] for i in indices]) - top
+            colours[indices] = frame.rgb[ys, xs]  # Copied out before the pooled buffer is reused
+        return colours
+
+
+class DebugImageWriter:
+    """Writes debug images on a background thread so the executor never waits on disk I/O.
+
+    Overlays (rectangles/circles) are drawn on the writer thread, and only for
+    images that are actually written out.
+    """
+    def __init__(self, max_pending=8):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.dropped = 0
+        self.tracer = None  # Optional TraceRecorder; writes show up on the writer thread's track
+
+    def pending(self):
+        """Number of images waiting to be written"""
+        return self._queue.qsize()
+
+    def busy(self):
+        """True if a submitted image would be dropped right now"""
+        return self._queue.full()
+
+    def submit(self, path, image, rects=(), circles=()):
+        """Queue an RGB image for writing; returns False if the queue is full and it was dropped"""
+        try:
+            self._queue.put_nowait((path, image, rects, circles))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def submit_frame(self, path, frame, rects=(), circles=()):
+        """Queue a Frame for writing, detaching it from the pool buffer first.
+
+        The copy is only made if there is room for it: the writer only ever
+        empties the queue, so a slot seen free here is still free for submit().
+        """
+        if self.busy():
+            self.dropped += 1
+            return False
+        return self.submit(path, frame.copy(), rects, circles)
+
+    def flush(self):
+        """Block until all queued images have been written"""
+        self._queue.join()
+
+    def close(self):
+        """Write out what is queued, then stop the writer thread"""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            path, image, rects, circles = item
+            try:
+                with self.tracer.span("write debug image", "debug_io", path=os.path.basename(path)) if self.tracer else nullcontext():
+                    if image.ndim == 3:
+                        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+                    elif rects or circles:
+                        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+                    for x, y, w, h in rects:
+                        cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
+                    for x, y in circles:
+                        cv2.circle(image, (x, y), 5, (0, 0, 255), -1)
+                    cv2.imwrite(path, image)
+            except Exception as e:
+                logger.error("Failed to write debug image %s: %s", path, e)
+            finally:
+                self._queue.task_done()
+
+
+class TemplateCache:
+    """Caches grayscale templates by path and modification time"""
+    def __init__(self):
+        self._templates = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image_path):
+        """Return the grayscale template for `image_path`, or None if it can't be loaded"""
+        mtime = os.path.getmtime(image_path)
+        cached = self._templates.get(image_path)
+        if cached is not None and cached[0] == mtime:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        template = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+        if template is not None:
+            self._templates[image_path] = (mtime, template)
+        return template
+
+
+class FeatureMatcher:
+    """Keypoint matching (ORB or AKAZE) that survives UI scaling and theme changes.
+
+    Template descriptors are cached by path and modification time; frame
+    descriptors are cached on the Frame so they are computed once per capture.
+    """
+    def __init__(self, detector="orb"):
+        self.detector_name = detector
+        if detector == "akaze":
+            self._detector = cv2.AKAZE_create()
+        else:
+            self._detector = cv2.ORB_create(nfeatures=2000)
+        # Both ORB and AKAZE produce binary descriptors
+        self._matcher = cv2.BFMatcher(cv2.NORM_HAMMING)
+        self._templates = {}
+        self.hits = 0
+        self.misses = 0
+
+    def template_features(self, image_path, template):
+        """Return (keypoints, descriptors) for a template, computing them once per file version"""
+        mtime = os.path.getmtime(image_path)
+        cached = self._templates.get(image_path)
+        if cached is not None and cached[0] == mtime:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        features = self._detector.detectAndCompute(template, None)
+        self._templates[image_path] = (mtime, features)
+        return features
+
+    def frame_features(self, frame):
+        """Return (keypoints, descriptors) for a frame, cached on the frame"""
+        return frame.cached(
+            ("features", self.detector_name),
+            lambda f: self._detector.detectAndCompute(f.gray(), None)
+        )
+
+    def match(self, frame, image_path, template, min_matches=10, ratio=0.75):
+        """Locate a template in a frame and return (center_x, center_y, inlier_ratio) or None.
+
+        The center is the template's midpoint projected through the RANSAC
+        homography, in frame coordinates.
+        """
+        template_kp, template_desc = self.template_features(image_path, template)
+        frame_kp, frame_desc = self.frame_features(frame)
+        if template_desc is None or frame_desc is None or len(template_kp) < min_matches:
+            return None
+
+        # Lowe's ratio test
+        good = []
+        for pair in self._matcher.knnMatch(template_desc, frame_desc, k=2):
+            if len(pair) == 2 and pair[0].distance < ratio * pair[1].distance:
+                good.append(pair[0])
+        if len(good) < min_matches:
+            return None
+
+        src = np.float32([template_kp[m.queryIdx].pt for m in good]).reshape(-1, 1, 2)
+        dst = np.float32([frame_kp[m.trainIdx].pt for m in good]).reshape(-1, 1, 2)
+        homography, mask = cv2.findHomography(src, dst, cv2.RANSAC, 5.0)
+        if homography is None:
+            return None
+
+        inliers = int(mask.sum())
+        if inliers < min_matches:
+            return None
+
+        h, w = template.shape[:2]
+        center = cv2.perspectiveTransform(np.float32([[[w / 2, h / 2]]]), homography)[0][0]
+        return int(round(center[0])), int(round(center[1])), inliers / len(good)
+
+
+def anchor_uniqueness(gray, patch, left, top):
+    """Score (0..1) how unambiguously `patch`, cut from `gray` at (left, top), identifies that spot.
+
+    The score is the gap between the patch's correlation with itself and the
+    best correlation anywhere else on the screen. Featureless patches score 0.
+    """
+    if float(patch.std()) < 1.0:
+        return 0.0
+    result = cv2.matchTemplate(gray, patch, cv2.TM_CCOEFF_NORMED)
+    h, w = patch.shape[:2]
+    # Ignore the patch's own peak and its immediate neighbourhood
+    y1, x1 = max(0, top - h // 2), max(0, left - w // 2)
+    result[y1:top + h // 2 + 1, x1:left + w // 2 + 1] = -1.0
+    runner_up = float(np.nan_to_num(result).max())
+    return round(min(1.0, max(0.0, 1.0 - runner_up)), 3)
+
+
+def match_time(gray, template, repeats=3):
+    """Best-of-`repeats` wall time (seconds) of one template lookup of `template` in `gray`"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def minimal_unique_crop(gray, x, y, bounds=None, margin=0.15, min_size=16, max_size=256):
+    """Find the smallest crop around (x, y) that matches only once on `gray`.
+
+    Crops grow geometrically from `min_size` up to `max_size` and are kept
+    inside `bounds` (left, top, width, height; the whole image by default).
+    Every candidate costs a full-image match, so the size cap also bounds the
+    search to about a dozen lookups. A crop is unique when its
+    anchor_uniqueness() score is at least `margin`. Returns
+    (left, top, width, height, score), or None if even the largest crop is ambiguous.
+    """
+    if bounds is None:
+        bounds = (0, 0, gray.shape[1], gray.shape[0])
+    bound_left, bound_top, bound_width, bound_height = bounds
+    max_width, max_height = min(max_size, bound_width), min(max_size, bound_height)
+
+    size = min_size
+    while True:
+        width, height = min(size, max_width), min(size, max_height)
+        left = min(max(x - width // 2, bound_left), bound_left + bound_width - width)
+        top = min(max(y - height // 2, bound_top), bound_top + bound_height - height)
+        crop = gray[top:top + height, left:left + width]
+        score = anchor_uniqueness(gray, crop, left, top)
+        if score >= margin:
+            return left, top, width, height, score
+        if width == max_width and height == max_height:
+            return None
+        size = int(size * 1.25) + 1
+
+
+class AnchorEncoder:
+    """Turns click-point patches into deduplicated anchor images on a background thread.
+
+    submit() only crops and hashes the patch, which is cheap enough for the
+    recording thread, and returns the anchor's file name right away. Encoding
+    the PNG and scoring its uniqueness within the window replay searches
+    (`search_margin` around the patch) happen on the encoder thread, which
+    reports each score through `on_scored(path, score)`.
+    """
+    def __init__(self, directory, on_scored=None, size=64, search_margin=150, max_pending=16):
+        self.directory = directory
+        self.on_scored = on_scored
+        self.size = size
+        self.search_margin = search_margin
+        self.scores = {}  # path -> uniqueness score, for anchors already processed
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.dropped = 0
+
+    def submit(self, frame, x, y):
+        """Queue the patch around (x, y) of a Frame; returns (path, hint, offset) or None if dropped.
+
+        `hint` is the screen position of the patch center and `offset` is the
+        click point relative to it (non-zero only where the patch was clipped at a screen edge).
+        """
+        size = min(self.size, frame.width, frame.height)
+        fx, fy = x - frame.origin[0], y - frame.origin[1]
+        left = min(max(fx - size // 2, 0), frame.width - size)
+        top = min(max(fy - size // 2, 0), frame.height - size)
+        patch = frame.rgb[top:top + size, left:left + size].copy()
+
+        digest = hashlib.sha1(patch.tobytes()).hexdigest()[:16]
+        path = os.path.join(self.directory, f"anchor_{digest}.png")
+        center = (left + size // 2, top + size // 2)
+        hint = [center[0] + frame.origin[0], center[1] + frame.origin[1]]
+        offset = [fx - center[0], fy - center[1]]
+
+        if path not in self.scores:
+            # The frame is pooled, so the encoder gets its own copy of just the searched window
+            reach = self.search_margin + size // 2
+            window_left, window_top = max(0, center[0] - reach), max(0, center[1] - reach)
+            window = frame.rgb[window_top:center[1] + reach, window_left:center[0] + reach].copy()
+            try:
+                self._queue.put_nowait((path, patch, window, left - window_left, top - window_top))
+                self.scores[path] = None
+            except queue.Full:
+                self.dropped += 1
+                return None
+        return path, hint, offset
+
+    def pending(self):
+        """Number of anchors waiting to be encoded"""
+        return self._queue.qsize()
+
+    def flush(self):
+        """Block until all queued anchors have been written and scored"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            path, patch, window, left, top = self._queue.get()
+            try:
+                if not os.path.exists(path):
+                    os.makedirs(self.directory, exist_ok=True)
+                    cv2.imwrite(path, cv2.cvtColor(patch, cv2.COLOR_RGB2BGR))
+                gray = cv2.cvtColor(window, cv2.COLOR_RGB2GRAY)
+                score = anchor_uniqueness(gray, cv2.cvtColor(patch, cv2.COLOR_RGB2GRAY), left, top)
+                self.scores[path] = score
+                if self.on_scored:
+                    self.on_scored(path, score)
+            except Exception as e:
+                logger.error("Failed to encode anchor %s: %s", path, e)
+            finally:
+                self._queue.task_done()